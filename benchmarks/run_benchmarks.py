@@ -0,0 +1,273 @@
+"""
+Micro-benchmarks for the hot paths of the sentiment pipeline.
+
+Each path is timed on its own against synthetic reviews (see synthetic.py) and
+a model trained on them in a temporary directory, so runs are reproducible and
+independent of the local dataset and trained model:
+
+    csv_fetch        CSVFetcher.fetch_data
+    clean_text       TextSentimentTransformer._clean_text, one review at a time
+    vectorize        vectorizer transform of pre-cleaned texts
+    predict_single   SentimentPredictor.predict_single, one review per call
+    predict_batch    SentimentPredictor.predict_batch, all reviews in one call
+    pipeline_run     Pipeline.run over MongoFetcher (mongomock unless --mongo-uri)
+
+Results are written as JSON; pass --compare to check them against an earlier run:
+    python benchmarks/run_benchmarks.py --scale 20000
+    python benchmarks/run_benchmarks.py --compare data/benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import (
+    BENCHMARK_RESULTS_DIR,
+    BENCHMARK_REGRESSION_THRESHOLD,
+    PIPELINE_BATCH_SIZE,
+    RANDOM_STATE,
+    LOGISTIC_REGRESSION_MAX_ITER,
+)
+from src.fetchers.csv_fetcher import CSVFetcher
+from src.fetchers.mongo_fetcher import MongoFetcher
+from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+from src.loaders.artifact_cache import save_artifact
+from src.loaders.sentiment_loader import SKLearnSentimentLoader, downcast_model
+from src.inference import SentimentPredictor
+from src.pipeline import Pipeline
+from benchmarks.synthetic import write_reviews_csv
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+BENCH_DB_NAME = "sentiment_benchmark"
+BENCH_COLLECTION_NAME = "reviews"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def bench(name: str, fn: Callable[[], None], items: int, repeats: int) -> dict:
+    """Runs `fn` once to warm up, then `repeats` timed times."""
+    fn()
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    best = min(seconds)
+    result = {
+        "name": name,
+        "items": items,
+        "repeats": repeats,
+        "min_seconds": best,
+        "median_seconds": statistics.median(seconds),
+        "mean_seconds": statistics.mean(seconds),
+        "items_per_second": items / best if best else 0.0,
+    }
+    print(f"      {name:<16}{best * 1000:>12.2f} ms{result['items_per_second']:>14,.0f} items/s")
+    return result
+
+
+def bench_latency(name: str, fn: Callable[[str], object], texts: List[str]) -> dict:
+    """Times one call per text and reports the latency distribution."""
+    for text in texts[:10]:
+        fn(text)
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        fn(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    total = sum(latencies) / 1000
+    result = {
+        "name": name,
+        "items": len(texts),
+        "repeats": 1,
+        "min_seconds": total,
+        "median_seconds": total,
+        "mean_seconds": total,
+        "items_per_second": len(texts) / total if total else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+    }
+    print(
+        f"      {name:<16}{result['p50_ms']:>9.3f} ms p50 {result['p95_ms']:>8.3f} ms p95 "
+        f"{result['p99_ms']:>8.3f} ms p99"
+    )
+    return result
+
+
+def _train_model(csv_path: Path, model_path: Path, vectorizer_path: Path):
+    transformer = TextSentimentTransformer()
+    X, y = transformer.fit_transform(CSVFetcher(str(csv_path)).fetch_data())
+    model = LogisticRegression(max_iter=LOGISTIC_REGRESSION_MAX_ITER, random_state=RANDOM_STATE)
+    model.fit(X, y)
+    downcast_model(model, str(X.dtype))
+    save_artifact(transformer.vectorizer, str(vectorizer_path))
+    save_artifact(model, str(model_path))
+
+
+def _mongo_collection(mongo_uri: Optional[str]):
+    if mongo_uri:
+        from pymongo import MongoClient
+        return MongoClient(mongo_uri)[BENCH_DB_NAME][BENCH_COLLECTION_NAME]
+    try:
+        import mongomock
+    except ImportError:
+        return None
+    return mongomock.MongoClient()[BENCH_DB_NAME][BENCH_COLLECTION_NAME]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=str(PROJECT_ROOT), check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    scale: int,
+    seed: int,
+    repeats: int,
+    single_calls: int,
+    workers: int,
+    mongo_uri: Optional[str]
+) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="sentiment-bench-") as tmp:
+        tmp = Path(tmp)
+        print(f"\n[1/3] Generating {scale:,} synthetic reviews (seed {seed})...")
+        csv_path = write_reviews_csv(tmp / "reviews.csv", scale, seed=seed)
+        model_path, vectorizer_path = tmp / "model.pkl", tmp / "vectorizer.pkl"
+
+        print("\n[2/3] Training benchmark model...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            _train_model(csv_path, model_path, vectorizer_path)
+        predictor = SentimentPredictor(str(model_path), str(vectorizer_path))
+        transformer = predictor.transformer
+        artifacts = predictor.artifacts
+
+        print("\n[3/3] Running benchmarks...")
+        reviews = CSVFetcher(str(csv_path)).fetch_data()
+        texts = [r.Text for r in reviews]
+        cleaned = transformer.clean_texts(texts)
+
+        results.append(bench("csv_fetch", lambda: CSVFetcher(str(csv_path)).fetch_data(), scale, repeats))
+        results.append(bench("clean_text", lambda: [transformer._clean_text(t) for t in texts], scale, repeats))
+        results.append(bench(
+            "vectorize", lambda: transformer.vectorize_cleaned(cleaned, vectorizer=artifacts.vectorizer),
+            scale, repeats,
+        ))
+        results.append(bench_latency("predict_single", predictor.predict_single, texts[:single_calls]))
+        results.append(bench("predict_batch", lambda: predictor.predict_batch(texts), scale, repeats))
+
+        collection = _mongo_collection(mongo_uri)
+        if collection is None:
+            print("      pipeline_run    skipped (pip install mongomock or pass --mongo-uri)")
+        else:
+            collection.drop()
+            collection.insert_many([r.model_dump() for r in reviews])
+            pipeline_transformer = TextSentimentTransformer()
+            pipeline_transformer.load_vectorizer(str(vectorizer_path))
+
+            def run_pipeline():
+                fetcher = MongoFetcher(mongo_uri or "mongodb://localhost:27017/", BENCH_DB_NAME, BENCH_COLLECTION_NAME)
+                fetcher.collection = collection
+                loader = SKLearnSentimentLoader(str(model_path))
+                pipeline = Pipeline(
+                    fetcher, pipeline_transformer, loader,
+                    batch_size=min(PIPELINE_BATCH_SIZE, scale), transform_workers=workers,
+                )
+                # Keep benchmark runs out of the dashboard's stage timings
+                pipeline.metrics.sink = None
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pipeline.run()
+
+            results.append(bench("pipeline_run", run_pipeline, scale, repeats))
+            if mongo_uri:
+                collection.drop()
+
+        predictor.artifact_cache.stop_watcher()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "scale": scale,
+        "seed": seed,
+        "workers": workers,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": f"{platform.system()} {platform.release()}",
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": {r["name"]: r for r in results},
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Returns the benchmarks whose throughput dropped by more than `threshold`."""
+    regressions = []
+    print(f"\n      Compared with {baseline.get('git_commit') or 'baseline'} ({baseline.get('created_at')}):")
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous["items_per_second"]:
+            continue
+        change = result["items_per_second"] / previous["items_per_second"] - 1
+        flag = "REGRESSION" if change < -threshold else "ok"
+        print(f"      {name:<16}{change:>+9.1%}  {flag}")
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=20000, help="Number of synthetic reviews")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per benchmark (best is reported)")
+    parser.add_argument("--single-calls", type=int, default=1000, help="Calls timed for predict_single")
+    parser.add_argument("--workers", type=int, default=1, help="Transform workers for pipeline_run")
+    parser.add_argument("--mongo-uri", default=None, help="Benchmark against a real MongoDB instead of mongomock")
+    parser.add_argument("--output", default=None, help="Result file (default: data/benchmarks/bench-<time>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help="Allowed throughput drop before a benchmark counts as a regression")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Sentiment Pipeline Benchmarks")
+    print("=" * 50)
+    report = run_benchmarks(args.scale, args.seed, args.repeats, args.single_calls, args.workers, args.mongo_uri)
+
+    output = Path(args.output) if args.output else (
+        BENCHMARK_RESULTS_DIR / f"bench-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n[OK] Results saved to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n[FAIL] Throughput regressions: {', '.join(regressions)}")
+            sys.exit(1)
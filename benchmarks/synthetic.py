@@ -0,0 +1,129 @@
+"""
+Synthetic Amazon Fine Food style reviews for benchmarking.
+
+Reviews are generated with the same columns as `Reviews.csv` and shaped after
+the real dataset: skewed star ratings (~64% five stars), log-normal review
+lengths (median ~55 words, long tail), short summaries, occasional `<br />`
+markup and a Zipf-distributed vocabulary with sentiment words that follow the
+rating. Output is fully determined by `n` and `seed`.
+"""
+
+from pathlib import Path
+from typing import List, Union
+import numpy as np
+import pandas as pd
+
+# Star rating shares in the Amazon Fine Food Reviews dataset
+SCORE_PROBABILITIES = {1: 0.092, 2: 0.052, 3: 0.075, 4: 0.142, 5: 0.639}
+
+# log(words) ~ Normal(mu, sigma) gives a median of ~55 words and a long tail
+TEXT_LENGTH_LOG_MEAN = 4.0
+TEXT_LENGTH_LOG_STD = 0.7
+TEXT_LENGTH_MAX = 2500
+SUMMARY_LENGTH_MEAN = 4.0
+HTML_BREAK_PROBABILITY = 0.2
+ZIPF_EXPONENT = 1.07
+VOCABULARY_SIZE = 30000
+
+_COMMON_WORDS = (
+    "the i and a it to of is this for in my that was but with not have you they are "
+    "these on so as be like just very one all had product can if or taste great good "
+    "flavor at them from would more tea coffee food when than dog about get love will "
+    "some use buy really only out no other much also my best price amazon best time "
+    "little box bag make first even order cup well try chips treats bought sugar eat "
+    "store find tried mix hot bit free water sweet chocolate milk brand better still "
+    "cookies packaging drink day snack delicious healthy recommend favorite organic"
+).split()
+_POSITIVE_WORDS = (
+    "great love delicious excellent perfect best favorite wonderful amazing tasty "
+    "fresh yummy happy awesome recommend nice enjoy fantastic"
+).split()
+_NEGATIVE_WORDS = (
+    "bad awful terrible disappointed stale horrible worst waste bland gross refund "
+    "broken poor nasty weird bitter expired never return"
+).split()
+_SENTIMENT_WORD_RATE = 0.06
+
+
+def _vocabulary(size: int, rng: np.random.Generator) -> List[str]:
+    """Common review words first, then pronounceable filler words for the long tail."""
+    consonants = list("bcdfghjklmnprstvwz")
+    vowels = list("aeiou")
+    words = list(dict.fromkeys(_COMMON_WORDS))
+    seen = set(words)
+    while len(words) < size:
+        syllables = rng.integers(1, 4)
+        word = "".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(syllables))
+        if rng.random() < 0.5:
+            word += rng.choice(consonants)
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def _zipf_probabilities(size: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def generate_reviews(n: int, seed: int = 42, vocabulary_size: int = VOCABULARY_SIZE) -> pd.DataFrame:
+    """Returns `n` synthetic reviews with the columns of `Reviews.csv`."""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(_vocabulary(vocabulary_size, rng))
+    word_probabilities = _zipf_probabilities(len(vocabulary), ZIPF_EXPONENT)
+
+    scores = rng.choice(list(SCORE_PROBABILITIES), size=n, p=list(SCORE_PROBABILITIES.values()))
+    text_lengths = np.clip(
+        rng.lognormal(TEXT_LENGTH_LOG_MEAN, TEXT_LENGTH_LOG_STD, size=n).astype(int), 3, TEXT_LENGTH_MAX
+    )
+    summary_lengths = np.clip(rng.poisson(SUMMARY_LENGTH_MEAN, size=n), 1, 20)
+
+    # Draw every word of the dataset at once, then slice it per review
+    total_words = int(text_lengths.sum() + summary_lengths.sum())
+    words = vocabulary[rng.choice(len(vocabulary), size=total_words, p=word_probabilities)]
+    sentiment_mask = rng.random(total_words) < _SENTIMENT_WORD_RATE
+    positive_words = np.array(_POSITIVE_WORDS)[rng.integers(0, len(_POSITIVE_WORDS), size=total_words)]
+    negative_words = np.array(_NEGATIVE_WORDS)[rng.integers(0, len(_NEGATIVE_WORDS), size=total_words)]
+
+    texts, summaries = [], []
+    offset = 0
+    for score, text_length, summary_length in zip(scores, text_lengths, summary_lengths):
+        end = offset + summary_length + text_length
+        review_words = words[offset:end].copy()
+        mask = sentiment_mask[offset:end]
+        if score >= 4:
+            review_words[mask] = positive_words[offset:end][mask]
+        elif score <= 2:
+            review_words[mask] = negative_words[offset:end][mask]
+        summary = " ".join(review_words[:summary_length]).capitalize()
+        body = review_words[summary_length:].tolist()
+        if rng.random() < HTML_BREAK_PROBABILITY and len(body) > 10:
+            split = int(rng.integers(5, len(body) - 2))
+            body[split] = body[split] + ".<br /><br />"
+        texts.append(" ".join(body).capitalize() + ".")
+        summaries.append(summary)
+        offset = end
+
+    denominators = rng.poisson(1.7, size=n)
+    numerators = rng.binomial(denominators, 0.75)
+    return pd.DataFrame({
+        "Id": np.arange(1, n + 1),
+        "ProductId": [f"B{v:09d}" for v in rng.integers(0, 75000, size=n)],
+        "UserId": [f"A{v:013d}" for v in rng.integers(0, 250000, size=n)],
+        "ProfileName": [f"user{v}" for v in rng.integers(0, 250000, size=n)],
+        "HelpfulnessNumerator": numerators,
+        "HelpfulnessDenominator": denominators,
+        "Score": scores,
+        "Time": rng.integers(939340800, 1351209600, size=n),
+        "Summary": summaries,
+        "Text": texts,
+    })
+
+
+def write_reviews_csv(path: Union[str, Path], n: int, seed: int = 42) -> Path:
+    """Writes `n` synthetic reviews to a CSV file shaped like `Reviews.csv`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    generate_reviews(n, seed=seed).to_csv(path, index=False)
+    return path
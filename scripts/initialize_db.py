@@ -16,6 +16,8 @@ from src.config import (
     COLLECTION_NAME,
     REVIEWS_CSV_PATH,
 )
+from src.review_browser import ReviewBrowser
+from src.rollups import ReviewRollups
 
 
 def initialize_db():
@@ -51,6 +53,14 @@ def initialize_db():
         collection.insert_many(records)
         print("Successfully inserted data.")
 
+        print("Creating indexes for the Data Explorer...")
+        ReviewBrowser(MONGO_URI, DB_NAME, COLLECTION_NAME).ensure_indexes()
+
+        # Rebuild: rollups left over from a dropped collection must not be added to
+        print("Building EDA rollups...")
+        added = ReviewRollups(MONGO_URI, DB_NAME, COLLECTION_NAME).rebuild()
+        print(f"Rolled up {added} reviews.")
+
     except Exception as e:
         print(f"Error initializing database: {e}")
 
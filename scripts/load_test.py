@@ -0,0 +1,88 @@
+"""
+Load-tests the local scoring server with concurrent single-review requests.
+
+Uses only the standard library, e.g.:
+    python scripts/load_test.py --concurrency 32 --requests 5000
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import SAMPLE_REVIEWS, SCORING_SERVER_HOST, SCORING_SERVER_PORT
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def load_test(url: str, concurrency: int, total_requests: int) -> bool:
+    texts = list(SAMPLE_REVIEWS.values())
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def worker():
+        nonlocal errors
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            body = json.dumps({"text": texts[i % len(texts)]}).encode("utf-8")
+            request = urllib.request.Request(
+                f"{url}/predict", data=body, headers={"Content-Type": "application/json"}
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                ok = True
+            except Exception:
+                ok = False
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed_ms)
+                errors += int(not ok)
+
+    print(f"Sending {total_requests} requests to {url} with {concurrency} workers...")
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"      Elapsed: {elapsed:.2f}s")
+    print(f"      Throughput: {total_requests / elapsed:.1f} req/s")
+    print(f"      Errors: {errors}")
+    print(f"      Latency p50: {_percentile(latencies, 50):.2f} ms")
+    print(f"      Latency p95: {_percentile(latencies, 95):.2f} ms")
+    print(f"      Latency p99: {_percentile(latencies, 99):.2f} ms")
+
+    with urllib.request.urlopen(f"{url}/metrics") as response:
+        print("\nServer metrics:")
+        print(json.dumps(json.loads(response.read()), indent=2))
+    return errors == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=f"http://{SCORING_SERVER_HOST}:{SCORING_SERVER_PORT}")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    sys.exit(0 if load_test(args.url, args.concurrency, args.requests) else 1)
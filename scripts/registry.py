@@ -0,0 +1,123 @@
+"""
+Inspects and manages the versioned model registry.
+
+    python scripts/registry.py list
+    python scripts/registry.py activate <version>
+    python scripts/registry.py rollback
+    python scripts/registry.py pin <version>
+    python scripts/registry.py unpin <version>
+    python scripts/registry.py import-legacy
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import joblib
+from src.config import MODEL_PATH, VECTORIZER_PATH, MODEL_REGISTRY_DIR
+from src.loaders.model_registry import ModelRegistry
+
+
+def list_versions(registry: ModelRegistry) -> bool:
+    versions = registry.list_versions()
+    if not versions:
+        print(f"No versions in {MODEL_REGISTRY_DIR}")
+        return True
+    active = registry.active()
+    pinned = set(registry.pinned_versions())
+    print(f"{'':2}{'version':<26}{'source':<21}{'accuracy':>9}{'f1':>8}{'size KB':>9}{'load ms':>9}{'p99 ms':>8}")
+    for v in versions:
+        metrics = v.metadata.get("metrics", {})
+        benchmark = v.metadata.get("benchmark", {})
+        accuracy = metrics.get("test_accuracy", metrics.get("holdout_accuracy"))
+        f1 = metrics.get("test_f1_macro", metrics.get("holdout_f1_macro"))
+        size_kb = (benchmark.get("model_bytes", 0) + benchmark.get("vectorizer_bytes", 0)) / 1024
+        marker = "*" if active is not None and v.version == active.version else ("P" if v.version in pinned else "")
+        print(
+            f"{marker:<2}{v.version:<26}{v.metadata.get('source', '-'):<21}"
+            f"{accuracy if accuracy is not None else float('nan'):>9.4f}{f1 if f1 is not None else float('nan'):>8.4f}"
+            f"{size_kb:>9,.0f}{benchmark.get('load_seconds', 0) * 1000:>9.1f}{benchmark.get('latency_p99_ms', 0):>8.2f}"
+        )
+    return True
+
+
+def activate(registry: ModelRegistry, version: str) -> bool:
+    try:
+        registry.activate(version)
+    except KeyError as e:
+        print(f"[FAIL] {e.args[0]}")
+        return False
+    print(f"[OK] Version {version} is now active")
+    return True
+
+
+def rollback(registry: ModelRegistry) -> bool:
+    previous = registry.previous_version()
+    if previous is None:
+        print("[FAIL] No earlier version to roll back to")
+        return False
+    return activate(registry, previous)
+
+
+def pin(registry: ModelRegistry, version: str) -> bool:
+    try:
+        registry.pin(version)
+    except KeyError as e:
+        print(f"[FAIL] {e.args[0]}")
+        return False
+    print(f"[OK] Version {version} is pinned and will not be pruned")
+    return True
+
+
+def unpin(registry: ModelRegistry, version: str) -> bool:
+    if version not in registry.pinned_versions():
+        print(f"[WARN] Version {version} is not pinned")
+        return True
+    registry.unpin(version)
+    print(f"[OK] Version {version} is no longer pinned")
+    return True
+
+
+def import_legacy(registry: ModelRegistry) -> bool:
+    """Publishes the unversioned MODEL_PATH/VECTORIZER_PATH pair as a registry version."""
+    if not (MODEL_PATH.exists() and VECTORIZER_PATH.exists()):
+        print(f"[FAIL] No model at {MODEL_PATH} and {VECTORIZER_PATH}")
+        return False
+    published = registry.publish(
+        joblib.load(MODEL_PATH), joblib.load(VECTORIZER_PATH), {"source": "import-legacy"}
+    )
+    print(f"[OK] Imported {MODEL_PATH.name} as version {published.version}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show all versions; * marks the active one, P a pinned one")
+    activate_parser = commands.add_parser("activate", help="Serve a specific version")
+    activate_parser.add_argument("version")
+    commands.add_parser("rollback", help="Re-activate the previously active version")
+    pin_parser = commands.add_parser("pin", help="Keep a version through pruning (e.g. one served by pinned replicas)")
+    pin_parser.add_argument("version")
+    unpin_parser = commands.add_parser("unpin", help="Let a pinned version be pruned again")
+    unpin_parser.add_argument("version")
+    commands.add_parser("import-legacy", help="Publish the unversioned model in data/ as a version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    if args.command == "list":
+        ok = list_versions(registry)
+    elif args.command == "activate":
+        ok = activate(registry, args.version)
+    elif args.command == "rollback":
+        ok = rollback(registry)
+    elif args.command == "pin":
+        ok = pin(registry, args.version)
+    elif args.command == "unpin":
+        ok = unpin(registry, args.version)
+    else:
+        ok = import_legacy(registry)
+    sys.exit(0 if ok else 1)
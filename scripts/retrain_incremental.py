@@ -0,0 +1,178 @@
+"""
+Updates the current model with reviews added since the last training run.
+
+Only reviews inserted after the training watermark are fetched and cleaned,
+and the classifier continues from its current coefficients, so the cost grows
+with the number of new reviews. The updated model is published only if its
+accuracy and macro F1 on a fixed holdout stay within INCREMENTAL_MAX_METRIC_DROP
+of the current model. The vocabulary is not extended; run train_model.py for
+a full retrain when new vocabulary matters.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import (
+    MONGO_URI,
+    DB_NAME,
+    COLLECTION_NAME,
+    INCREMENTAL_BATCH_SIZE,
+    INCREMENTAL_MIN_NEW_REVIEWS,
+    INCREMENTAL_MAX_METRIC_DROP,
+    FULL_TRAINING_CLEAN_WORKERS,
+)
+from src.fetchers.mongo_fetcher import MongoFetcher
+from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+from src.loaders.artifact_cache import ArtifactCache
+from src.loaders.model_registry import ModelRegistry
+from src.loaders.sentiment_loader import downcast_model
+from src.corpus import stream_training_corpus
+from src.incremental import (
+    evaluate,
+    load_holdout,
+    quality_holds,
+    save_training_state,
+    update_classifier,
+)
+from src.metrics import JsonMetricsSink, MetricsRecorder, recording, timed
+from src.memory import MemoryBudget, MemoryBudgetExceeded
+
+
+def retrain(min_new: int, workers: int, dry_run: bool = False) -> bool:
+    metrics = MetricsRecorder("incremental", sink=JsonMetricsSink())
+    budget = MemoryBudget()
+    try:
+        with recording(metrics):
+            success = _retrain(min_new, workers, dry_run, budget)
+    except MemoryBudgetExceeded as e:
+        print(f"\n[FAIL] {e}")
+        return False
+    if success:
+        metrics.report()
+        metrics.flush(force=True)
+    return success
+
+
+def _retrain(min_new: int, workers: int, dry_run: bool, budget: MemoryBudget) -> bool:
+    print("=" * 50)
+    print("Starting Incremental Retraining")
+    print("=" * 50)
+
+    # The watermark and holdout come from the active version itself, so a rollback
+    # or activation elsewhere continues from the reviews that model was trained on
+    registry = ModelRegistry()
+    active = registry.active()
+    if active is None or not active.metadata.get("watermark") or not active.model_path.exists():
+        print("No active model with a training watermark found.")
+        print("Please run: python scripts/train_model.py")
+        return False
+    watermark = active.metadata["watermark"]
+    holdout_id = active.metadata.get("holdout")
+
+    print("\n[1/5] Loading current model...")
+    artifacts = ArtifactCache().get_artifacts(str(active.model_path), str(active.vectorizer_path))
+    transformer = TextSentimentTransformer()
+    transformer.vectorizer = artifacts.vectorizer
+    dtype = artifacts.vectorizer.dtype
+    print(f"      Model version: {active.version}")
+    print(f"      Watermark: {watermark} (published {active.metadata.get('created_at')})")
+
+    print("\n[2/5] Loading fixed holdout...")
+    with timed("holdout"):
+        holdout = load_holdout(transformer, holdout_id)
+    if holdout is None:
+        print("      [FAIL] No holdout set aside by the current model's training run, or the cleaning")
+        print("      settings changed since. Please run a full retrain: python scripts/train_model.py")
+        return False
+
+    try:
+        with timed("holdout"):
+            X_holdout = transformer.vectorize_cleaned(holdout["Cleaned_Content"].tolist())
+            y_holdout = holdout["Sentiment"].to_numpy()
+        print(f"      {len(holdout):,} reviews")
+
+        print("\n[3/5] Fetching reviews added since the watermark...")
+        latest = MongoFetcher(MONGO_URI, DB_NAME, COLLECTION_NAME).latest_watermark()
+        fetcher = MongoFetcher(
+            MONGO_URI, DB_NAME, COLLECTION_NAME, query=MongoFetcher.after_watermark(watermark, latest)
+        )
+        with budget.track("stream"):
+            delta = stream_training_corpus(fetcher, transformer, INCREMENTAL_BATCH_SIZE, workers=workers, budget=budget)
+    except MemoryBudgetExceeded:
+        raise
+    except Exception as e:
+        print(f"Error fetching data: {e}")
+        return False
+
+    if len(delta) < min_new:
+        print(f"\n[OK] {len(delta):,} new labelled reviews (minimum {min_new:,}); nothing to do.")
+        return True
+    if delta["Sentiment"].nunique() < 2:
+        print("\n[OK] New reviews contain a single sentiment class; waiting for more before updating.")
+        return True
+
+    print("\n[4/5] Updating classifier...")
+    X_delta = transformer.vectorize_cleaned(delta["Cleaned_Content"].tolist())
+    y_delta = delta["Sentiment"].to_numpy()
+    with budget.track("train"), timed("train", items=X_delta.shape[0]):
+        candidate = update_classifier(artifacts.model, X_delta, y_delta)
+    downcast_model(candidate, str(dtype))
+    print(f"      Updated on {X_delta.shape[0]:,} new reviews")
+
+    print("\n[5/5] Validating on holdout...")
+    with timed("evaluate", items=2 * X_holdout.shape[0]):
+        current_scores = evaluate(artifacts.model, X_holdout, y_holdout)
+        candidate_scores = evaluate(candidate, X_holdout, y_holdout)
+    for name in current_scores:
+        change = candidate_scores[name] - current_scores[name]
+        print(f"      {name:<10} current {current_scores[name]:.4f}  updated {candidate_scores[name]:.4f}  ({change:+.4f})")
+
+    if not quality_holds(current_scores, candidate_scores):
+        print(f"\n[FAIL] Holdout quality dropped by more than {INCREMENTAL_MAX_METRIC_DROP}; the current model is kept.")
+        print("      The watermark was not advanced. Consider a full retrain: python scripts/train_model.py")
+        return False
+    if dry_run:
+        print("\n[OK] Quality holds (dry run; nothing published).")
+        return True
+
+    with timed("save", items=2):
+        published = registry.publish(candidate, artifacts.vectorizer, {
+            "source": "retrain_incremental",
+            "dtype": str(dtype),
+            "train_rows": int(X_delta.shape[0]),
+            "watermark": latest,
+            "previous_watermark": watermark,
+            "previous_version": active.version,
+            "holdout": holdout_id,
+            "metrics": {f"holdout_{name}": value for name, value in candidate_scores.items()},
+        })
+    save_training_state(
+        latest,
+        mode="incremental",
+        previous_watermark=watermark,
+        new_reviews=int(X_delta.shape[0]),
+        holdout=holdout_id,
+        holdout_metrics=candidate_scores,
+        version=published.version,
+    )
+    print(f"\n[OK] Updated model published as version {published.version}; watermark advanced to {latest}")
+
+    print("\n" + "=" * 50)
+    print("Incremental Retraining Complete!")
+    print("=" * 50)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-new", type=int, default=INCREMENTAL_MIN_NEW_REVIEWS,
+                        help="Skip the update when fewer new labelled reviews have arrived")
+    parser.add_argument("--workers", type=int, default=FULL_TRAINING_CLEAN_WORKERS,
+                        help="Processes used to clean new reviews")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the update without publishing it")
+    args = parser.parse_args()
+    sys.exit(0 if retrain(args.min_new, args.workers, args.dry_run) else 1)
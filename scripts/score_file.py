@@ -0,0 +1,110 @@
+"""
+Bulk-scores a CSV or Parquet file of reviews with constant memory.
+
+The input is streamed in chunks and fanned out to a pool of worker processes,
+each of which loads the model once. Predictions are written incrementally in
+input order, e.g.:
+    python scripts/score_file.py data/Reviews.csv data/scored.parquet --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import SCORE_FILE_CHUNK_SIZE
+from src.file_io import ChunkWriter, iter_file_chunks
+from src.loaders.model_registry import ModelRegistry
+
+_predictor = None
+
+
+def _init_worker(model_path: str, vectorizer_path: str):
+    """Loads the model once per worker process."""
+    global _predictor
+    from src.inference import SentimentPredictor
+    _predictor = SentimentPredictor(model_path, vectorizer_path)
+    _predictor.artifacts
+
+
+def _score_chunk(texts: List[str]) -> Tuple[List[str], List[float]]:
+    sentiments = _predictor.predict_batch(texts)
+    return [s.label for s in sentiments], [s.confidence for s in sentiments]
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    text_column: str,
+    chunk_size: int,
+    workers: int,
+    max_in_flight: Optional[int] = None
+) -> bool:
+    registry = ModelRegistry.for_serving()
+    if not registry.is_available():
+        print("Model not trained. Please run: python scripts/train_model.py")
+        return False
+    # Workers are pinned to the version active now, even if another is activated mid-run
+    model_path, vectorizer_path = registry.active_paths()
+
+    # Bounding the number of chunks in flight keeps memory independent of file size
+    max_in_flight = max_in_flight or workers * 2
+    print(f"Scoring {input_path} -> {output_path}")
+    print(f"      Workers: {workers}, chunk size: {chunk_size}, max chunks in flight: {max_in_flight}")
+
+    start = time.perf_counter()
+    rows = 0
+    pending = deque()
+
+    def drain_one(writer: ChunkWriter):
+        nonlocal rows
+        chunk, future = pending.popleft()
+        labels, confidences = future.result()
+        chunk["predicted_sentiment"] = labels
+        chunk["confidence"] = confidences
+        writer.write(chunk)
+        rows += len(chunk)
+        elapsed = time.perf_counter() - start
+        print(f"      {rows:,} rows scored ({rows / elapsed:,.0f} rows/sec)")
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(model_path, vectorizer_path),
+        ) as pool, ChunkWriter(output_path) as writer:
+            for chunk in iter_file_chunks(input_path, chunk_size):
+                if text_column not in chunk.columns:
+                    raise KeyError(f"Column '{text_column}' not found in {input_path}")
+                texts = chunk[text_column].fillna("").astype(str).tolist()
+                pending.append((chunk, pool.submit(_score_chunk, texts)))
+                if len(pending) >= max_in_flight:
+                    drain_one(writer)
+            while pending:
+                drain_one(writer)
+    except Exception as e:
+        print(f"Error scoring file: {e}")
+        return False
+
+    elapsed = time.perf_counter() - start
+    print(f"\n[OK] Scored {rows:,} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/sec)")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Input .csv or .parquet file")
+    parser.add_argument("output", help="Output .csv or .parquet file")
+    parser.add_argument("--text-column", default="Text")
+    parser.add_argument("--chunk-size", type=int, default=SCORE_FILE_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    success = score_file(args.input, args.output, args.text_column, args.chunk_size, args.workers)
+    sys.exit(0 if success else 1)
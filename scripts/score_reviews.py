@@ -0,0 +1,72 @@
+"""
+Scores reviews stored in MongoDB and writes the predictions back onto them.
+
+Only reviews without a prediction from the current model version are fetched,
+so re-runs pick up where the previous run stopped.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import (
+    MONGO_URI,
+    DB_NAME,
+    COLLECTION_NAME,
+    PIPELINE_BATCH_SIZE,
+    PIPELINE_TRANSFORM_WORKERS,
+)
+from src.fetchers.mongo_fetcher import MongoFetcher
+from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+from src.loaders.sentiment_loader import SKLearnSentimentLoader
+from src.loaders.model_registry import ModelRegistry
+from src.sinks.mongo_sink import MongoPredictionSink
+from src.pipeline import Pipeline
+
+
+def score_reviews(limit: int, batch_size: int, workers: int) -> bool:
+    registry = ModelRegistry.for_serving()
+    if not registry.is_available():
+        print("Model not trained. Please run: python scripts/train_model.py")
+        return False
+
+    # Resolve the active version once so the whole run scores with one model
+    model_path, vectorizer_path = registry.active_paths()
+    loader = SKLearnSentimentLoader(model_path)
+    transformer = TextSentimentTransformer()
+    transformer.load_vectorizer(vectorizer_path)
+    loader.load()
+    model_version = loader.model_version
+    scope = f"up to {limit:,}" if limit else "all"
+    print(f"Scoring {scope} unscored reviews with model {model_version}...")
+
+    try:
+        fetcher = MongoFetcher(
+            MONGO_URI, DB_NAME, COLLECTION_NAME,
+            query=MongoPredictionSink.unscored_filter(model_version),
+        )
+        sink = MongoPredictionSink(MONGO_URI, DB_NAME, COLLECTION_NAME)
+        pipeline = Pipeline(
+            fetcher, transformer, loader, sink=sink,
+            batch_size=batch_size, limit=limit or None, transform_workers=workers,
+        )
+        pipeline.run()
+    except Exception as e:
+        print(f"Error scoring reviews: {e}")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=0,
+                        help="Maximum number of reviews to score in this run (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=PIPELINE_BATCH_SIZE,
+                        help="Reviews fetched, scored and written per batch")
+    parser.add_argument("--workers", type=int, default=PIPELINE_TRANSFORM_WORKERS,
+                        help="Processes used to clean and vectorize reviews")
+    args = parser.parse_args()
+    sys.exit(0 if score_reviews(args.limit, args.batch_size, args.workers) else 1)
@@ -0,0 +1,49 @@
+"""
+Runs the local HTTP/JSON scoring server.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import (
+    SCORING_SERVER_HOST,
+    SCORING_SERVER_PORT,
+    SCORING_MAX_BATCH_SIZE,
+    SCORING_MAX_WAIT_MS,
+)
+from src.server import create_server
+from src.loaders.model_registry import ModelRegistry
+
+
+def serve(host: str, port: int, max_batch_size: int, max_wait_ms: float) -> bool:
+    if not ModelRegistry.for_serving().is_available():
+        print("Model not trained. Please run: python scripts/train_model.py")
+        return False
+
+    server = create_server(host, port, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server.batcher.predictor.artifacts  # warm the model before accepting traffic
+    print(f"Scoring server listening on http://{host}:{port}")
+    print(f"      Max batch size: {max_batch_size}")
+    print(f"      Max wait: {max_wait_ms} ms")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        server.batcher.stop()
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=SCORING_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SCORING_SERVER_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=SCORING_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=SCORING_MAX_WAIT_MS)
+    args = parser.parse_args()
+    sys.exit(0 if serve(args.host, args.port, args.max_batch_size, args.max_wait_ms) else 1)
@@ -2,8 +2,12 @@
 Training script for the sentiment analysis model.
 """
 
+import argparse
 import sys
+import time
+import warnings
 from pathlib import Path
+from typing import List, Optional
 
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -12,62 +16,437 @@ from src.config import (
     MONGO_URI,
     DB_NAME,
     COLLECTION_NAME,
-    MODEL_PATH,
-    VECTORIZER_PATH,
-    DATA_DIR,
     DEFAULT_FETCH_LIMIT,
     TRAIN_TEST_SPLIT_RATIO,
     RANDOM_STATE,
     LOGISTIC_REGRESSION_MAX_ITER,
+    LOGISTIC_REGRESSION_C,
+    TFIDF_MAX_FEATURES,
+    TFIDF_NGRAM_RANGE,
+    TFIDF_MIN_DF,
+    SEARCH_RANDOM_CANDIDATES,
+    LATENCY_SLO_P99_MS,
+    FEATURE_DTYPE,
+    FLOAT32_PROBABILITY_TOLERANCE,
+    PRECISION_CHECK_TRAIN_SIZE,
+    PRECISION_CHECK_TEST_SIZE,
+    ESTIMATED_BYTES_PER_REVIEW,
+    FULL_TRAINING_BATCH_SIZE,
+    FULL_TRAINING_CLEAN_WORKERS,
+    FULL_TRAINING_MIN_DF,
+    FULL_TRAINING_SOLVER,
+    FULL_TRAINING_MAX_ITER,
+    FULL_TRAINING_ITERATIONS_PER_ROUND,
+    FULL_TRAINING_TIME_BUDGET_SECONDS,
+    COMPACT_FEATURE_COUNTS,
+    COMPACT_SELECTION,
+    COMPACT_MAX_ACCURACY_DROP,
+    COMPACT_REPORT_PATH,
+    INCREMENTAL_HOLDOUT_SIZE,
 )
 from src.fetchers.mongo_fetcher import MongoFetcher
 from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+from src.loaders.model_registry import ModelRegistry
+from src.loaders.sentiment_loader import downcast_model
+from src.metrics import JsonMetricsSink, MetricsRecorder, recording, timed
+from src.memory import MemoryBudget, MemoryBudgetExceeded
+from src.corpus import StreamTimeout, check_deadline, stream_training_corpus
+from src.incremental import load_holdout, load_training_state, save_training_state, set_aside_holdout
+from src.training_cache import TrainingCache, corpus_key, features_key
+from src.model_search import candidate_params, run_search, best_within_budget, format_report, save_report
+from src import compact_export
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.exceptions import ConvergenceWarning
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-import joblib
+from sklearn.metrics import accuracy_score, classification_report, f1_score
 
 
-def train():
-    print("=" * 50)
-    print("Starting Training Pipeline")
-    print("=" * 50)
-    
+def _sparse_nbytes(X) -> int:
+    return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+
+def precision_report(reference_model, reference_vectorizer, model, vectorizer, texts) -> dict:
+    """
+    Compares the `model`/`vectorizer` pair with the float64 reference pair on
+    the same cleaned `texts`, each vectorized by its own vectorizer.
+    """
+    ref_probs = reference_model.predict_proba(reference_vectorizer.transform(texts))[:, 1]
+    probs = model.predict_proba(vectorizer.transform(texts))[:, 1]
+    diff = np.abs(ref_probs - probs)
+    return {
+        "max_abs_diff": float(diff.max()) if diff.size else 0.0,
+        "mean_abs_diff": float(diff.mean()) if diff.size else 0.0,
+        "label_agreement": float(((ref_probs >= 0.5) == (probs >= 0.5)).mean()) if diff.size else 1.0,
+    }
+
+
+def train(
+    dtype: str = FEATURE_DTYPE,
+    params: dict = None,
+    use_cache: bool = True,
+    profile: str = "default",
+    time_budget: float = FULL_TRAINING_TIME_BUDGET_SECONDS,
+    workers: int = FULL_TRAINING_CLEAN_WORKERS
+):
+    """
+    Trains and saves one model; `params` overrides the profile's default
+    hyperparameters. The "full" profile trains on the whole collection and
+    stops once `time_budget` seconds have passed.
+    """
+    params = {**default_params(profile), **{k: v for k, v in (params or {}).items() if v is not None}}
+    metrics = MetricsRecorder("training", sink=JsonMetricsSink())
+    budget = MemoryBudget()
+    cache = TrainingCache() if use_cache else None
+    deadline = time.monotonic() + time_budget if profile == "full" else None
+    try:
+        with recording(metrics):
+            success = _train(dtype, params, budget, cache, profile, deadline, workers)
+    except MemoryBudgetExceeded as e:
+        print(f"\n[FAIL] {e}")
+        print("      Lower the fetch limit or raise MEMORY_BUDGET_MB.")
+        return False
+    except TimeoutError as e:
+        print(f"\n[FAIL] {e} ({time_budget:,.0f}s budget)")
+        print("      Raise --time-budget or use more --workers.")
+        metrics.report()
+        return False
+    if success:
+        metrics.report()
+        metrics.flush(force=True)
+        print("\n      " + budget.format_report().replace("\n", "\n      "))
+    return success
+
+
+def default_params(profile: str = "default") -> dict:
+    return {
+        "max_features": TFIDF_MAX_FEATURES,
+        "ngram_range": tuple(TFIDF_NGRAM_RANGE),
+        "min_df": FULL_TRAINING_MIN_DF if profile == "full" else TFIDF_MIN_DF,
+        "C": LOGISTIC_REGRESSION_C,
+    }
+
+
+def _connect(budget: MemoryBudget, full: bool = False):
+    """The fetcher and its fetch limit (None for the full profile: the whole collection)."""
     print(f"\n[1/4] Connecting to MongoDB...")
     print(f"      URI: {MONGO_URI}")
     print(f"      Database: {DB_NAME}")
     print(f"      Collection: {COLLECTION_NAME}")
     
+    fetcher = MongoFetcher(MONGO_URI, DB_NAME, COLLECTION_NAME)
+    if full:
+        return fetcher, None
+    limit = budget.fit_batch_size(DEFAULT_FETCH_LIMIT, ESTIMATED_BYTES_PER_REVIEW, "fetch")
+    return fetcher, limit
+
+
+def _excluding(holdout) -> MongoFetcher:
+    """Fetcher over every review except the held-out ones."""
+    return MongoFetcher(MONGO_URI, DB_NAME, COLLECTION_NAME, query=MongoFetcher.excluding(holdout["_id"].tolist()))
+
+
+def _cache_keys(
+    fetcher: MongoFetcher,
+    limit: Optional[int],
+    transformer: TextSentimentTransformer,
+    balanced: bool = True
+):
+    """(corpus key, features key) for the reviews `fetcher` would return."""
+    with timed("fingerprint"):
+        fingerprint = fetcher.fingerprint(limit=limit)
+    config = transformer.preprocessing_config()
+    corpus = corpus_key(fingerprint, config, balanced=balanced)
+    return corpus, features_key(corpus, config)
+
+
+def _prepare_corpus(
+    fetcher: MongoFetcher,
+    limit: int,
+    transformer: TextSentimentTransformer,
+    budget: MemoryBudget,
+    cache: Optional[TrainingCache] = None,
+    key: Optional[str] = None
+):
+    """
+    Cleaned, labelled training corpus, from the cache when the source data and
+    cleaning settings are unchanged. Returns None (after printing why) on failure.
+    """
+    if cache is not None:
+        prepared = cache.load_corpus(key)
+        if prepared is not None:
+            print(f"\n[2/4] Source data unchanged; loaded {len(prepared):,} cleaned reviews from cache (corpus-{key})")
+            return prepared
+
     try:
-        fetcher = MongoFetcher(MONGO_URI, DB_NAME, COLLECTION_NAME)
         print("\n[2/4] Fetching data...")
-        data = fetcher.fetch_data(limit=DEFAULT_FETCH_LIMIT)
+        with budget.track("fetch"), timed("fetch") as timing:
+            data = fetcher.fetch_data(limit=limit)
+            timing.items = len(data)
     except Exception as e:
         print(f"Error fetching data: {e}")
-        return False
+        return None
+    budget.check("fetch")
 
     if not data:
         print("No data found in MongoDB.")
         print("Please run: python scripts/download_data.py")
         print("Then run: python scripts/initialize_db.py")
-        return False
+        return None
     
     print(f"      Fetched {len(data)} reviews")
+
+    with budget.track("clean"):
+        prepared = transformer.prepare_training_data(data)
+    # The raw reviews are no longer needed once they are cleaned
+    del data
+    budget.check("clean")
+    if cache is not None:
+        cache.save_corpus(key, prepared)
+    return prepared
+
+
+def _stream_corpus(
+    fetcher: MongoFetcher,
+    transformer: TextSentimentTransformer,
+    budget: MemoryBudget,
+    workers: int,
+    deadline: Optional[float],
+    cache: Optional[TrainingCache] = None,
+    key: Optional[str] = None
+):
+    """
+    Full profile: labels and cleans the whole collection batch by batch on
+    `workers` processes, keeping both classes in full. If the time budget runs
+    out, the reviews cleaned so far are cached and the next run resumes after
+    them. Returns None (after printing why) on failure.
+    """
+    done, skip = None, 0
+    if cache is not None:
+        prepared = cache.load_corpus(key)
+        if prepared is not None:
+            print(f"\n[2/4] Source data unchanged; loaded {len(prepared):,} cleaned reviews from cache (corpus-{key})")
+            return prepared
+        partial = cache.load_partial_corpus(key)
+        if partial is not None:
+            done, skip = partial
+
+    batch_size = budget.fit_batch_size(FULL_TRAINING_BATCH_SIZE, ESTIMATED_BYTES_PER_REVIEW * workers * 2, "stream")
+    print(f"\n[2/4] Streaming the whole collection ({batch_size:,} per batch, {workers} cleaning workers)...")
+    if skip:
+        print(f"      Resuming after {skip:,} reviews cleaned by an earlier run (partial-{key})")
+    try:
+        with budget.track("stream"):
+            prepared = stream_training_corpus(
+                fetcher, transformer, batch_size, workers=workers, budget=budget, deadline=deadline, skip=skip
+            )
+    except StreamTimeout as e:
+        if cache is not None and e.reviews_done > skip:
+            cache.save_partial_corpus(key, pd.concat([done, e.prepared], ignore_index=True), e.reviews_done)
+            print(f"\n      Kept {e.reviews_done:,} cleaned reviews; the next run resumes after them")
+        raise
+    except (MemoryBudgetExceeded, TimeoutError):
+        raise
+    except Exception as e:
+        print(f"Error fetching data: {e}")
+        return None
+
+    if prepared.empty:
+        print("No data found in MongoDB.")
+        print("Please run: python scripts/download_data.py")
+        print("Then run: python scripts/initialize_db.py")
+        return None
+
+    if done is not None:
+        prepared = pd.concat([done, prepared], ignore_index=True)
+    print(f"      Cleaned {len(prepared):,} labelled reviews")
+    if cache is not None:
+        cache.save_corpus(key, prepared)
+    return prepared
+
+
+def _build_model(params: dict, full: bool) -> LogisticRegression:
+    if not full:
+        return LogisticRegression(C=params["C"], max_iter=LOGISTIC_REGRESSION_MAX_ITER, random_state=RANDOM_STATE)
+    # Class weights stand in for downsampling so no review is thrown away;
+    # warm starts let the fit run in rounds that check the time budget.
+    return LogisticRegression(
+        C=params["C"],
+        solver=FULL_TRAINING_SOLVER,
+        class_weight="balanced",
+        max_iter=FULL_TRAINING_ITERATIONS_PER_ROUND,
+        warm_start=True,
+        random_state=RANDOM_STATE,
+    )
+
+
+def _precision_sample(texts, y: np.ndarray):
+    """
+    A bounded sample of the cleaned reviews for the float64 comparison:
+    (train texts, train labels, test texts), drawn from the same split the
+    model is trained and evaluated on.
+    """
+    train_idx, test_idx = train_test_split(
+        np.arange(len(y)), test_size=TRAIN_TEST_SPLIT_RATIO, random_state=RANDOM_STATE, stratify=y
+    )
+    rng = np.random.default_rng(RANDOM_STATE)
+    train_idx = np.sort(rng.permutation(train_idx)[:PRECISION_CHECK_TRAIN_SIZE])
+    test_idx = np.sort(rng.permutation(test_idx)[:PRECISION_CHECK_TEST_SIZE])
+    return texts.iloc[train_idx].tolist(), y[train_idx], texts.iloc[test_idx].tolist()
+
+
+def _fit_precision_pair(params: dict, full: bool, vectorizer, dtype, texts, y):
+    """The training pipeline fitted on `texts` with features and coefficients in `dtype`."""
+    vectorizer = clone(vectorizer).set_params(dtype=np.dtype(dtype).type)
+    X = vectorizer.fit_transform(texts)
+    model = _build_model(params, full)
+    if full:
+        # The sample is small enough for one fit rather than rounds against the time budget
+        model.set_params(warm_start=False, max_iter=FULL_TRAINING_MAX_ITER)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        model.fit(X, y)
+    downcast_model(model, dtype)
+    return model, vectorizer
+
+
+def _check_precision(params: dict, full: bool, vectorizer, dtype: str, sample, budget: MemoryBudget, deadline):
+    """
+    Fits the pipeline in `dtype` and in float64 on the sampled training
+    reviews and prints how far their probabilities drift on the sampled test
+    reviews. Skipped (with a warning) once the time budget has run out.
+    """
+    train_texts, y_train, test_texts = sample
+    pairs = []
+    with budget.track("precision"), timed("precision_check", items=len(train_texts)):
+        for fit_dtype in (dtype, np.float64):
+            if deadline is not None and time.monotonic() > deadline:
+                print(f"      [WARN] Time budget reached; {dtype} vs float64 check skipped")
+                return
+            try:
+                pairs.append(_fit_precision_pair(params, full, vectorizer, fit_dtype, train_texts, y_train))
+            except ValueError as e:
+                print(f"      [WARN] {dtype} vs float64 check skipped: {e}")
+                return
+    budget.check("precision")
+    (model, vectorizer), (reference_model, reference_vectorizer) = pairs
+    report = precision_report(reference_model, reference_vectorizer, model, vectorizer, test_texts)
+    status = "OK" if report["max_abs_diff"] <= FLOAT32_PROBABILITY_TOLERANCE else "WARN"
+    print(f"      [{status}] {dtype} vs float64 pipeline, {len(train_texts):,} sampled training "
+          f"and {len(test_texts):,} test reviews:")
+    print(f"            Max |Δp|: {report['max_abs_diff']:.2e} (tolerance {FLOAT32_PROBABILITY_TOLERANCE:.0e})")
+    print(f"            Mean |Δp|: {report['mean_abs_diff']:.2e}")
+    print(f"            Label agreement: {report['label_agreement']:.4%}")
+
+
+def _fit_within_deadline(model: LogisticRegression, X, y, deadline: float) -> int:
+    """
+    Fits a warm-started model a round of iterations at a time until it
+    converges, reaches FULL_TRAINING_MAX_ITER or runs out of time. Returns the
+    iterations run.
+    """
+    iterations = 0
+    while True:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            model.fit(X, y)
+        round_iterations = int(np.max(model.n_iter_))
+        iterations += round_iterations
+        if round_iterations < model.max_iter:
+            print(f"      Converged after {iterations} iterations")
+            return iterations
+        if iterations >= FULL_TRAINING_MAX_ITER:
+            print(f"      [WARN] Stopped at the {FULL_TRAINING_MAX_ITER}-iteration limit before converging")
+            return iterations
+        if time.monotonic() > deadline:
+            print(f"      [WARN] Time budget reached after {iterations} iterations; keeping the current coefficients")
+            return iterations
+
+
+def _train(
+    dtype: str,
+    params: dict,
+    budget: MemoryBudget,
+    cache: Optional[TrainingCache] = None,
+    profile: str = "default",
+    deadline: Optional[float] = None,
+    workers: int = 1
+):
+    full = profile == "full"
+    print("=" * 50)
+    print(f"Starting Training Pipeline ({profile} profile)")
+    print("=" * 50)
     
-    print("\n[3/4] Transforming data...")
-    transformer = TextSentimentTransformer()
-    
+    fetcher, limit = _connect(budget, full=full)
+    transformer = TextSentimentTransformer(
+        max_features=params["max_features"],
+        dtype=dtype,
+        ngram_range=params["ngram_range"],
+        min_df=params["min_df"],
+    )
+    cached, corpus, features = None, None, None
+    # A bounded sample of cleaned reviews, kept only to check a narrower dtype against float64
+    precision_sample = None
+    validate_precision = np.dtype(dtype) != np.float64
     try:
-        X, y = transformer.transform(data)
-        print(f"      Feature matrix shape: {X.shape}")
-        print(f"      Positive samples: {sum(y == 1)}")
-        print(f"      Negative samples: {sum(y == 0)}")
+        # Reviews inserted after this point are left for retrain_incremental.py
+        watermark = fetcher.latest_watermark()
+        # Reviews set aside to gate incremental updates are never trained on
+        holdout, holdout_id = set_aside_holdout(
+            MongoFetcher(MONGO_URI, DB_NAME, COLLECTION_NAME, query=MongoFetcher.after_watermark(None, watermark)),
+            transformer, INCREMENTAL_HOLDOUT_SIZE, load_training_state(),
+        )
+        print(f"      Holdout: {len(holdout):,} reviews set aside (holdout {holdout_id})")
+        check_deadline(deadline, "holdout")
+        fetcher = _excluding(holdout)
+        if cache is not None:
+            corpus, features = _cache_keys(fetcher, limit, transformer, balanced=not full)
+            check_deadline(deadline, "fingerprint")
+    except TimeoutError:
+        raise
     except Exception as e:
-        print(f"Error during transformation: {e}")
+        print(f"Error fetching data: {e}")
         return False
-    
-    DATA_DIR.mkdir(exist_ok=True)
-    transformer.save_vectorizer(str(VECTORIZER_PATH))
+    if cache is not None:
+        cached = cache.load_features(features)
+
+    if cached is not None:
+        X, y, transformer.vectorizer = cached
+        print(f"\n[2/4] Source data and preprocessing unchanged; loaded features from cache (features-{features})")
+        print("\n[3/4] Transforming data... skipped")
+        if validate_precision:
+            prepared = cache.load_corpus(corpus)
+            if prepared is not None:
+                precision_sample = _precision_sample(prepared["Cleaned_Content"], np.asarray(y))
+            del prepared
+    else:
+        if full:
+            prepared = _stream_corpus(fetcher, transformer, budget, workers, deadline, cache, corpus)
+        else:
+            prepared = _prepare_corpus(fetcher, limit, transformer, budget, cache, corpus)
+        if prepared is None:
+            return False
+        check_deadline(deadline, "clean")
+        print("\n[3/4] Transforming data...")
+        try:
+            with budget.track("transform"):
+                X, y = transformer.fit_prepared(prepared)
+        except Exception as e:
+            print(f"Error during transformation: {e}")
+            return False
+        if validate_precision:
+            precision_sample = _precision_sample(prepared["Cleaned_Content"], np.asarray(y))
+        del prepared
+        if cache is not None:
+            cache.save_features(features, X, y, transformer.vectorizer)
+    y = np.asarray(y)
+    print(f"      Feature matrix shape: {X.shape} ({X.dtype}, {_sparse_nbytes(X) / 1024 ** 2:.1f} MB)")
+    print(f"      Positive samples: {sum(y == 1)}")
+    print(f"      Negative samples: {sum(y == 0)}")
+    budget.check("transform")
+    check_deadline(deadline, "transform")
     
     print("\n[4/4] Training model...")
     
@@ -75,11 +454,17 @@ def train():
         X, y, test_size=TRAIN_TEST_SPLIT_RATIO, random_state=RANDOM_STATE, stratify=y
     )
     
-    model = LogisticRegression(max_iter=LOGISTIC_REGRESSION_MAX_ITER, random_state=RANDOM_STATE)
-    model.fit(X_train, y_train)
+    model = _build_model(params, full)
+    with budget.track("train"), timed("train", items=X_train.shape[0]):
+        if full:
+            _fit_within_deadline(model, X_train, y_train, deadline)
+        else:
+            model.fit(X_train, y_train)
+    budget.check("train")
     
-    train_preds = model.predict(X_train)
-    test_preds = model.predict(X_test)
+    with timed("evaluate", items=X_train.shape[0] + X_test.shape[0]):
+        train_preds = model.predict(X_train)
+        test_preds = model.predict(X_test)
     
     train_acc = accuracy_score(y_train, train_preds)
     test_acc = accuracy_score(y_test, test_preds)
@@ -90,8 +475,39 @@ def train():
     print("\n      Classification Report (Test Set):")
     print(classification_report(y_test, test_preds, target_names=["Negative", "Positive"]))
     
-    joblib.dump(model, str(MODEL_PATH))
-    print(f"\n[OK] Model saved to {MODEL_PATH}")
+    if validate_precision:
+        downcast_model(model, dtype)
+        if precision_sample is None:
+            print(f"      [WARN] Cleaned reviews not cached; {dtype} vs float64 check skipped")
+        else:
+            _check_precision(params, full, transformer.vectorizer, dtype, precision_sample, budget, deadline)
+            del precision_sample
+    
+    # Publish as a new registry version; running services switch to it atomically
+    with timed("save", items=2):
+        published = ModelRegistry().publish(model, transformer.vectorizer, {
+            "source": "train_model",
+            "profile": profile,
+            "params": {**params, "ngram_range": list(params["ngram_range"])},
+            "dtype": str(np.dtype(dtype)),
+            "train_rows": int(X_train.shape[0]),
+            "test_rows": int(X_test.shape[0]),
+            "fetch_limit": limit,
+            "watermark": watermark,
+            "holdout": holdout_id,
+            "metrics": {
+                "train_accuracy": float(train_acc),
+                "test_accuracy": float(test_acc),
+                "test_f1_macro": float(f1_score(y_test, test_preds, average="macro")),
+            },
+        })
+    save_training_state(
+        watermark, mode=profile, reviews=int(X.shape[0]), holdout=holdout_id, version=published.version
+    )
+    benchmark = published.metadata["benchmark"]
+    print(f"\n[OK] Model published as version {published.version}")
+    print(f"      Load time: {benchmark['load_seconds'] * 1000:.1f} ms, "
+          f"latency p50/p99: {benchmark['latency_p50_ms']:.2f}/{benchmark['latency_p99_ms']:.2f} ms")
     
     print("\n" + "=" * 50)
     print("Training Complete!")
@@ -99,6 +515,249 @@ def train():
     return True
 
 
+def search(mode: str, n_candidates: int, n_jobs: int, dtype: str = FEATURE_DTYPE, use_cache: bool = True):
+    """
+    Evaluates hyperparameter candidates in parallel and reports accuracy,
+    training time, inference latency and artifact size. Nothing is saved
+    except the report.
+    """
+    budget = MemoryBudget()
+    print("=" * 50)
+    print(f"Starting Hyperparameter Search ({mode})")
+    print("=" * 50)
+
+    try:
+        # Clean once (or reuse a cached corpus); every candidate vectorizes the same cleaned texts
+        fetcher, limit = _connect(budget)
+        transformer = TextSentimentTransformer(dtype=dtype)
+        cache = TrainingCache() if use_cache else None
+        corpus = None
+        if cache is not None:
+            try:
+                corpus, _ = _cache_keys(fetcher, limit, transformer)
+            except Exception as e:
+                print(f"Error fetching data: {e}")
+                return False
+        prepared = _prepare_corpus(fetcher, limit, transformer, budget, cache, corpus)
+        if prepared is None:
+            return False
+        print(f"\n[3/4] Splitting {len(prepared):,} cleaned reviews (shared by all candidates)...")
+        texts = prepared["Cleaned_Content"].tolist()
+        y = prepared["Sentiment"].to_numpy()
+        train_texts, test_texts, y_train, y_test = train_test_split(
+            texts, y, test_size=TRAIN_TEST_SPLIT_RATIO, random_state=RANDOM_STATE, stratify=y
+        )
+
+        candidates = candidate_params(mode, n_candidates)
+        print(f"\n[4/4] Evaluating {len(candidates)} candidates on {len(train_texts):,} reviews (n_jobs={n_jobs})...")
+        with budget.track("search"):
+            results = run_search(candidates, train_texts, y_train, test_texts, y_test, n_jobs=n_jobs, dtype=dtype)
+        budget.check("search")
+    except MemoryBudgetExceeded as e:
+        print(f"\n[FAIL] {e}")
+        print("      Lower the fetch limit, use fewer --jobs or raise MEMORY_BUDGET_MB.")
+        return False
+
+    print(f"\n      Latency budget: p99 <= {LATENCY_SLO_P99_MS:g} ms per review")
+    if n_jobs != 1:
+        print("      Timings were measured with candidates running concurrently; use --jobs 1 for clean numbers.")
+    print("\n      " + format_report(results).replace("\n", "\n      "))
+
+    path = save_report(results, {
+        "mode": mode,
+        "dtype": dtype,
+        "n_jobs": n_jobs,
+        "train_size": len(train_texts),
+        "test_size": len(test_texts),
+        "latency_budget_p99_ms": LATENCY_SLO_P99_MS,
+    })
+    print(f"\n[OK] Report saved to {path}")
+
+    best = best_within_budget(results)
+    if best is None:
+        print("\n[WARN] No candidate meets the latency budget.")
+    else:
+        p = best["params"]
+        print(f"\n      Best within budget: accuracy {best['accuracy']:.4f}, p99 {best['latency_p99_ms']:.3f} ms")
+        print(
+            f"      Train it with: python scripts/train_model.py --max-features {p['max_features']} "
+            f"--ngram-max {p['ngram_range'][1]} --min-df {p['min_df']} --C {p['C']:g}"
+        )
+    return True
+
+
+def compact(
+    feature_counts: List[int],
+    method: str,
+    dtype: str = FEATURE_DTYPE,
+    use_cache: bool = True,
+    activate: bool = False
+):
+    """
+    Prunes the active model to its top-k features for each k, refits on the
+    reduced space and reports accuracy, size, load time and latency against
+    the full model. The smallest pair within COMPACT_MAX_ACCURACY_DROP is
+    published to the registry (activated only if `activate`).
+    """
+    budget = MemoryBudget()
+    print("=" * 50)
+    print(f"Starting Compact Export ({method} selection)")
+    print("=" * 50)
+
+    registry = ModelRegistry()
+    source = registry.active()
+    if source is None:
+        print("No registry model to compact. Please run: python scripts/train_model.py")
+        return False
+    artifacts = registry.artifacts()
+    model, vectorizer = artifacts.model, artifacts.vectorizer
+    print(f"      Source version: {source.version} ({len(vectorizer.vocabulary_):,} features)")
+
+    # The full model is scored on its own test split, rebuilt from the recorded
+    # fetch limit and holdout; other sources' splits cannot be reproduced
+    metadata = source.metadata
+    transformer = TextSentimentTransformer(dtype=dtype)
+    holdout = load_holdout(transformer, metadata.get("holdout"))
+    if (metadata.get("source") != "train_model" or metadata.get("profile") != "default"
+            or "fetch_limit" not in metadata or holdout is None):
+        print("[FAIL] Compact export needs a source version published by a default-profile train_model.py run")
+        print("      whose holdout is still current. Please run: python scripts/train_model.py")
+        return False
+    estimator = _build_model({**default_params(), **metadata.get("params", {})}, full=False)
+
+    try:
+        _connect(budget)
+        fetcher, limit = _excluding(holdout), metadata["fetch_limit"]
+        cache = TrainingCache() if use_cache else None
+        corpus = None
+        if cache is not None:
+            try:
+                corpus, _ = _cache_keys(fetcher, limit, transformer)
+            except Exception as e:
+                print(f"Error fetching data: {e}")
+                return False
+        prepared = _prepare_corpus(fetcher, limit, transformer, budget, cache, corpus)
+        if prepared is None:
+            return False
+        y = prepared["Sentiment"].to_numpy()
+        with budget.track("transform"), timed("vectorize", items=len(prepared)):
+            X = transformer.vectorize_cleaned(prepared["Cleaned_Content"].tolist(), vectorizer=vectorizer)
+        del prepared
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=TRAIN_TEST_SPLIT_RATIO, random_state=RANDOM_STATE, stratify=y
+        )
+        if (X_train.shape[0], X_test.shape[0]) != (metadata.get("train_rows"), metadata.get("test_rows")):
+            print(f"\n[FAIL] The training reviews of {source.version} changed since it was trained;")
+            print("      its test split cannot be rebuilt. Please run: python scripts/train_model.py")
+            return False
+
+        print(f"\n[3/4] Ranking features by {method}...")
+        ranking = compact_export.rank_features(model, method, X_train, y_train)
+        test_preds = model.predict(X_test)
+        baseline = {
+            "k": len(vectorizer.vocabulary_),
+            "accuracy": float(accuracy_score(y_test, test_preds)),
+            "f1_macro": float(f1_score(y_test, test_preds, average="macro")),
+            **compact_export.measure_pair(model, vectorizer),
+        }
+
+        feature_counts = sorted(k for k in set(feature_counts) if 0 < k < baseline["k"])
+        print(f"\n[4/4] Refitting on the top {', '.join(f'{k:,}' for k in feature_counts)} features...")
+        with budget.track("compact"):
+            results = [
+                compact_export.compact_candidate(estimator, vectorizer, ranking, k, X_train, y_train, X_test, y_test, dtype)
+                for k in feature_counts
+            ]
+        budget.check("compact")
+    except MemoryBudgetExceeded as e:
+        print(f"\n[FAIL] {e}")
+        return False
+
+    print("\n      " + compact_export.format_report(baseline, results).replace("\n", "\n      "))
+    print("      * full model")
+    report = [{k: v for k, v in r.items() if k not in ("model", "vectorizer")} for r in results]
+    path = save_report(report, {
+        "source_version": source.version,
+        "selection": method,
+        "dtype": dtype,
+        "test_size": int(X_test.shape[0]),
+        "max_accuracy_drop": COMPACT_MAX_ACCURACY_DROP,
+        "baseline": baseline,
+    }, path=COMPACT_REPORT_PATH)
+    print(f"\n[OK] Report saved to {path}")
+
+    chosen = compact_export.smallest_within(results, baseline["accuracy"], COMPACT_MAX_ACCURACY_DROP)
+    if chosen is None:
+        print(f"\n[WARN] No candidate is within {COMPACT_MAX_ACCURACY_DROP} accuracy of the full model; nothing published.")
+        return True
+
+    with timed("save", items=2):
+        published = registry.publish(chosen["model"], chosen["vectorizer"], {
+            "source": "compact_export",
+            "selection": method,
+            "features": chosen["k"],
+            "dtype": str(np.dtype(dtype)),
+            "compacted_from": source.version,
+            # Refitted on the source's reviews, so incremental updates continue from its watermark
+            "watermark": metadata.get("watermark"),
+            "holdout": metadata.get("holdout"),
+            "metrics": {"test_accuracy": chosen["accuracy"], "test_f1_macro": chosen["f1_macro"]},
+        }, activate=activate)
+    print(f"\n[OK] Published {chosen['k']:,}-feature model as version {published.version}")
+    if not activate:
+        print(f"      Serve it on a replica with SERVING_MODEL_VERSION={published.version}")
+        print(f"      (keep it until then with: python scripts/registry.py pin {published.version})")
+        print(f"      or make it the default with: python scripts/registry.py activate {published.version}")
+    return True
+
+
 if __name__ == "__main__":
-    success = train()
+    parser = argparse.ArgumentParser(description="Train the sentiment model.")
+    parser.add_argument("--dtype", choices=["float32", "float64"], default=FEATURE_DTYPE,
+                        help="Precision of TF-IDF features and saved model coefficients")
+    parser.add_argument("--profile", choices=["default", "full"], default="default",
+                        help="'full' streams and trains on the whole collection")
+    parser.add_argument("--time-budget", type=float, default=FULL_TRAINING_TIME_BUDGET_SECONDS,
+                        help="Seconds the full profile may take before it stops")
+    parser.add_argument("--workers", type=int, default=FULL_TRAINING_CLEAN_WORKERS,
+                        help="Cleaning processes for the full profile")
+    parser.add_argument("--max-features", type=int, default=TFIDF_MAX_FEATURES, help="TF-IDF vocabulary size")
+    parser.add_argument("--ngram-max", type=int, default=TFIDF_NGRAM_RANGE[1], help="Longest n-gram (1 = unigrams)")
+    parser.add_argument("--min-df", type=int, default=None,
+                        help=f"Minimum document frequency of a term (default {TFIDF_MIN_DF}, {FULL_TRAINING_MIN_DF} for --profile full)")
+    parser.add_argument("--C", type=float, default=LOGISTIC_REGRESSION_C, help="Inverse regularization strength")
+    parser.add_argument("--search", choices=["grid", "random"], default=None,
+                        help="Evaluate SEARCH_SPACE instead of training one model")
+    parser.add_argument("--candidates", type=int, default=SEARCH_RANDOM_CANDIDATES,
+                        help="Candidates sampled by --search random")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel search workers (-1 = all cores)")
+    parser.add_argument("--compact", type=int, nargs="*", default=None, metavar="K",
+                        help=f"Export a top-K-feature version of the active model (default K: {COMPACT_FEATURE_COUNTS})")
+    parser.add_argument("--select", choices=compact_export.SELECTION_METHODS, default=COMPACT_SELECTION,
+                        help="Feature ranking for --compact")
+    parser.add_argument("--activate", action="store_true", help="Activate the compact version once published")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Rebuild the cleaned corpus and features instead of using TRAINING_CACHE_DIR")
+    args = parser.parse_args()
+    if args.compact is not None:
+        success = compact(
+            args.compact or COMPACT_FEATURE_COUNTS, args.select,
+            dtype=args.dtype, use_cache=not args.no_cache, activate=args.activate,
+        )
+    elif args.search:
+        success = search(args.search, args.candidates, args.jobs, dtype=args.dtype, use_cache=not args.no_cache)
+    else:
+        success = train(
+            dtype=args.dtype,
+            use_cache=not args.no_cache,
+            profile=args.profile,
+            time_budget=args.time_budget,
+            workers=args.workers,
+            params={
+                "max_features": args.max_features,
+                "ngram_range": (1, args.ngram_max),
+                "min_df": args.min_df,
+                "C": args.C,
+            },
+        )
     sys.exit(0 if success else 1)
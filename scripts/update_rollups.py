@@ -0,0 +1,45 @@
+"""
+Folds newly ingested reviews into the EDA rollups, or rebuilds them.
+
+    python scripts/update_rollups.py            # reviews since the last update
+    python scripts/update_rollups.py --rebuild  # recompute from every review
+
+Run it after loading reviews by any other route than initialize_db.py; the
+Data Explorer also catches up on each visit.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import MONGO_URI, DB_NAME, COLLECTION_NAME, ROLLUP_BATCH_SIZE
+from src.rollups import ReviewRollups
+
+
+def update_rollups(rebuild: bool = False, batch_size: int = ROLLUP_BATCH_SIZE) -> bool:
+    rollups = ReviewRollups(MONGO_URI, DB_NAME, COLLECTION_NAME)
+    try:
+        added = rollups.rebuild(batch_size) if rebuild else rollups.update(batch_size)
+        snapshot = rollups.load()
+    except Exception as e:
+        print(f"[FAIL] Could not update rollups: {e}")
+        return False
+
+    if snapshot is None:
+        print("[WARN] No reviews to roll up")
+        return True
+    print(f"[OK] Rolled up {added:,} reviews; {snapshot.total:,} in total")
+    print(f"     Products: {snapshot.unique_products:,}  Users: {snapshot.unique_users:,}  "
+          f"Average score: {snapshot.average_score:.2f}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the rollups from every review")
+    parser.add_argument("--batch-size", type=int, default=ROLLUP_BATCH_SIZE)
+    args = parser.parse_args()
+    sys.exit(0 if update_rollups(args.rebuild, args.batch_size) else 1)
@@ -0,0 +1,123 @@
+"""
+Compact model export for low-latency, memory-constrained serving.
+
+The vocabulary of a trained model is pruned to its k most useful features,
+ranked by coefficient magnitude or by chi² against the labels, and the
+classifier is refitted on the reduced space. The reduced vectorizer keeps
+the original IDF weights of the kept terms, so the training features are the
+original TF-IDF columns re-normalized and no text has to be vectorized again.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_selection import chi2
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.preprocessing import normalize
+from src.loaders.model_registry import MODEL_FILE, VECTORIZER_FILE, benchmark_artifacts
+from src.loaders.sentiment_loader import downcast_model
+
+SELECTION_METHODS = ("coef", "chi2")
+
+
+def rank_features(model: Any, method: str = "coef", X=None, y=None) -> np.ndarray:
+    """Feature indices, most useful first."""
+    if method == "coef":
+        scores = np.abs(np.asarray(model.coef_)).max(axis=0)
+    elif method == "chi2":
+        if X is None or y is None:
+            raise ValueError("chi2 selection needs the training features and labels")
+        scores, _ = chi2(X, y)
+        scores = np.nan_to_num(scores)
+    else:
+        raise ValueError(f"Unknown selection method '{method}'. Expected one of {SELECTION_METHODS}.")
+    return np.argsort(scores, kind="stable")[::-1]
+
+
+def reduce_vectorizer(vectorizer: TfidfVectorizer, features: np.ndarray) -> TfidfVectorizer:
+    """A fitted vectorizer that produces only `features`, in that order."""
+    terms = vectorizer.get_feature_names_out()[features]
+    params = vectorizer.get_params()
+    params.update(vocabulary={term: i for i, term in enumerate(terms)}, max_features=None)
+    reduced = TfidfVectorizer(**params)
+    reduced.idf_ = vectorizer.idf_[features]
+    return reduced
+
+
+def reduce_features(X, features: np.ndarray, vectorizer: TfidfVectorizer):
+    """What `reduce_vectorizer(vectorizer, features)` would produce for the texts behind `X`."""
+    X = X[:, features]
+    return normalize(X, norm=vectorizer.norm, copy=False) if vectorizer.norm else X
+
+
+def compact_candidate(
+    estimator: Any,
+    vectorizer: TfidfVectorizer,
+    ranking: np.ndarray,
+    k: int,
+    X_train,
+    y_train: np.ndarray,
+    X_test,
+    y_test: np.ndarray,
+    dtype: str = "float32"
+) -> Dict[str, Any]:
+    """
+    Fits a clone of the unfitted `estimator` (built from the source model's
+    training parameters) on the top `k` ranked features and measures quality
+    and serving cost. The result holds the reduced pair under
+    "model" and "vectorizer".
+    """
+    features = np.sort(ranking[:k])
+    reduced_vectorizer = reduce_vectorizer(vectorizer, features)
+    reduced_model = clone(estimator)
+
+    start = time.perf_counter()
+    reduced_model.fit(reduce_features(X_train, features, vectorizer), y_train)
+    downcast_model(reduced_model, dtype)
+    train_seconds = time.perf_counter() - start
+
+    preds = reduced_model.predict(reduce_features(X_test, features, vectorizer))
+    return {
+        "k": len(features),
+        "accuracy": float(accuracy_score(y_test, preds)),
+        "f1_macro": float(f1_score(y_test, preds, average="macro")),
+        "train_seconds": train_seconds,
+        **measure_pair(reduced_model, reduced_vectorizer),
+        "model": reduced_model,
+        "vectorizer": reduced_vectorizer,
+    }
+
+
+def measure_pair(model: Any, vectorizer: Any, cleaned_texts: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Registry benchmark (sizes, load time, latency) of an unpublished pair."""
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib.dump(model, Path(tmp) / MODEL_FILE)
+        joblib.dump(vectorizer, Path(tmp) / VECTORIZER_FILE)
+        return benchmark_artifacts(Path(tmp) / MODEL_FILE, Path(tmp) / VECTORIZER_FILE, cleaned_texts)
+
+
+def smallest_within(
+    results: List[Dict[str, Any]],
+    baseline_accuracy: float,
+    max_drop: float
+) -> Optional[Dict[str, Any]]:
+    """Smallest candidate whose accuracy is at most `max_drop` below the full model's."""
+    eligible = [r for r in results if r["accuracy"] >= baseline_accuracy - max_drop]
+    return min(eligible, key=lambda r: r["k"]) if eligible else None
+
+
+def format_report(baseline: Dict[str, Any], results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'features':>9}{'acc':>8}{'f1':>8}{'size KB':>9}{'load ms':>9}{'p50 ms':>8}{'p99 ms':>8}"]
+    for r in [baseline] + results:
+        size_kb = (r["model_bytes"] + r["vectorizer_bytes"]) / 1024
+        label = f"{r['k']:,}" + ("*" if r is baseline else "")
+        lines.append(
+            f"{label:>9}{r['accuracy']:>8.4f}{r['f1_macro']:>8.4f}{size_kb:>9,.0f}"
+            f"{r['load_seconds'] * 1000:>9.1f}{r['latency_p50_ms']:>8.3f}{r['latency_p99_ms']:>8.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""
+Streaming construction of large training corpora.
+
+Reviews are read from a fetcher one batch at a time and labelled and cleaned
+in a pool of worker processes, so only the cleaned text (not the raw reviews)
+of the whole collection is ever held in memory and cleaning uses every core.
+A stream that runs out of time hands back the batches it finished, so they
+can be kept and the next run can resume after them.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+import pandas as pd
+from src.fetchers.base import DataFetcher
+from src.memory import MemoryBudget
+from src.metrics import MetricsRecorder, current_recorder, recording, timed
+from src.models import Review
+from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+
+_CORPUS_COLUMNS = ["Cleaned_Content", "Sentiment"]
+
+_worker_transformer: Optional[TextSentimentTransformer] = None
+
+
+def _init_clean_worker(transformer: TextSentimentTransformer):
+    global _worker_transformer
+    _worker_transformer = transformer
+
+
+def _prepare_batch(transformer: TextSentimentTransformer, reviews: List[Review]) -> pd.DataFrame:
+    prepared = transformer.prepare_training_data(reviews, balance=False)
+    return prepared[_CORPUS_COLUMNS].reset_index(drop=True)
+
+
+def _prepare_in_worker(reviews: List[Review]) -> Tuple[pd.DataFrame, Dict[str, dict]]:
+    """Returns the labelled, cleaned batch and the stage timings recorded in this process."""
+    recorder = MetricsRecorder("clean-worker")
+    with recording(recorder):
+        prepared = _prepare_batch(_worker_transformer, reviews)
+    return prepared, recorder.stage_totals()
+
+
+class StreamTimeout(TimeoutError):
+    """Time ran out while streaming; `prepared` holds the first `reviews_done` reviews, cleaned."""
+
+    def __init__(self, message: str, prepared: pd.DataFrame, reviews_done: int):
+        super().__init__(message)
+        self.prepared = prepared
+        self.reviews_done = reviews_done
+
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame(columns=_CORPUS_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def check_deadline(deadline: Optional[float], stage: str):
+    """Raises TimeoutError once `deadline` (a time.monotonic() value) has passed."""
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError(f"Time budget exceeded during '{stage}'")
+
+
+def stream_training_corpus(
+    fetcher: DataFetcher,
+    transformer: TextSentimentTransformer,
+    batch_size: int,
+    workers: int = 1,
+    limit: Optional[int] = None,
+    budget: Optional[MemoryBudget] = None,
+    deadline: Optional[float] = None,
+    skip: int = 0
+) -> pd.DataFrame:
+    """
+    Labels and cleans every review `fetcher` streams after the first `skip`
+    (neutral reviews dropped, classes left unbalanced). Returns
+    `Cleaned_Content` and `Sentiment` columns.
+
+    At most two batches per worker are in flight, so memory is bounded by the
+    batch size no matter how large the collection is. Raises StreamTimeout,
+    carrying the batches finished in order, once `deadline` has passed.
+    """
+    recorder = current_recorder()
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_clean_worker, initargs=(transformer,)
+        )
+    pending: Deque[Tuple[Future, int]] = deque()
+    frames: List[pd.DataFrame] = []
+    reviews_seen = skip
+    # Reviews (counted from the start of the stream) whose batches are finished
+    reviews_done = skip
+
+    def collect(future: Future, size: int):
+        nonlocal reviews_done
+        prepared, stage_totals = future.result()
+        if recorder is not None:
+            recorder.merge(stage_totals)
+        frames.append(prepared)
+        reviews_done += size
+
+    try:
+        batches = fetcher.iter_batches(batch_size, limit=limit, skip=skip)
+        while True:
+            with timed("fetch") as timing:
+                batch = next(batches, None)
+                timing.items = len(batch) if batch else 0
+            if batch is None:
+                break
+            reviews_seen += len(batch)
+            if pool is None:
+                frames.append(_prepare_batch(transformer, batch))
+                reviews_done += len(batch)
+            else:
+                pending.append((pool.submit(_prepare_in_worker, batch), len(batch)))
+                while len(pending) >= workers * 2:
+                    collect(*pending.popleft())
+            del batch
+            if budget is not None:
+                budget.check("stream")
+            try:
+                check_deadline(deadline, "stream")
+            except TimeoutError as e:
+                # Keep the batches that are already cleaned, in stream order
+                while pending and pending[0][0].done():
+                    collect(*pending.popleft())
+                raise StreamTimeout(str(e), _concat(frames), reviews_done) from None
+            print(f"      {reviews_seen:,} reviews streamed", end="\r", flush=True)
+        while pending:
+            collect(*pending.popleft())
+    finally:
+        for future, _ in pending:
+            future.cancel()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    print(f"      {reviews_seen:,} reviews streamed")
+    return _concat(frames)
@@ -1,9 +1,44 @@
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Iterator, List, Optional
 from src.models import Review
 
+# Fields that training reads; a change to any other field does not change the fingerprint
+FINGERPRINT_FIELDS = ("Id", "Score", "Summary", "Text")
+
+
+def hash_fields(hasher, values: List[Any]):
+    """Feeds one record's fingerprint fields into `hasher`, unambiguously separated."""
+    for value in values:
+        hasher.update(str(value).encode("utf-8", "surrogatepass"))
+        hasher.update(b"\x1f")
+    hasher.update(b"\x1e")
+
 class DataFetcher(ABC):
     @abstractmethod
     def fetch_data(self) -> List[Review]:
         """Fetches data from the source and returns a list of Review objects."""
         pass
+
+    def iter_batches(self, batch_size: int, limit: Optional[int] = None, skip: int = 0) -> Iterator[List[Review]]:
+        """
+        Yields reviews in batches of at most `batch_size`, after the first
+        `skip` (e.g. to resume an interrupted stream). Sources that can stream
+        should override this to avoid loading everything.
+        """
+        reviews = self.fetch_data()[skip:]
+        if limit:
+            reviews = reviews[:limit]
+        for start in range(0, len(reviews), batch_size):
+            yield reviews[start:start + batch_size]
+
+    def fingerprint(self, limit: Optional[int] = None, batch_size: int = 1000) -> str:
+        """
+        Content hash of the reviews training would read (the same rows, in the
+        same order). Used to tell whether cached training inputs are still valid.
+        """
+        hasher = hashlib.sha1()
+        for batch in self.iter_batches(batch_size, limit=limit):
+            for review in batch:
+                hash_fields(hasher, [getattr(review, field) for field in FINGERPRINT_FIELDS])
+        return hasher.hexdigest()
@@ -1,4 +1,6 @@
-from typing import List
+import hashlib
+import os
+from typing import Iterator, List, Optional
 import pandas as pd
 from src.fetchers.base import DataFetcher
 from src.models import Review
@@ -7,21 +9,34 @@ class CSVFetcher(DataFetcher):
     def __init__(self, file_path: str):
         self.file_path = file_path
 
+    @staticmethod
+    def _to_review(row) -> Review:
+        return Review(
+            Id=str(row.get('Id')),
+            ProductId=str(row.get('ProductId')),
+            UserId=str(row.get('UserId')),
+            ProfileName=str(row.get('ProfileName')) if pd.notna(row.get('ProfileName')) else None,
+            HelpfulnessNumerator=int(row.get('HelpfulnessNumerator')) if pd.notna(row.get('HelpfulnessNumerator')) else None,
+            HelpfulnessDenominator=int(row.get('HelpfulnessDenominator')) if pd.notna(row.get('HelpfulnessDenominator')) else None,
+            Score=int(row.get('Score')),
+            Time=int(row.get('Time')) if pd.notna(row.get('Time')) else None,
+            Summary=str(row.get('Summary')) if pd.notna(row.get('Summary')) else None,
+            Text=str(row.get('Text'))
+        )
+
     def fetch_data(self) -> List[Review]:
         df = pd.read_csv(self.file_path)
         # Ensure columns match, simple mapping
-        reviews = []
-        for _, row in df.iterrows():
-            reviews.append(Review(
-                Id=str(row.get('Id')),
-                ProductId=str(row.get('ProductId')),
-                UserId=str(row.get('UserId')),
-                ProfileName=str(row.get('ProfileName')) if pd.notna(row.get('ProfileName')) else None,
-                HelpfulnessNumerator=int(row.get('HelpfulnessNumerator')) if pd.notna(row.get('HelpfulnessNumerator')) else None,
-                HelpfulnessDenominator=int(row.get('HelpfulnessDenominator')) if pd.notna(row.get('HelpfulnessDenominator')) else None,
-                Score=int(row.get('Score')),
-                Time=int(row.get('Time')) if pd.notna(row.get('Time')) else None,
-                Summary=str(row.get('Summary')) if pd.notna(row.get('Summary')) else None,
-                Text=str(row.get('Text'))
-            ))
-        return reviews
+        return [self._to_review(row) for row in df.to_dict("records")]
+
+    def iter_batches(self, batch_size: int, limit: Optional[int] = None, skip: int = 0) -> Iterator[List[Review]]:
+        """Streams the file with pandas chunking so only one batch is in memory."""
+        rows = range(1, skip + 1) if skip else None
+        for chunk in pd.read_csv(self.file_path, chunksize=batch_size, nrows=limit, skiprows=rows):
+            yield [self._to_review(row) for row in chunk.to_dict("records")]
+
+    def fingerprint(self, limit: Optional[int] = None, batch_size: int = 1000) -> str:
+        """The file's path, size and modification time; the file is not read."""
+        stat = os.stat(self.file_path)
+        key = f"{os.path.abspath(self.file_path)}:{stat.st_size}:{stat.st_mtime_ns}:{limit or 0}"
+        return hashlib.sha1(key.encode()).hexdigest()
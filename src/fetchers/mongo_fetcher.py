@@ -1,29 +1,121 @@
-from typing import List
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from bson import ObjectId
 from pymongo import MongoClient
-from src.fetchers.base import DataFetcher
+from src.fetchers.base import DataFetcher, FINGERPRINT_FIELDS, hash_fields
 from src.models import Review
 import os
 
 class MongoFetcher(DataFetcher):
-    def __init__(self, uri: str, db_name: str, collection_name: str):
+    def __init__(
+        self,
+        uri: str,
+        db_name: str,
+        collection_name: str,
+        query: Optional[Dict[str, Any]] = None,
+        limit: int = 100
+    ):
         self.client = MongoClient(uri)
         self.db = self.client[db_name]
         self.collection = self.db[collection_name]
+        self.query = query or {}
+        self.limit = limit
 
-    def fetch_data(self, limit: int = 100) -> List[Review]:
-        cursor = self.collection.find().limit(limit)
-        reviews = []
+    @staticmethod
+    def after_watermark(watermark: Optional[str], until: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Query for documents inserted after `watermark` and up to `until`
+        (ObjectIds grow with insertion time).
+        """
+        bounds = {}
+        if watermark:
+            bounds["$gt"] = ObjectId(watermark)
+        if until:
+            bounds["$lte"] = ObjectId(until)
+        return {"_id": bounds} if bounds else {}
+
+    @staticmethod
+    def excluding(ids: List[str]) -> Dict[str, Any]:
+        """Query for documents other than the ones with these `_id`s (e.g. a holdout)."""
+        return {"_id": {"$nin": [ObjectId(i) for i in ids]}} if ids else {}
+
+    def latest_watermark(self) -> Optional[str]:
+        """`_id` of the most recently inserted matching document, or None if there is none."""
+        doc = self.collection.find_one(self.query, {"_id": 1}, sort=[("_id", -1)])
+        return str(doc["_id"]) if doc else None
+
+    def sample_data(self, size: int) -> Tuple[List[str], List[Review]]:
+        """A random sample of up to `size` matching documents: their `_id`s and reviews, aligned."""
+        docs = list(self.collection.aggregate([{"$match": self.query}, {"$sample": {"size": size}}]))
+        return [str(doc["_id"]) for doc in docs], [self._to_review(doc) for doc in docs]
+
+    @staticmethod
+    def _to_review(doc: dict) -> Review:
+        return Review(
+            Id=str(doc.get('Id')),
+            ProductId=str(doc.get('ProductId')),
+            UserId=str(doc.get('UserId')),
+            ProfileName=str(doc.get('ProfileName')) if doc.get('ProfileName') else None,
+            HelpfulnessNumerator=int(doc.get('HelpfulnessNumerator')) if doc.get('HelpfulnessNumerator') is not None else None,
+            HelpfulnessDenominator=int(doc.get('HelpfulnessDenominator')) if doc.get('HelpfulnessDenominator') is not None else None,
+            Score=int(doc.get('Score')),
+            Time=int(doc.get('Time')) if doc.get('Time') is not None else None,
+            Summary=str(doc.get('Summary', '')),
+            Text=str(doc.get('Text'))
+        )
+
+    def fetch_data(self, limit: Optional[int] = None) -> List[Review]:
+        cursor = self.collection.find(self.query).limit(limit or self.limit)
+        return [self._to_review(doc) for doc in cursor]
+
+    def iter_batches(self, batch_size: int, limit: Optional[int] = None, skip: int = 0) -> Iterator[List[Review]]:
+        """
+        Streams matching documents in `_id` order through one cursor,
+        `batch_size` at a time, after the first `skip`. With no `limit` the
+        whole matching collection is streamed.
+        """
+        cursor = self.collection.find(self.query, batch_size=batch_size).sort("_id", 1)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        batch = []
+        for doc in cursor:
+            batch.append(self._to_review(doc))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def fingerprint(self, limit: Optional[int] = None, batch_size: int = 1000) -> str:
+        """
+        With a `limit`, hashes only the fields training reads, straight from
+        the cursor, over the same documents `fetch_data(limit=limit)` returns;
+        this skips building Review objects, so it is far cheaper than fetching
+        and cleaning.
+
+        With no `limit` the key is the query with the count and oldest and
+        newest `_id` of the documents it matches, read from the ends of the
+        `_id` index (and collection metadata for an empty query) instead of a
+        pass over every review. Reviews are only ever appended or deleted,
+        which this detects; after editing reviews in place, train with --no-cache.
+        """
+        hasher = hashlib.sha1(json.dumps(self.query, sort_keys=True, default=str).encode())
+        if not limit:
+            oldest = self.collection.find_one(self.query, {"_id": 1}, sort=[("_id", 1)])
+            newest = self.collection.find_one(self.query, {"_id": 1}, sort=[("_id", -1)])
+            count = (
+                self.collection.count_documents(self.query) if self.query
+                else self.collection.estimated_document_count()
+            )
+            key = [count, oldest and oldest["_id"], newest and newest["_id"]]
+            hash_fields(hasher, key)
+            return hasher.hexdigest()
+        projection = {field: 1 for field in FINGERPRINT_FIELDS}
+        projection["_id"] = 0
+        cursor = self.collection.find(self.query, projection, batch_size=batch_size).limit(limit)
         for doc in cursor:
-            reviews.append(Review(
-                Id=str(doc.get('Id')),
-                ProductId=str(doc.get('ProductId')),
-                UserId=str(doc.get('UserId')),
-                ProfileName=str(doc.get('ProfileName')) if doc.get('ProfileName') else None,
-                HelpfulnessNumerator=int(doc.get('HelpfulnessNumerator')) if doc.get('HelpfulnessNumerator') is not None else None,
-                HelpfulnessDenominator=int(doc.get('HelpfulnessDenominator')) if doc.get('HelpfulnessDenominator') is not None else None,
-                Score=int(doc.get('Score')),
-                Time=int(doc.get('Time')) if doc.get('Time') is not None else None,
-                Summary=str(doc.get('Summary', '')),
-                Text=str(doc.get('Text'))
-            ))
-        return reviews
+            hash_fields(hasher, [doc.get(field) for field in FINGERPRINT_FIELDS])
+        return hasher.hexdigest()
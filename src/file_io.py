@@ -0,0 +1,183 @@
+"""
+Chunked reading and incremental writing of tabular files (CSV or Parquet).
+
+Both directions work one chunk at a time so memory stays bounded by the
+chunk size rather than the file size. Parquet support requires `pyarrow`.
+
+Also holds the atomic write used for every artifact, report and state file.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Union
+import pandas as pd
+
+SUPPORTED_FORMATS = ("csv", "parquet")
+
+
+def write_atomic(path: Union[str, Path], write: Callable[[str], Any]):
+    """
+    Writes `path` through `write(tmp_path)` on a temporary file in the same
+    directory and renames it into place, so readers see the old file or the
+    new one, never a partial write.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        # mkstemp creates owner-only files; give the result the usual permissions
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_text_atomic(path: Union[str, Path], text: str):
+    def write(tmp_path: str):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    write_atomic(path, write)
+
+
+def write_json_atomic(path: Union[str, Path], payload: Any):
+    write_text_atomic(path, json.dumps(payload, indent=2))
+
+
+def detect_format(path: Union[str, Path]) -> str:
+    """Infers the file format from its extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"Unsupported file type '{suffix}'. Expected one of: .csv, .parquet")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet support requires pyarrow: pip install pyarrow") from e
+
+
+def iter_file_chunks(
+    path: Union[str, Path],
+    chunk_size: int,
+    columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Yields the file as DataFrames of at most `chunk_size` rows, in order."""
+    file_format = detect_format(path)
+    if file_format == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+        return
+
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+
+# Rows buffered while a column is still all-null and its Parquet type unknown
+SCHEMA_INFERENCE_MAX_ROWS = 100_000
+
+
+def _null_typed(table):
+    """`table` with every all-null column retyped as null, so it unifies with any type."""
+    import pyarrow as pa
+    for i, column in enumerate(table.columns):
+        if column.null_count == len(column) and not pa.types.is_null(column.type):
+            table = table.set_column(i, table.field(i).name, pa.nulls(len(column)))
+    return table
+
+
+class ChunkWriter:
+    """
+    Appends DataFrame chunks to a CSV or Parquet file as they arrive.
+    Use as a context manager so the Parquet footer is always written.
+
+    A Parquet file has one schema, taken from `schema` if given. Otherwise it
+    is inferred from the chunks, buffering them while any column has been
+    all-null so far (up to SCHEMA_INFERENCE_MAX_ROWS rows), so a column that
+    starts out empty still gets the type of its first values.
+    """
+
+    def __init__(self, path: Union[str, Path], file_format: Optional[str] = None, schema=None):
+        self.path = Path(path)
+        self.format = file_format or detect_format(path)
+        if self.format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported export format '{self.format}'")
+        if self.format == "parquet":
+            _require_pyarrow()
+        self.rows_written = 0
+        self._parquet_writer = None
+        self._schema = schema
+        self._pending = []
+        self._pending_rows = 0
+        self._csv_handle = None
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, df: pd.DataFrame):
+        if self.format == "csv":
+            if self._csv_handle is None:
+                self._csv_handle = open(self.path, "w", newline="", encoding="utf-8")
+                df.to_csv(self._csv_handle, index=False, header=True)
+            else:
+                df.to_csv(self._csv_handle, index=False, header=False)
+        else:
+            import pyarrow as pa
+            table = _null_typed(pa.Table.from_pandas(df, preserve_index=False))
+            if self._parquet_writer is None:
+                self._pending.append(table)
+                self._pending_rows += len(df)
+                if self._schema is None:
+                    schema = pa.unify_schemas([t.schema for t in self._pending], promote_options="default")
+                    if any(pa.types.is_null(f.type) for f in schema) and self._pending_rows < SCHEMA_INFERENCE_MAX_ROWS:
+                        self.rows_written += len(df)
+                        return
+                    self._schema = schema
+                self._open_parquet()
+            else:
+                self._write_table(table)
+        self.rows_written += len(df)
+
+    def _write_table(self, table):
+        try:
+            self._parquet_writer.write_table(table.cast(self._schema))
+        except (ValueError, NotImplementedError) as e:
+            raise ValueError(
+                f"Chunk does not match the Parquet schema of {self.path}; pass an explicit schema: {e}"
+            ) from e
+
+    def _open_parquet(self):
+        import pyarrow.parquet as pq
+        self._parquet_writer = pq.ParquetWriter(str(self.path), self._schema)
+        for table in self._pending:
+            self._write_table(table)
+        self._pending = []
+
+    def close(self):
+        if self._csv_handle is not None:
+            self._csv_handle.close()
+            self._csv_handle = None
+        if self._parquet_writer is None and self._pending:
+            import pyarrow as pa
+            if self._schema is None:
+                self._schema = pa.unify_schemas([t.schema for t in self._pending], promote_options="default")
+            self._open_parquet()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
@@ -0,0 +1,142 @@
+"""
+Incremental retraining on reviews that arrived after the last training run.
+
+Every training run records a watermark: the newest MongoDB `_id` present when
+it started. An incremental run cleans only the reviews past the watermark,
+vectorizes them with the current (frozen) vectorizer and continues the
+classifier from its current coefficients with a few SGD epochs over the new
+reviews, so its cost grows with the number of new reviews, not the
+collection. The candidate is compared with the current model on a fixed
+holdout before it may be published.
+
+The holdout is set aside by the full training run and excluded from its
+corpus, so the gate never scores a model on reviews it was trained on. Its key
+(the held-out `_id`s and the cleaning settings) is recorded with the training
+state; a holdout that does not match the current lineage is never used.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from src.config import (
+    TRAINING_STATE_PATH,
+    INCREMENTAL_HOLDOUT_PATH,
+    INCREMENTAL_SGD_ALPHA,
+    INCREMENTAL_LEARNING_RATE,
+    INCREMENTAL_EPOCHS,
+    INCREMENTAL_MAX_METRIC_DROP,
+    RANDOM_STATE,
+)
+from src.fetchers.mongo_fetcher import MongoFetcher
+from src.file_io import write_atomic, write_json_atomic
+from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+
+
+def load_training_state(path: Union[str, Path] = TRAINING_STATE_PATH) -> Optional[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_training_state(watermark: Optional[str], path: Union[str, Path] = TRAINING_STATE_PATH, **details):
+    """Records the watermark of the model that was just published."""
+    write_json_atomic(path, {
+        "watermark": watermark,
+        "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **details,
+    })
+
+
+def holdout_key(holdout: pd.DataFrame, transformer: TextSentimentTransformer) -> str:
+    """Identifies a holdout by its reviews and the cleaning settings its text was prepared with."""
+    payload = {
+        "ids": sorted(holdout["_id"].astype(str)),
+        "cleaning": transformer.preprocessing_config()["cleaning"],
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def load_holdout(
+    transformer: TextSentimentTransformer,
+    expected_key: Optional[str],
+    path: Union[str, Path] = INCREMENTAL_HOLDOUT_PATH
+) -> Optional[pd.DataFrame]:
+    """
+    The holdout (`_id`, cleaned text and labels) if it is the one recorded by
+    the current training lineage and was cleaned with the current settings,
+    otherwise None.
+    """
+    path = Path(path)
+    if expected_key is None or not path.exists():
+        return None
+    holdout = pd.read_parquet(path)
+    if "_id" not in holdout.columns or holdout_key(holdout, transformer) != expected_key:
+        return None
+    return holdout
+
+
+def set_aside_holdout(
+    fetcher: MongoFetcher,
+    transformer: TextSentimentTransformer,
+    size: int,
+    state: Optional[Dict[str, Any]] = None,
+    path: Union[str, Path] = INCREMENTAL_HOLDOUT_PATH
+) -> Tuple[pd.DataFrame, str]:
+    """
+    Called by train_model.py before its corpus is read. Keeps the recorded
+    holdout while the cleaning settings are unchanged (so cached corpora stay
+    valid), otherwise draws `size` random reviews from `fetcher`. Returns the holdout and its key; the caller must exclude the
+    holdout's `_id`s from training and record the key.
+    """
+    holdout = load_holdout(transformer, (state or {}).get("holdout"), path)
+    if holdout is None:
+        ids, reviews = fetcher.sample_data(size)
+        holdout = transformer.prepare_training_data(reviews, balance=False)
+        holdout["_id"] = [ids[i] for i in holdout.index]
+        holdout = holdout[["_id", "Id", "Cleaned_Content", "Sentiment"]].reset_index(drop=True)
+        write_atomic(path, lambda tmp_path: holdout.to_parquet(tmp_path, index=False))
+    return holdout, holdout_key(holdout, transformer)
+
+
+def evaluate(model: Any, X, y) -> Dict[str, float]:
+    preds = model.predict(X)
+    return {
+        "accuracy": float(accuracy_score(y, preds)),
+        "f1_macro": float(f1_score(y, preds, average="macro")),
+    }
+
+
+def update_classifier(model: Any, X, y) -> SGDClassifier:
+    """
+    Continues a linear classifier from its current coefficients with
+    INCREMENTAL_EPOCHS passes of logistic-loss SGD over the new reviews only.
+    The small constant step keeps the update close to the current model.
+    """
+    updated = SGDClassifier(
+        loss="log_loss",
+        alpha=INCREMENTAL_SGD_ALPHA,
+        learning_rate="constant",
+        eta0=INCREMENTAL_LEARNING_RATE,
+        max_iter=INCREMENTAL_EPOCHS,
+        tol=None,
+        class_weight="balanced",
+        random_state=RANDOM_STATE,
+    )
+    updated.fit(
+        X, y,
+        coef_init=np.asarray(model.coef_, dtype=np.float64),
+        intercept_init=np.asarray(model.intercept_, dtype=np.float64),
+    )
+    return updated
+
+
+def quality_holds(current: Dict[str, float], candidate: Dict[str, float]) -> bool:
+    """True if no holdout metric dropped by more than INCREMENTAL_MAX_METRIC_DROP."""
+    return all(candidate[name] >= current[name] - INCREMENTAL_MAX_METRIC_DROP for name in current)
@@ -3,32 +3,57 @@ Inference module for sentiment prediction on new text inputs.
 """
 
 import os
-from typing import Optional
+from typing import List, Optional
 from src.transformers.text_sentiment_transformer import TextSentimentTransformer
 from src.loaders.sentiment_loader import SKLearnSentimentLoader
+from src.loaders.artifact_cache import ArtifactCache, ModelArtifacts
+from src.loaders.model_registry import ModelRegistry
 from src.models import Sentiment
+from src.config import SENTIMENT_ERROR
 
 
 class SentimentPredictor:
-    """Handles sentiment prediction for individual text inputs."""
+    """
+    Handles sentiment prediction for individual text inputs.
+
+    Serves the model registry's active version unless explicit artifact
+    paths are given.
+    """
     
     def __init__(
         self, 
-        model_path: str = "data/model.pkl", 
-        vectorizer_path: str = "data/vectorizer.pkl"
+        model_path: Optional[str] = None, 
+        vectorizer_path: Optional[str] = None,
+        registry: Optional[ModelRegistry] = None
     ):
-        self.model_path = model_path
-        self.vectorizer_path = vectorizer_path
+        self._model_path = model_path
+        self._vectorizer_path = vectorizer_path
+        self.registry = registry or ModelRegistry.for_serving()
         self._transformer: Optional[TextSentimentTransformer] = None
         self._loader: Optional[SKLearnSentimentLoader] = None
+        self.artifact_cache = ArtifactCache()
+        self.artifact_cache.start_watcher()
         
     @property
     def transformer(self) -> TextSentimentTransformer:
         if self._transformer is None:
             self._transformer = TextSentimentTransformer()
-            if os.path.exists(self.vectorizer_path):
-                self._transformer.load_vectorizer(self.vectorizer_path)
         return self._transformer
+
+    @property
+    def model_path(self) -> str:
+        return self._model_path or self.registry.active_paths()[0]
+
+    @property
+    def vectorizer_path(self) -> str:
+        return self._vectorizer_path or self.registry.active_paths()[1]
+
+    @property
+    def artifacts(self) -> ModelArtifacts:
+        """Current model/vectorizer pair, hot-reloaded when retrained or a new version is activated."""
+        if self._model_path is None:
+            return self.registry.artifacts()
+        return self.artifact_cache.get_artifacts(self._model_path, self._vectorizer_path)
     
     @property
     def loader(self) -> SKLearnSentimentLoader:
@@ -36,8 +61,7 @@ class SentimentPredictor:
             self._loader = SKLearnSentimentLoader(self.model_path)
         return self._loader
 
-    def predict_single(self, text: str) -> Sentiment:
-        """Predict sentiment for a single text input."""
+    def _check_artifacts(self):
         if not os.path.exists(self.vectorizer_path):
             raise FileNotFoundError(
                 f"Vectorizer not found at {self.vectorizer_path}. "
@@ -48,6 +72,34 @@ class SentimentPredictor:
                 f"Model not found at {self.model_path}. "
                 "Please train the model first."
             )
-             
-        features = self.transformer.transform_inference(text)
-        return self.loader.predict_single(features)
+
+    def predict_single(self, text: str) -> Sentiment:
+        """Predict sentiment for a single text input."""
+        self._check_artifacts()
+        artifacts = self.artifacts
+        features = self.transformer.transform_inference(text, vectorizer=artifacts.vectorizer)
+        return self.loader.predict_single(features, model=artifacts.model)
+
+    def predict_batch(self, texts: List[str]) -> List[Sentiment]:
+        """
+        Predict sentiment for many texts with one vectorizer and one model call.
+        Rows that fail to clean are returned with an error label.
+        """
+        self._check_artifacts()
+        artifacts = self.artifacts
+
+        cleaned_texts = []
+        valid_indices = []
+        results: List[Optional[Sentiment]] = [None] * len(texts)
+        for i, text in enumerate(texts):
+            try:
+                cleaned_texts.append(self.transformer._clean_text(text))
+                valid_indices.append(i)
+            except Exception:
+                results[i] = Sentiment(label=SENTIMENT_ERROR, confidence=0.0)
+
+        if valid_indices:
+            features = self.transformer.vectorize_cleaned(cleaned_texts, vectorizer=artifacts.vectorizer)
+            for i, sentiment in zip(valid_indices, self.loader.predict_batch(features, model=artifacts.model)):
+                results[i] = sentiment
+        return results
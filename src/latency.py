@@ -0,0 +1,127 @@
+"""
+Always-on latency histograms for single-review prediction.
+
+Latencies are counted in logarithmic buckets (each bucket 2^(1/8) ~ 9% wider
+than the previous), so recording is an O(1) increment with constant memory and
+percentiles are accurate to within one bucket width. Histograms are kept per
+model version and per phase (clean, vectorize, score, total).
+"""
+
+import math
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+from src.config import LATENCY_HISTOGRAM_PATH
+from src.file_io import write_json_atomic
+
+LATENCY_PHASES = ("clean", "vectorize", "score", "total")
+
+_MIN_MS = 0.001
+_BUCKETS_PER_DOUBLING = 8
+_NUM_BUCKETS = 8 * 27  # 1 µs .. ~2.2 minutes
+_LOG_BASE = math.log(2) / _BUCKETS_PER_DOUBLING
+
+
+def _bucket_index(value_ms: float) -> int:
+    if value_ms <= _MIN_MS:
+        return 0
+    return min(int(math.log(value_ms / _MIN_MS) / _LOG_BASE) + 1, _NUM_BUCKETS - 1)
+
+
+def _bucket_upper_ms(index: int) -> float:
+    return _MIN_MS * math.exp(index * _LOG_BASE)
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of latencies in milliseconds. Not thread-safe on its own."""
+
+    def __init__(self):
+        self.counts = [0] * _NUM_BUCKETS
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        self.counts[_bucket_index(value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0 < q <= 100)."""
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * q / 100)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_upper_ms(index), self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+    def to_dict(self) -> dict:
+        """Summary plus the non-empty buckets as {upper bound ms: count}."""
+        data = self.summary()
+        data["buckets"] = {
+            f"{_bucket_upper_ms(i):.4g}": c for i, c in enumerate(self.counts) if c
+        }
+        return data
+
+
+class LatencyRecorder:
+    """Thread-safe set of histograms keyed by (model version, phase)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, model_version: str, phases_ms: Dict[str, float]):
+        """Records one request; `phases_ms` maps phase name to its latency in ms."""
+        with self._lock:
+            for phase, value_ms in phases_ms.items():
+                key = (model_version, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+                histogram.record(value_ms)
+
+    def summary(self) -> List[dict]:
+        """One row per model version and phase with count and p50/p95/p99."""
+        with self._lock:
+            rows = [
+                {"model_version": version, "phase": phase, **histogram.summary()}
+                for (version, phase), histogram in self._histograms.items()
+            ]
+        order = {phase: i for i, phase in enumerate(LATENCY_PHASES)}
+        return sorted(rows, key=lambda r: (r["model_version"], order.get(r["phase"], len(order))))
+
+    def dump(self, path: Union[str, Path] = LATENCY_HISTOGRAM_PATH) -> Path:
+        """Writes every histogram, including bucket counts, to a JSON file."""
+        with self._lock:
+            histograms: Dict[str, Dict[str, dict]] = {}
+            for (version, phase), histogram in self._histograms.items():
+                histograms.setdefault(version, {})[phase] = histogram.to_dict()
+        payload = {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "bucket_growth": 2 ** (1 / _BUCKETS_PER_DOUBLING),
+            "histograms": histograms,
+        }
+        path = Path(path)
+        write_json_atomic(path, payload)
+        return path
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
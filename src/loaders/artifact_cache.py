@@ -0,0 +1,230 @@
+"""
+Process-wide cache for persisted model artifacts.
+
+Each artifact is loaded from disk once and shared by every service and
+session in the process. A background watcher compares cheap file signatures
+(mtime + size) and swaps freshly written artifacts in atomically, so a
+retrain is picked up without a restart and without blocking predictions.
+A model and vectorizer read as a pair are only ever swapped together.
+Artifacts published through the model registry carry their registry version.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import joblib
+from src.config import ARTIFACT_POLL_INTERVAL_SECONDS
+from src.file_io import write_atomic
+
+Signature = Tuple[int, int]
+
+# Written next to registry artifacts; its "version" names the model pair
+METADATA_FILE = "metadata.json"
+
+
+@dataclass(frozen=True)
+class CachedArtifact:
+    obj: Any
+    signature: Signature
+    version: str
+
+
+@dataclass(frozen=True)
+class ModelArtifacts:
+    """A consistent model/vectorizer pair taken from the cache at one instant."""
+    model: Any
+    vectorizer: Any
+    version: str
+
+
+def _file_signature(path: str) -> Signature:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _signature_version(signature: Signature) -> str:
+    return hashlib.sha1(f"{signature[0]}:{signature[1]}".encode()).hexdigest()[:12]
+
+
+def _pair_version(model: CachedArtifact, vectorizer: CachedArtifact) -> str:
+    """Registry pairs share one version; otherwise both files' versions name the pair."""
+    if model.version == vectorizer.version:
+        return model.version
+    return hashlib.sha1(f"{model.version}:{vectorizer.version}".encode()).hexdigest()[:12]
+
+
+def _artifact_version(path: str, signature: Signature) -> str:
+    try:
+        with open(os.path.join(os.path.dirname(path), METADATA_FILE), encoding="utf-8") as f:
+            return json.load(f)["version"]
+    except (OSError, ValueError, KeyError):
+        return _signature_version(signature)
+
+
+def save_artifact(obj: Any, path: str):
+    """Dumps an artifact atomically so readers never see a half-written file."""
+    write_atomic(path, lambda tmp_path: joblib.dump(obj, tmp_path))
+
+
+class ArtifactCache:
+    _instance: Optional["ArtifactCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._entries: Dict[str, CachedArtifact] = {}
+        self._pending: Dict[str, Signature] = {}
+        # (model, vectorizer) paths read together through get_artifacts
+        self._pairs: Set[Tuple[str, str]] = set()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def _load(self, path: str) -> CachedArtifact:
+        signature = _file_signature(path)
+        obj = joblib.load(path)
+        print(f"[OK] Artifact loaded from '{path}'")
+        return CachedArtifact(obj=obj, signature=signature, version=_artifact_version(path, signature))
+
+    def _entry(self, path: str) -> CachedArtifact:
+        key = os.path.abspath(path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        with self._load_lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if not os.path.exists(key):
+                    raise FileNotFoundError(f"Artifact not found at {path}")
+                entry = self._load(key)
+                with self._lock:
+                    self._entries[key] = entry
+        return entry
+
+    def get_entry(self, path: str) -> CachedArtifact:
+        """Returns the cached artifact at `path` together with its version."""
+        return self._entry(path)
+
+    def get(self, path: str) -> Any:
+        """Returns the cached artifact at `path`, loading it on first use."""
+        return self._entry(path).obj
+
+    def get_version(self, path: str) -> str:
+        """Returns the version string of the cached artifact at `path`."""
+        return self._entry(path).version
+
+    def get_artifacts(self, model_path: str, vectorizer_path: str) -> ModelArtifacts:
+        """Returns the model and vectorizer as one consistent snapshot."""
+        model = self._entry(model_path)
+        vectorizer = self._entry(vectorizer_path)
+        pair = (os.path.abspath(model_path), os.path.abspath(vectorizer_path))
+        with self._lock:
+            self._pairs.add(pair)
+            # Prefer the pair as refresh() last swapped it in; a concurrent discard()
+            # may have dropped it, in which case the entries loaded above are served
+            current = self._entries.get(pair[0]), self._entries.get(pair[1])
+        if all(current):
+            model, vectorizer = current
+        return ModelArtifacts(model=model.obj, vectorizer=vectorizer.obj, version=_pair_version(model, vectorizer))
+
+    def refresh(self, paths: Optional[Iterable[str]] = None) -> bool:
+        """
+        Reloads artifacts whose file signature changed and then stayed stable
+        for one poll, and swaps all of them in at once. Files of a model/vectorizer
+        pair are written one after the other, so a pair is only swapped once both
+        files changed and are stable; a pair is never served half-updated.
+
+        Returns:
+            bool: True if any artifact was swapped
+        """
+        keys = [os.path.abspath(p) for p in paths] if paths is not None else list(self._entries)
+        ready = []
+        for key in keys:
+            entry = self._entries.get(key)
+            try:
+                signature = _file_signature(key)
+            except FileNotFoundError:
+                continue
+            if entry is not None and entry.signature == signature:
+                self._pending.pop(key, None)
+                continue
+            if self._pending.get(key) == signature:
+                ready.append(key)
+            else:
+                self._pending[key] = signature
+
+        with self._lock:
+            pairs = [set(pair) for pair in self._pairs]
+        # Until its partner is rewritten too, a changed pair member stays pending
+        ready = [key for key in ready if all(pair <= set(ready) for pair in pairs if key in pair)]
+        if not ready:
+            return False
+
+        loaded = {}
+        for key in ready:
+            try:
+                loaded[key] = self._load(key)
+            except Exception as e:
+                print(f"[WARN] Could not reload artifact '{key}': {e}")
+            self._pending.pop(key, None)
+        for pair in pairs:
+            if pair & loaded.keys() and not pair <= loaded.keys():
+                for key in pair:
+                    loaded.pop(key, None)
+
+        with self._lock:
+            self._entries.update(loaded)
+        return bool(loaded)
+
+    def start_watcher(self, interval: float = ARTIFACT_POLL_INTERVAL_SECONDS):
+        """Starts the background thread that polls for new artifact versions."""
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop_event.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="artifact-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float):
+        while not self._stop_event.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[WARN] Artifact watcher error: {e}")
+
+    def discard(self, paths: Iterable[str]):
+        """Drops cached artifacts that will not be used again (e.g. a replaced model version)."""
+        with self._lock:
+            keys = {os.path.abspath(path) for path in paths}
+            for key in keys:
+                self._entries.pop(key, None)
+                self._pending.pop(key, None)
+            self._pairs = {pair for pair in self._pairs if not keys & set(pair)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._pairs.clear()
@@ -0,0 +1,325 @@
+"""
+Local registry of versioned model artifacts.
+
+Every published model gets its own immutable directory under MODEL_REGISTRY_DIR:
+
+    versions/<version>/model.pkl
+    versions/<version>/vectorizer.pkl
+    versions/<version>/metadata.json   quality metrics, parameters and serving benchmark
+    ACTIVE                             name of the version being served
+    history.jsonl                      one line per activation
+    pins/<version>                     versions kept by prune, e.g. served by pinned replicas
+
+A version directory is written under a temporary name and renamed into place
+when complete, and activation replaces the ACTIVE pointer atomically, so
+readers see either the old or the new model pair, never a mix. Rolling back
+is activating an older version. Serving processes can be pinned to one
+version with SERVING_MODEL_VERSION (see ModelRegistry.for_serving); such a
+process records its version under pins/ so it is never pruned.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import joblib
+import numpy as np
+from src.config import (
+    MODEL_PATH,
+    VECTORIZER_PATH,
+    MODEL_REGISTRY_DIR,
+    MODEL_REGISTRY_KEEP_VERSIONS,
+    REGISTRY_BENCHMARK_SAMPLES,
+    SERVING_MODEL_VERSION,
+    SAMPLE_REVIEWS,
+)
+from src.file_io import write_text_atomic
+from src.loaders.artifact_cache import ArtifactCache, ModelArtifacts, METADATA_FILE
+
+MODEL_FILE = "model.pkl"
+VECTORIZER_FILE = "vectorizer.pkl"
+_ACTIVE_FILE = "ACTIVE"
+_HISTORY_FILE = "history.jsonl"
+_PINS_DIR = "pins"
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    version: str
+    path: Path
+    metadata: Dict[str, Any]
+
+    @property
+    def model_path(self) -> Path:
+        return self.path / MODEL_FILE
+
+    @property
+    def vectorizer_path(self) -> Path:
+        return self.path / VECTORIZER_FILE
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _file_digest(*paths: Path) -> str:
+    hasher = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def benchmark_artifacts(
+    model_path: Path,
+    vectorizer_path: Path,
+    cleaned_texts: Optional[Sequence[str]] = None,
+    samples: int = REGISTRY_BENCHMARK_SAMPLES
+) -> Dict[str, Any]:
+    """
+    Serving cost of a model pair: artifact sizes, cold load time and
+    single-review vectorize + score latency, as served by PredictionService.
+    Defaults to the demo reviews so versions are measured on the same input.
+    """
+    start = time.perf_counter()
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    load_seconds = time.perf_counter() - start
+
+    if cleaned_texts is None:
+        from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+        transformer = TextSentimentTransformer()
+        cleaned_texts = [transformer._clean_text(text) for text in SAMPLE_REVIEWS.values()]
+
+    latencies = []
+    for i in range(samples if cleaned_texts else 0):
+        start = time.perf_counter()
+        model.predict_proba(vectorizer.transform([cleaned_texts[i % len(cleaned_texts)]]))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "model_bytes": model_path.stat().st_size,
+        "vectorizer_bytes": vectorizer_path.stat().st_size,
+        "vocabulary_size": len(getattr(vectorizer, "vocabulary_", {})),
+        "load_seconds": load_seconds,
+        "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies else 0.0,
+        "latency_p99_ms": float(np.percentile(latencies, 99)) if latencies else 0.0,
+        "latency_samples": len(latencies),
+    }
+
+
+class ModelRegistry:
+    """Immutable model versions with an atomically switched active pointer."""
+
+    def __init__(
+        self,
+        root: Union[str, Path] = MODEL_REGISTRY_DIR,
+        keep_versions: int = MODEL_REGISTRY_KEEP_VERSIONS,
+        pinned_version: Optional[str] = None
+    ):
+        self.root = Path(root)
+        self.versions_dir = self.root / "versions"
+        self.keep_versions = keep_versions
+        self.pinned_version = pinned_version
+        self._active: Optional[ModelVersion] = None
+        self._active_signature: Optional[Tuple[int, int]] = None
+        self._pin_missing_warned = False
+
+    @classmethod
+    def for_serving(cls) -> "ModelRegistry":
+        """The registry as seen by serving code: pinned to SERVING_MODEL_VERSION if set."""
+        return cls(pinned_version=SERVING_MODEL_VERSION or None)
+
+    def _pointer_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = (self.root / _ACTIVE_FILE).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino
+
+    def get(self, version: str) -> ModelVersion:
+        path = self.versions_dir / version
+        if not (path / METADATA_FILE).exists():
+            raise KeyError(f"Model version '{version}' not found in {self.versions_dir}")
+        metadata = json.loads((path / METADATA_FILE).read_text())
+        return ModelVersion(version=version, path=path, metadata=metadata)
+
+    def active(self) -> Optional[ModelVersion]:
+        """
+        The version being served, or None if nothing was published yet or the
+        pinned version does not exist.
+        """
+        if self.pinned_version:
+            if self._active is None:
+                try:
+                    self._active = self.get(self.pinned_version)
+                except KeyError as e:
+                    if not self._pin_missing_warned:
+                        print(f"[WARN] {e.args[0]}; check SERVING_MODEL_VERSION")
+                        self._pin_missing_warned = True
+                    return None
+                try:
+                    self.pin(self.pinned_version)
+                except OSError as e:
+                    print(f"[WARN] Could not pin version '{self.pinned_version}': {e}")
+            return self._active
+        signature = self._pointer_signature()
+        if signature is None:
+            return None
+        if signature != self._active_signature:
+            version = (self.root / _ACTIVE_FILE).read_text().strip()
+            previous = self._active
+            self._active = self.get(version)
+            self._active_signature = signature
+            if previous is not None and previous.version != version:
+                # Versions are immutable, so the old pair can simply be dropped
+                ArtifactCache().discard([str(previous.model_path), str(previous.vectorizer_path)])
+        return self._active
+
+    def active_paths(self) -> Tuple[str, str]:
+        """
+        Model and vectorizer paths of the active version. Falls back to the
+        legacy MODEL_PATH/VECTORIZER_PATH pair while the registry is empty, but
+        never in place of a missing pinned version.
+        """
+        active = self.active()
+        if active is not None:
+            return str(active.model_path), str(active.vectorizer_path)
+        if self.pinned_version:
+            missing = self.versions_dir / self.pinned_version
+            return str(missing / MODEL_FILE), str(missing / VECTORIZER_FILE)
+        return str(MODEL_PATH), str(VECTORIZER_PATH)
+
+    def is_available(self) -> bool:
+        return all(os.path.exists(path) for path in self.active_paths())
+
+    def artifacts(self) -> ModelArtifacts:
+        """The active model/vectorizer pair, loaded once per process."""
+        return ArtifactCache().get_artifacts(*self.active_paths())
+
+    def list_versions(self) -> List[ModelVersion]:
+        """All versions, newest first."""
+        if not self.versions_dir.exists():
+            return []
+        versions = [self.get(p.name) for p in self.versions_dir.iterdir() if (p / METADATA_FILE).exists()]
+        return sorted(versions, key=lambda v: v.metadata.get("created_at", ""), reverse=True)
+
+    def history(self) -> List[Dict[str, Any]]:
+        """Activations, oldest first."""
+        path = self.root / _HISTORY_FILE
+        if not path.exists():
+            return []
+        return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+    def previous_version(self) -> Optional[str]:
+        """The version that was active before the current one, if it still exists."""
+        active = self.active()
+        for entry in reversed(self.history()):
+            version = entry["version"]
+            if active is not None and version == active.version:
+                continue
+            if (self.versions_dir / version / METADATA_FILE).exists():
+                return version
+        return None
+
+    def publish(
+        self,
+        model: Any,
+        vectorizer: Any,
+        metadata: Optional[Dict[str, Any]] = None,
+        activate: bool = True,
+        benchmark_texts: Optional[Sequence[str]] = None
+    ) -> ModelVersion:
+        """
+        Stores a model/vectorizer pair as a new immutable version, benchmarks
+        it and (by default) makes it the active version. Publishing an identical
+        pair again within the same second returns the existing version.
+
+        Parameters:
+            metadata: Training details and quality metrics to keep with the version
+            activate: Switch serving to the new version once it is stored
+            benchmark_texts: Cleaned texts to measure latency on
+        """
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        active = self.active()
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.versions_dir, prefix=".publish-"))
+        try:
+            joblib.dump(model, tmp_dir / MODEL_FILE)
+            joblib.dump(vectorizer, tmp_dir / VECTORIZER_FILE)
+            created = datetime.now(timezone.utc)
+            digest = _file_digest(tmp_dir / MODEL_FILE, tmp_dir / VECTORIZER_FILE)
+            version = f"{created:%Y%m%dT%H%M%SZ}-{digest[:8]}"
+            record = {
+                "version": version,
+                "created_at": created.isoformat(timespec="seconds"),
+                "parent": active.version if active is not None else None,
+                "sha1": digest,
+                **(metadata or {}),
+                "benchmark": benchmark_artifacts(tmp_dir / MODEL_FILE, tmp_dir / VECTORIZER_FILE, benchmark_texts),
+            }
+            (tmp_dir / METADATA_FILE).write_text(json.dumps(record, indent=2))
+            for name in (MODEL_FILE, VECTORIZER_FILE, METADATA_FILE):
+                os.chmod(tmp_dir / name, 0o444)
+            os.chmod(tmp_dir, 0o755)
+            try:
+                os.rename(tmp_dir, self.versions_dir / version)
+            except OSError:
+                # Same second and digest: this exact pair is already published
+                if not (self.versions_dir / version / METADATA_FILE).exists():
+                    raise
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if activate:
+            self.activate(version)
+        self.prune()
+        return self.get(version)
+
+    def activate(self, version: str) -> ModelVersion:
+        """Points serving at `version`; running services switch on their next request."""
+        target = self.get(version)
+        write_text_atomic(self.root / _ACTIVE_FILE, version + "\n")
+        with open(self.root / _HISTORY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"version": version, "activated_at": _now()}) + "\n")
+        return target
+
+    def pinned_versions(self) -> List[str]:
+        """Versions that prune keeps regardless of age."""
+        pins_dir = self.root / _PINS_DIR
+        pinned = {p.name for p in pins_dir.iterdir()} if pins_dir.exists() else set()
+        if SERVING_MODEL_VERSION:
+            pinned.add(SERVING_MODEL_VERSION)
+        return sorted(pinned)
+
+    def pin(self, version: str):
+        """Keeps `version` through pruning until it is unpinned."""
+        self.get(version)
+        pins_dir = self.root / _PINS_DIR
+        pins_dir.mkdir(parents=True, exist_ok=True)
+        (pins_dir / version).touch()
+
+    def unpin(self, version: str):
+        (self.root / _PINS_DIR / version).unlink(missing_ok=True)
+
+    def prune(self, keep: Optional[int] = None):
+        """
+        Deletes all but the `keep` newest versions; the active version and
+        pinned versions are always kept.
+        """
+        keep = self.keep_versions if keep is None else keep
+        active = self.active()
+        protected = set(self.pinned_versions())
+        if active is not None:
+            protected.add(active.version)
+        for stale in self.list_versions()[keep:]:
+            if stale.version in protected:
+                continue
+            shutil.rmtree(stale.path, ignore_errors=True)
@@ -1,86 +1,118 @@
-from abc import ABC
-from typing import Any, List
-import pandas as pd
-import joblib
+from typing import Any, List, Optional
+import numpy as np
 from src.models import Sentiment
+from src.metrics import timed
 from src.loaders.base import ModelLoader
+from src.loaders.artifact_cache import ArtifactCache, CachedArtifact
 from sklearn.base import BaseEstimator
 
 
+def downcast_model(model: BaseEstimator, dtype: str = "float32") -> BaseEstimator:
+    """
+    Casts a fitted linear model's coefficients to `dtype` in place.
+    Models without `coef_` are returned unchanged.
+    """
+    target = np.dtype(dtype)
+    for attr in ("coef_", "intercept_"):
+        value = getattr(model, attr, None)
+        if isinstance(value, np.ndarray) and value.dtype != target:
+            setattr(model, attr, value.astype(target))
+    return model
+
+
+def _match_model_dtype(features: Any, model: BaseEstimator) -> Any:
+    """Casts features to the model's coefficient dtype so neither side is upcast."""
+    coef = getattr(model, "coef_", None)
+    feature_dtype = getattr(features, "dtype", None)
+    if coef is None or feature_dtype is None or feature_dtype == coef.dtype:
+        return features
+    return features.astype(coef.dtype)
+
+
 class SKLearnSentimentLoader(ModelLoader):
     """
     Loader for a pre-trained scikit-learn sentiment model.
-    Returns predictions as List[Sentiment] on a random 100 samples.
+    Returns one Sentiment per input row.
     """
 
     def __init__(self, model_path: str):
         self.model_path = model_path
-        self.model: BaseEstimator = None
+        self._pinned: Optional[CachedArtifact] = None
+
+    @property
+    def model(self) -> BaseEstimator:
+        """
+        The pinned model after `load()`, otherwise the current model in the
+        process-wide artifact cache (which follows hot reloads).
+        """
+        if self._pinned is not None:
+            return self._pinned.obj
+        return ArtifactCache().get(self.model_path)
+
+    @property
+    def model_version(self) -> str:
+        if self._pinned is not None:
+            return self._pinned.version
+        return ArtifactCache().get_version(self.model_path)
 
     def load(self):
-        """Load the pre-trained model."""
-        self.model = joblib.load(self.model_path)
-        print(f"[OK] Model loaded from '{self.model_path}'")
+        """
+        Load the pre-trained model and pin this loader to that version, so a
+        long run keeps scoring with the model that matches its vectorizer.
+        """
+        self._pinned = ArtifactCache().get_entry(self.model_path)
+        return self._pinned.obj
 
     def predict(self, data: Any) -> List[Sentiment]:
         """
-        Predict sentiment for a random 100 rows and return List[Sentiment].
+        Predict sentiment for every row and return List[Sentiment].
         Uses 0.5 threshold to classify positive/negative.
 
         Parameters:
             data: Transformed data (TF-IDF matrix or DataFrame)
 
         Returns:
-            List[Sentiment]: Predictions with label and confidence
+            List[Sentiment]: Predictions with label and confidence, in row order
+        """
+        if data.shape[0] == 0:
+            return []
+        return self.predict_batch(data)
+
+    def predict_single(self, features: Any, model: Optional[BaseEstimator] = None) -> Sentiment:
+        """
+        Predicts sentiment for a single sample.
+
+        Parameters:
+            features: Transformed features for one sample
+            model: Model snapshot to use instead of the cached one, so callers
+                can pair it with the vectorizer that produced `features`
+        """
+        return self.predict_batch(features[:1], model=model)[0]
+
+    def predict_batch(self, features: Any, model: Optional[BaseEstimator] = None) -> List[Sentiment]:
+        """
+        Predicts sentiment for every row of `features` with one model call.
+
+        Parameters:
+            features: Transformed feature matrix, one row per sample
+            model: Model snapshot to use instead of the cached one
+
+        Returns:
+            List[Sentiment]: One prediction per row, in input order
         """
-        self.load()
-        if self.model is None:
-            raise ValueError("Model not loaded. Call `load()` first.")
-
-        # Convert sparse matrix to DataFrame for sampling
-        if not isinstance(data, pd.DataFrame):
-            df = pd.DataFrame(data.toarray())
-        else:
-            df = data
-
-        # Randomly sample 100 rows
-        sample_df = df.sample(n=100, random_state=42)
-
-        # Predict probabilities or raw outputs
-        if hasattr(self.model, "predict_proba"):
-            probs = self.model.predict_proba(sample_df)[:, 1]  # Probability of positive class
-        else:
-            # If the model predicts a float between 0 and 1
-            probs = self.model.predict(sample_df)
-
-        results: List[Sentiment] = []
-        for p in probs:
-            if p >= 0.5:
-                label = "positive"
-                confidence = float(p)
+        if model is None:
+            model = self.model
+        with timed("predict", items=features.shape[0]):
+            features = _match_model_dtype(features, model)
+
+            if hasattr(model, "predict_proba"):
+                probs = model.predict_proba(features)[:, 1]
             else:
-                label = "negative"
-                confidence = float(1 - p)
-
-            results.append(Sentiment(label=label, confidence=confidence))
-
-        return results
-
-    def predict_single(self, features: Any) -> Sentiment:
-        """Predicts sentiment for a single sample."""
-        if self.model is None:
-            self.load()
-        
-        if hasattr(self.model, "predict_proba"):
-            prob = self.model.predict_proba(features)[0, 1]
-        else:
-            prob = self.model.predict(features)[0]
-            
-        if prob >= 0.5:
-            label = "positive"
-            confidence = float(prob)
-        else:
-            label = "negative"
-            confidence = float(1 - prob)
-            
-        return Sentiment(label=label, confidence=confidence)
+                probs = np.asarray(model.predict(features), dtype=float)
+
+            positive = probs >= 0.5
+            confidences = np.where(positive, probs, 1 - probs)
+            return [
+                Sentiment(label="positive" if is_pos else "negative", confidence=float(conf))
+                for is_pos, conf in zip(positive.tolist(), confidences.tolist())
+            ]
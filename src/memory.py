@@ -0,0 +1,231 @@
+"""
+Memory budget accounting for training and batch jobs.
+
+Resident set size (RSS) is read from /proc and sampled in the background while
+a stage runs, so each stage gets a before/after/peak record without the
+slowdown tracemalloc adds to allocation-heavy text cleaning. A budget (by
+default a fraction of the container's memory limit) is used to shrink batch
+sizes up front and to stop a job with a clear report once it is exceeded,
+before the kernel's OOM killer does.
+"""
+
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence
+from src.config import (
+    MEMORY_BUDGET_MB,
+    MEMORY_BUDGET_FRACTION,
+    MEMORY_BATCH_HEADROOM_FRACTION,
+    MEMORY_MIN_BATCH_SIZE,
+    MEMORY_SAMPLE_INTERVAL_SECONDS,
+    MEMORY_TEXT_EXPANSION,
+)
+
+_MB = 1024 ** 2
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> int:
+    """Current resident set size of this process (0 if it cannot be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is the peak, in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def memory_limit_bytes() -> Optional[int]:
+    """The cgroup (container) memory limit, or physical memory if there is none."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        limit = _read_int(path)
+        # cgroup v1 reports "no limit" as a huge number
+        if limit is not None and limit < 1 << 60:
+            return limit
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def default_budget_bytes() -> Optional[int]:
+    if MEMORY_BUDGET_MB > 0:
+        return MEMORY_BUDGET_MB * _MB
+    limit = memory_limit_bytes()
+    return int(limit * MEMORY_BUDGET_FRACTION) if limit else None
+
+
+def estimate_text_bytes(texts: Sequence[str], sample_size: int = 1000) -> int:
+    """
+    Rough per-text working-set estimate: the raw string times an expansion
+    factor covering the cleaned copy, feature row and result objects.
+    """
+    if not texts:
+        return 0
+    step = max(1, len(texts) // sample_size)
+    sample = texts[::step]
+    average = sum(sys.getsizeof(t) for t in sample) / len(sample)
+    return int(average * MEMORY_TEXT_EXPANSION)
+
+
+@dataclass
+class StageMemory:
+    stage: str
+    rss_before: int = 0
+    rss_after: int = 0
+    rss_peak: int = 0
+    running: bool = True
+
+    def to_dict(self) -> dict:
+        # A stage that is still running (e.g. when a check fails inside it) reports current RSS
+        after = current_rss_bytes() if self.running else self.rss_after
+        return {
+            "stage": self.stage,
+            "running": self.running,
+            "rss_before_mb": self.rss_before / _MB,
+            "rss_after_mb": after / _MB,
+            "rss_peak_mb": max(self.rss_peak, after) / _MB,
+            "delta_mb": (after - self.rss_before) / _MB,
+        }
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised when a job goes, or would go, over its memory budget."""
+
+    def __init__(self, message: str, report: str):
+        super().__init__(f"{message}\n{report}")
+        self.report = report
+
+
+class MemoryBudget:
+    """
+    Per-stage RSS accounting against a budget in bytes.
+    With no budget (limit unknown) stages are still tracked but never fail.
+    """
+
+    def __init__(self, limit_bytes: Optional[int] = None):
+        self.limit_bytes = limit_bytes if limit_bytes is not None else default_budget_bytes()
+        self.stages: List[StageMemory] = []
+        self.adjustments: List[str] = []
+
+    @property
+    def limit_mb(self) -> Optional[float]:
+        return self.limit_bytes / _MB if self.limit_bytes else None
+
+    def headroom_bytes(self) -> Optional[int]:
+        if not self.limit_bytes:
+            return None
+        return self.limit_bytes - current_rss_bytes()
+
+    @contextmanager
+    def track(self, stage: str) -> Iterator[StageMemory]:
+        """Records RSS before, after and (sampled) peak while the block runs."""
+        record = StageMemory(stage=stage, rss_before=current_rss_bytes())
+        record.rss_peak = record.rss_before
+        self.stages.append(record)
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(MEMORY_SAMPLE_INTERVAL_SECONDS):
+                record.rss_peak = max(record.rss_peak, current_rss_bytes())
+
+        sampler = threading.Thread(target=sample, name=f"memory-{stage}", daemon=True)
+        sampler.start()
+        try:
+            yield record
+        finally:
+            stop.set()
+            sampler.join()
+            record.rss_after = current_rss_bytes()
+            record.rss_peak = max(record.rss_peak, record.rss_after)
+            record.running = False
+
+    def check(self, stage: str):
+        """Fails fast with a report if RSS is over budget."""
+        if not self.limit_bytes:
+            return
+        rss = current_rss_bytes()
+        if rss > self.limit_bytes:
+            raise MemoryBudgetExceeded(
+                f"Memory budget exceeded during '{stage}': "
+                f"RSS {rss / _MB:,.0f} MB > budget {self.limit_bytes / _MB:,.0f} MB",
+                self.format_report(),
+            )
+
+    def require(self, bytes_needed: int, stage: str):
+        """Fails fast if `bytes_needed` does not fit in the remaining budget."""
+        headroom = self.headroom_bytes()
+        if headroom is not None and bytes_needed > headroom:
+            raise MemoryBudgetExceeded(
+                f"Not enough memory for '{stage}': ~{bytes_needed / _MB:,.0f} MB needed, "
+                f"{max(headroom, 0) / _MB:,.0f} MB left in the {self.limit_bytes / _MB:,.0f} MB budget",
+                self.format_report(),
+            )
+
+    def fit_batch_size(self, requested: int, bytes_per_item: int, stage: str) -> int:
+        """
+        Largest batch size up to `requested` whose estimated working set fits in
+        a fraction of the remaining budget. Fails fast if not even the minimum
+        batch fits.
+        """
+        headroom = self.headroom_bytes()
+        if headroom is None or bytes_per_item <= 0:
+            return requested
+        allowed = int(max(headroom, 0) * MEMORY_BATCH_HEADROOM_FRACTION / bytes_per_item)
+        minimum = min(requested, MEMORY_MIN_BATCH_SIZE)
+        if allowed < minimum:
+            raise MemoryBudgetExceeded(
+                f"Not enough memory for '{stage}': {max(headroom, 0) / _MB:,.0f} MB left in the "
+                f"{self.limit_bytes / _MB:,.0f} MB budget, ~{bytes_per_item * minimum / _MB:,.1f} MB "
+                f"needed for {minimum:,} items",
+                self.format_report(),
+            )
+        if allowed < requested:
+            note = f"{stage}: batch size reduced from {requested:,} to {allowed:,} to fit the memory budget"
+            self.adjustments.append(note)
+            print(f"[WARN] {note}")
+            return allowed
+        return requested
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "budget_mb": self.limit_mb,
+            "rss_mb": current_rss_bytes() / _MB,
+            "stages": [stage.to_dict() for stage in self.stages],
+            "adjustments": list(self.adjustments),
+        }
+
+    def format_report(self) -> str:
+        budget = f"{self.limit_mb:,.0f} MB" if self.limit_mb else "unlimited"
+        lines = [f"Memory report (budget {budget}, current RSS {current_rss_bytes() / _MB:,.0f} MB):"]
+        for stage in self.stages:
+            s = stage.to_dict()
+            lines.append(
+                f"  {s['stage']:<12} before {s['rss_before_mb']:>8,.1f} MB  after {s['rss_after_mb']:>8,.1f} MB"
+                f"  peak {s['rss_peak_mb']:>8,.1f} MB  delta {s['delta_mb']:>+8,.1f} MB"
+                + ("  (running)" if s["running"] else "")
+            )
+        lines.extend(f"  note: {note}" for note in self.adjustments)
+        return "\n".join(lines)
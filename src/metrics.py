@@ -0,0 +1,186 @@
+"""
+Lightweight per-stage timing instrumentation.
+
+Code marks its work with `timed("clean", items=n)`. The timings go to whichever
+`MetricsRecorder` is active in the current thread (see `recording`), so library
+code can be instrumented once and each caller (pipeline, training, services)
+decides where the numbers end up. With no active recorder `timed` is a no-op.
+
+Snapshots are persisted to one JSON file per component, read by the Pipeline
+Status page.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+from src.config import METRICS_DIR, METRICS_FLUSH_INTERVAL_SECONDS
+from src.file_io import write_json_atomic
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    items: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.wall_seconds if self.wall_seconds else 0.0
+
+    def to_dict(self) -> dict:
+        stats = asdict(self)
+        stats["items_per_second"] = self.items_per_second
+        stats["avg_call_ms"] = self.wall_seconds * 1000 / self.calls if self.calls else 0.0
+        return stats
+
+
+class _Timing:
+    """Handle yielded by `timed`; set `items` once the count is known."""
+    __slots__ = ("items",)
+
+    def __init__(self, items: int):
+        self.items = items
+
+
+class JsonMetricsSink:
+    """
+    Keeps the latest snapshot of each component in `<directory>/<component>.json`.
+    Training, the scripts, the server and the dashboard run as separate
+    processes; with a file each they never overwrite one another's snapshots.
+    """
+
+    def __init__(self, directory: Union[str, Path] = METRICS_DIR):
+        self.directory = Path(directory)
+
+    def read(self) -> Dict[str, dict]:
+        snapshots = {}
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            snapshots[snapshot.get("component", path.stem)] = snapshot
+        return snapshots
+
+    def write(self, snapshot: dict):
+        write_json_atomic(self.directory / f"{snapshot['component']}.json", snapshot)
+
+
+class MetricsRecorder:
+    """Thread-safe accumulator of wall time, CPU time and item counts per stage."""
+
+    def __init__(
+        self,
+        component: str,
+        sink: Optional[JsonMetricsSink] = None,
+        flush_interval: float = METRICS_FLUSH_INTERVAL_SECONDS
+    ):
+        self.component = component
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+        self._started = time.perf_counter()
+        self._last_flush = 0.0
+
+    def record(self, stage: str, wall_seconds: float, cpu_seconds: float, items: int = 0, calls: int = 1):
+        with self._lock:
+            stats = self._stages.setdefault(stage, StageStats())
+            stats.calls += calls
+            stats.items += items
+            stats.wall_seconds += wall_seconds
+            stats.cpu_seconds += cpu_seconds
+
+    @contextmanager
+    def timed(self, stage: str, items: int = 0) -> Iterator[_Timing]:
+        """Times the block; CPU time is that of the calling thread."""
+        timing = _Timing(items)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield timing
+        finally:
+            self.record(stage, time.perf_counter() - wall, time.thread_time() - cpu, timing.items)
+
+    def merge(self, stages: Dict[str, dict]):
+        """Adds stage totals recorded elsewhere, e.g. in a worker process."""
+        for stage, stats in stages.items():
+            self.record(stage, stats["wall_seconds"], stats["cpu_seconds"], stats["items"], stats["calls"])
+
+    def stage_totals(self) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: asdict(stats) for stage, stats in self._stages.items()}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {stage: stats.to_dict() for stage, stats in self._stages.items()}
+        return {
+            "component": self.component,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "elapsed_seconds": time.perf_counter() - self._started,
+            "stages": stages,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._started = time.perf_counter()
+
+    def flush(self, force: bool = False):
+        """Writes a snapshot to the sink, at most once per `flush_interval` unless forced."""
+        if self.sink is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        try:
+            self.sink.write(self.snapshot())
+        except OSError as e:
+            print(f"[WARN] Could not write metrics: {e}")
+
+    def report(self):
+        snapshot = self.snapshot()
+        print(f"\n      Stage timings ({self.component}, {snapshot['elapsed_seconds']:.2f}s elapsed):")
+        print(f"      {'stage':<12}{'calls':>8}{'items':>10}{'wall s':>10}{'cpu s':>10}{'items/s':>12}")
+        for stage, stats in snapshot["stages"].items():
+            print(
+                f"      {stage:<12}{stats['calls']:>8,}{stats['items']:>10,}"
+                f"{stats['wall_seconds']:>10.3f}{stats['cpu_seconds']:>10.3f}{stats['items_per_second']:>12,.0f}"
+            )
+
+
+_current: ContextVar[Optional[MetricsRecorder]] = ContextVar("metrics_recorder", default=None)
+
+
+@contextmanager
+def recording(recorder: MetricsRecorder) -> Iterator[MetricsRecorder]:
+    """Makes `recorder` receive every `timed` block run by this thread inside the block."""
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+def current_recorder() -> Optional[MetricsRecorder]:
+    """The recorder `timed` blocks in this thread currently report to, if any."""
+    return _current.get()
+
+
+@contextmanager
+def timed(stage: str, items: int = 0) -> Iterator[_Timing]:
+    """Times the block into the active recorder, if any."""
+    recorder = _current.get()
+    if recorder is None:
+        yield _Timing(items)
+        return
+    with recorder.timed(stage, items) as timing:
+        yield timing
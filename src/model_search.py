@@ -0,0 +1,150 @@
+"""
+Hyperparameter search over TF-IDF and logistic regression settings.
+
+Reviews are cleaned once and the cleaned texts are shared by every candidate;
+candidates are fitted in parallel worker processes. Each candidate is scored
+on accuracy, training time, single-review inference latency and artifact
+size, so a configuration can be picked that fits the latency budget.
+"""
+
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+from src.config import (
+    SEARCH_SPACE,
+    SEARCH_RANDOM_CANDIDATES,
+    SEARCH_LATENCY_SAMPLES,
+    SEARCH_REPORT_PATH,
+    LOGISTIC_REGRESSION_MAX_ITER,
+    LATENCY_SLO_P99_MS,
+    RANDOM_STATE,
+)
+from src.file_io import write_json_atomic
+from src.loaders.sentiment_loader import downcast_model
+
+
+def candidate_params(
+    mode: str = "grid",
+    n_candidates: int = SEARCH_RANDOM_CANDIDATES,
+    space: Optional[Dict[str, list]] = None,
+    seed: int = RANDOM_STATE
+) -> List[Dict[str, Any]]:
+    """Every combination of `space` ("grid") or `n_candidates` sampled from it ("random")."""
+    space = space or SEARCH_SPACE
+    if mode == "grid":
+        return list(ParameterGrid(space))
+    if mode == "random":
+        total = len(ParameterGrid(space))
+        return list(ParameterSampler(space, n_iter=min(n_candidates, total), random_state=seed))
+    raise ValueError(f"Unknown search mode '{mode}'. Expected 'grid' or 'random'.")
+
+
+def evaluate_candidate(
+    params: Dict[str, Any],
+    train_texts: Sequence[str],
+    y_train: np.ndarray,
+    test_texts: Sequence[str],
+    y_test: np.ndarray,
+    dtype: str = "float32",
+    latency_samples: int = SEARCH_LATENCY_SAMPLES
+) -> Dict[str, Any]:
+    """Fits one candidate on pre-cleaned texts and measures quality and cost."""
+    vectorizer = TfidfVectorizer(
+        max_features=params["max_features"],
+        ngram_range=tuple(params["ngram_range"]),
+        min_df=params["min_df"],
+        dtype=np.dtype(dtype),
+    )
+    model = LogisticRegression(
+        C=params["C"], max_iter=LOGISTIC_REGRESSION_MAX_ITER, random_state=RANDOM_STATE
+    )
+
+    start = time.perf_counter()
+    X_train = vectorizer.fit_transform(train_texts)
+    model.fit(X_train, y_train)
+    downcast_model(model, dtype)
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preds = model.predict(vectorizer.transform(test_texts))
+    batch_seconds = time.perf_counter() - start
+
+    # Single-review latency, as served by PredictionService.predict_single
+    latencies = []
+    for text in list(test_texts)[:latency_samples]:
+        start = time.perf_counter()
+        model.predict_proba(vectorizer.transform([text]))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "params": {**params, "ngram_range": list(params["ngram_range"])},
+        "accuracy": float(accuracy_score(y_test, preds)),
+        "f1": float(f1_score(y_test, preds)),
+        "train_seconds": train_seconds,
+        "batch_items_per_second": len(test_texts) / batch_seconds if batch_seconds else 0.0,
+        "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies else 0.0,
+        "latency_p99_ms": float(np.percentile(latencies, 99)) if latencies else 0.0,
+        "vocabulary_size": len(vectorizer.vocabulary_),
+        "artifact_bytes": len(pickle.dumps(vectorizer)) + len(pickle.dumps(model)),
+    }
+
+
+def run_search(
+    candidates: List[Dict[str, Any]],
+    train_texts: Sequence[str],
+    y_train: np.ndarray,
+    test_texts: Sequence[str],
+    y_test: np.ndarray,
+    n_jobs: int = -1,
+    dtype: str = "float32"
+) -> List[Dict[str, Any]]:
+    """Evaluates all candidates in parallel; results are sorted by accuracy."""
+    results = Parallel(n_jobs=n_jobs, verbose=0)(
+        delayed(evaluate_candidate)(params, train_texts, y_train, test_texts, y_test, dtype)
+        for params in candidates
+    )
+    return sorted(results, key=lambda r: r["accuracy"], reverse=True)
+
+
+def best_within_budget(
+    results: List[Dict[str, Any]],
+    latency_budget_ms: float = LATENCY_SLO_P99_MS
+) -> Optional[Dict[str, Any]]:
+    """Most accurate candidate whose p99 single-review latency fits the budget."""
+    eligible = [r for r in results if r["latency_p99_ms"] <= latency_budget_ms]
+    return max(eligible, key=lambda r: r["accuracy"]) if eligible else None
+
+
+def format_report(results: List[Dict[str, Any]], latency_budget_ms: float = LATENCY_SLO_P99_MS) -> str:
+    lines = [
+        f"{'max_feat':>9}{'ngram':>7}{'min_df':>7}{'C':>6}{'acc':>8}{'f1':>8}"
+        f"{'train s':>9}{'p50 ms':>8}{'p99 ms':>8}{'size KB':>9}  budget"
+    ]
+    for r in results:
+        p = r["params"]
+        ngram = f"{p['ngram_range'][0]}-{p['ngram_range'][1]}"
+        fits = "ok" if r["latency_p99_ms"] <= latency_budget_ms else "OVER"
+        lines.append(
+            f"{p['max_features']:>9,}{ngram:>7}{p['min_df']:>7}{p['C']:>6g}{r['accuracy']:>8.4f}{r['f1']:>8.4f}"
+            f"{r['train_seconds']:>9.2f}{r['latency_p50_ms']:>8.3f}{r['latency_p99_ms']:>8.3f}"
+            f"{r['artifact_bytes'] / 1024:>9,.0f}  {fits}"
+        )
+    return "\n".join(lines)
+
+
+def save_report(
+    results: List[Dict[str, Any]],
+    metadata: Dict[str, Any],
+    path: Union[str, Path] = SEARCH_REPORT_PATH
+) -> Path:
+    """Writes the search results and run metadata to a JSON file."""
+    path = Path(path)
+    write_json_atomic(path, {**metadata, "results": results})
+    return path
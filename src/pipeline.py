@@ -1,19 +1,314 @@
-from typing import List
+"""
+Staged inference pipeline.
+
+Batches flow fetch -> transform -> predict -> write through bounded queues.
+Each stage is served by its own pool of workers, so the CPU-heavy cleaning
+and vectorizing can use several cores (in worker processes) while the I/O
+stages keep the queues full. The first error raised by any stage stops every
+stage and is re-raised to the caller. Per-stage timings of each run are kept
+in `Pipeline.metrics` and written to the metrics file.
+"""
+
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from src.config import (
+    PIPELINE_BATCH_SIZE,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_TRANSFORM_WORKERS,
+    PIPELINE_PREDICT_WORKERS,
+    PIPELINE_SINK_WORKERS,
+    PIPELINE_USE_PROCESSES,
+    SENTIMENT_POSITIVE,
+)
 from src.fetchers.base import DataFetcher
 from src.transformers.base import DataTransformer
 from src.loaders.base import ModelLoader
+from src.sinks.base import PredictionSink
 from src.models import Review, Sentiment
+from src.metrics import JsonMetricsSink, MetricsRecorder, recording, timed
+
+_POLL_SECONDS = 0.1
+_END = object()
+
+# Transformer installed once per worker process by the process-pool initializer
+_worker_transformer: Optional[DataTransformer] = None
+
+
+def _init_transform_worker(transformer: DataTransformer):
+    global _worker_transformer
+    _worker_transformer = transformer
+
+
+def _transform_in_worker(reviews: List[Review]) -> Tuple[Any, Dict[str, dict]]:
+    """Returns the features and the stage timings recorded in this process."""
+    recorder = MetricsRecorder("transform-worker")
+    with recording(recorder):
+        features = _worker_transformer.transform(reviews)
+    return features, recorder.stage_totals()
+
+
+@dataclass
+class _Batch:
+    reviews: List[Review]
+    features: Any = None
+    predictions: Optional[List[Sentiment]] = None
+    written: int = 0
+
+
+class _RunState:
+    """Stop flag and first error shared by every stage of one run."""
+
+    def __init__(self, metrics: MetricsRecorder):
+        self.metrics = metrics
+        self.stop = threading.Event()
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def fail(self, stage: str, error: BaseException):
+        with self._lock:
+            if self.error is None and not self.stop.is_set():
+                self.error = error
+                print(f"[ERROR] Pipeline stage '{stage}' failed: {error}")
+        self.stop.set()
+
+    def put(self, q: queue.Queue, item: Any) -> bool:
+        """Blocks until `item` is queued; returns False if the run was stopped."""
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self, q: queue.Queue) -> Any:
+        """Blocks until an item is available; returns _END if the run was stopped."""
+        while not self.stop.is_set():
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _END
+
+
+class _Stage:
+    """
+    A pool of threads applying `fn` to every batch from `inbox` and passing the
+    result to `outbox`. When the last worker sees end-of-stream it forwards one
+    end marker per downstream consumer.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[_Batch], _Batch],
+        workers: int,
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        consumers: int,
+        state: _RunState
+    ):
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.consumers = consumers
+        self.state = state
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._work, name=f"pipeline-{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def _work(self):
+        try:
+            with recording(self.state.metrics):
+                while True:
+                    item = self.state.get(self.inbox)
+                    if item is _END:
+                        break
+                    if not self.state.put(self.outbox, self.fn(item)):
+                        return
+        except BaseException as e:
+            self.state.fail(self.name, e)
+            return
+
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            for _ in range(self.consumers):
+                self.state.put(self.outbox, _END)
+
 
 class Pipeline:
-    def __init__(self, fetcher: DataFetcher, transformer: DataTransformer, loader: ModelLoader):
+    """
+    Inference pipeline: streams reviews from the fetcher in batches, vectorizes
+    them with the persisted (already fitted) transformer, scores every review
+    and optionally hands the predictions to a sink.
+
+    The fetcher is a single ordered producer; transform, predict and write each
+    run `*_workers` workers. With `use_processes`, transform workers run in a
+    process pool so cleaning is not serialized by the GIL; the transformer is
+    sent to each process once. At most `queue_size` batches wait between two
+    stages, which bounds memory regardless of the collection size. Batches are
+    yielded in completion order, which may differ from fetch order when more
+    than one worker is used.
+    """
+
+    def __init__(
+        self,
+        fetcher: DataFetcher,
+        transformer: DataTransformer,
+        loader: ModelLoader,
+        sink: Optional[PredictionSink] = None,
+        batch_size: int = PIPELINE_BATCH_SIZE,
+        limit: Optional[int] = None,
+        transform_workers: int = PIPELINE_TRANSFORM_WORKERS,
+        predict_workers: int = PIPELINE_PREDICT_WORKERS,
+        sink_workers: int = PIPELINE_SINK_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        use_processes: bool = PIPELINE_USE_PROCESSES
+    ):
         self.fetcher = fetcher
         self.transformer = transformer
         self.loader = loader
+        self.sink = sink
+        self.batch_size = batch_size
+        self.limit = limit
+        self.transform_workers = max(1, transform_workers)
+        self.predict_workers = max(1, predict_workers)
+        self.sink_workers = max(1, sink_workers)
+        self.queue_size = max(1, queue_size)
+        self.use_processes = use_processes
+        self.metrics = MetricsRecorder("pipeline", sink=JsonMetricsSink())
+
+    def _fetch(self, outbox: queue.Queue, consumers: int, state: _RunState):
+        try:
+            with recording(state.metrics):
+                batches = iter(self.fetcher.iter_batches(self.batch_size, limit=self.limit))
+                while True:
+                    with timed("fetch") as timing:
+                        reviews = next(batches, None)
+                        timing.items = len(reviews) if reviews else 0
+                    if reviews is None:
+                        break
+                    if not state.put(outbox, _Batch(reviews=reviews)):
+                        return
+        except BaseException as e:
+            state.fail("fetch", e)
+            return
+        for _ in range(consumers):
+            state.put(outbox, _END)
+
+    def _execute(self) -> Iterator[_Batch]:
+        self.loader.load()
+        model_version = getattr(self.loader, "model_version", None)
+        self.metrics.reset()
+        state = _RunState(self.metrics)
+
+        pool = None
+        if self.use_processes and self.transform_workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=self.transform_workers,
+                initializer=_init_transform_worker,
+                initargs=(self.transformer,),
+            )
+
+        def transform(batch: _Batch) -> _Batch:
+            if pool is not None:
+                batch.features, stage_totals = pool.submit(_transform_in_worker, batch.reviews).result()
+                self.metrics.merge(stage_totals)
+            else:
+                batch.features = self.transformer.transform(batch.reviews)
+            return batch
+
+        def predict(batch: _Batch) -> _Batch:
+            batch.predictions = self.loader.predict(batch.features)
+            batch.features = None
+            return batch
+
+        def write(batch: _Batch) -> _Batch:
+            with timed("write", items=len(batch.reviews)):
+                batch.written = self.sink.write(batch.reviews, batch.predictions, model_version)
+            return batch
+
+        specs = [("transform", transform, self.transform_workers), ("predict", predict, self.predict_workers)]
+        if self.sink is not None:
+            specs.append(("write", write, self.sink_workers))
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(specs) + 1)]
+        stages = [
+            _Stage(
+                name, fn, workers, queues[i], queues[i + 1],
+                consumers=specs[i + 1][2] if i + 1 < len(specs) else 1,
+                state=state,
+            )
+            for i, (name, fn, workers) in enumerate(specs)
+        ]
+        fetcher_thread = threading.Thread(
+            target=self._fetch, args=(queues[0], specs[0][2], state), name="pipeline-fetch", daemon=True
+        )
+
+        try:
+            fetcher_thread.start()
+            for stage in stages:
+                stage.start()
+            while True:
+                batch = state.get(queues[-1])
+                if batch is _END:
+                    break
+                yield batch
+        finally:
+            state.stop.set()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            fetcher_thread.join()
+            for stage in stages:
+                for thread in stage.threads:
+                    thread.join()
+            if pool is not None:
+                pool.shutdown(wait=True)
+            self.metrics.flush(force=True)
+
+        if state.error is not None:
+            raise state.error
+
+    def stream(self) -> Iterator[Tuple[List[Review], List[Sentiment]]]:
+        """
+        Yields (reviews, predictions) for each batch; predictions align 1:1 with
+        reviews. If a sink is configured, each batch is written before it is yielded.
+        """
+        for batch in self._execute():
+            yield batch.reviews, batch.predictions
+
+    def run(self) -> dict:
+        """
+        Scores every fetched review and writes the predictions to the sink.
+
+        Returns:
+            dict: Counts of scored, positive, negative and written reviews
+        """
+        summary = {"batches": 0, "scored": 0, "positive": 0, "negative": 0, "written": 0}
+        for batch in self._execute():
+            positive = sum(p.label == SENTIMENT_POSITIVE for p in batch.predictions)
+            summary["batches"] += 1
+            summary["scored"] += len(batch.predictions)
+            summary["positive"] += positive
+            summary["negative"] += len(batch.predictions) - positive
+            summary["written"] += batch.written
+            print(f"      Batch {summary['batches']}: scored {summary['scored']:,} reviews")
 
-    def run(self) -> List[Sentiment]:
-        data = self.fetcher.fetch_data()
-        transformed_data,_ = self.transformer.transform(data)
-        predictions = self.loader.predict(transformed_data)
-        print("predictions : ",predictions)
+        model_version = getattr(self.loader, "model_version", None)
+        print(f"[OK] Scored {summary['scored']:,} reviews, wrote {summary['written']:,} (model {model_version})")
+        self.metrics.report()
         print("pipeline completed")
-        return predictions
+        return summary
@@ -0,0 +1,75 @@
+"""
+Bounded LRU cache of sentiment predictions.
+
+Entries are keyed by a hash of the cleaned text and the model version, so
+re-scoring identical texts skips vectorization and scoring, and a new model
+version naturally stops matching old entries.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+from src.config import PREDICTION_CACHE_SIZE
+from src.models import Sentiment
+
+
+class PredictionCache:
+    """Thread-safe, size-bounded LRU mapping of prediction keys to Sentiment."""
+
+    def __init__(self, max_size: int = PREDICTION_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Sentiment]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def make_key(cleaned_text: str, model_version: str) -> str:
+        digest = hashlib.blake2b(cleaned_text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{model_version}:{digest}"
+
+    def get(self, key: str) -> Optional[Sentiment]:
+        with self._lock:
+            sentiment = self._entries.get(key)
+            if sentiment is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return sentiment
+
+    def put(self, key: str, sentiment: Sentiment):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = sentiment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_duplicates(self, count: int):
+        """Counts batch rows that were collapsed onto an earlier identical row."""
+        with self._lock:
+            self.duplicates += count
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.duplicates = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "duplicates": self.duplicates,
+            }
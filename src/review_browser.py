@@ -0,0 +1,148 @@
+"""
+Filtered, paginated reads of the reviews collection for the Data Explorer.
+
+Pages are ordered newest first by (Time, _id) and continue after the last row
+of the previous page (keyset pagination), so every page costs one bounded
+index scan however deep the user pages and only one page is transferred.
+Each equality filter has a compound index ending in the sort keys. Reviews
+without a Time (null, absent or NaN) sort after every dated review.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from bson import ObjectId
+from pymongo import MongoClient, DESCENDING, ASCENDING
+
+# (Time, str(_id)) of the last row of a page; Time may be None or NaN
+Cursor = Tuple[Optional[float], str]
+
+BROWSE_FIELDS = [
+    "Id",
+    "ProductId",
+    "UserId",
+    "ProfileName",
+    "Score",
+    "Time",
+    "HelpfulnessNumerator",
+    "HelpfulnessDenominator",
+    "Summary",
+    "Text",
+]
+
+_SORT = [("Time", DESCENDING), ("_id", DESCENDING)]
+# MongoDB orders NaN below every number and null/absent below NaN
+_MISSING_TIME = {"$in": [None, float("nan")]}
+_HAS_TIME = {"$gt": float("-inf")}
+
+
+@dataclass
+class ReviewFilters:
+    scores: List[int] = field(default_factory=list)
+    product_id: Optional[str] = None
+    user_id: Optional[str] = None
+    # Unix seconds, inclusive
+    time_from: Optional[int] = None
+    time_to: Optional[int] = None
+
+    def to_query(self) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if self.scores:
+            query["Score"] = {"$in": sorted(self.scores)}
+        if self.product_id:
+            query["ProductId"] = self.product_id
+        if self.user_id:
+            query["UserId"] = self.user_id
+        time_bounds = {}
+        if self.time_from is not None:
+            time_bounds["$gte"] = self.time_from
+        if self.time_to is not None:
+            time_bounds["$lte"] = self.time_to
+        if time_bounds:
+            query["Time"] = time_bounds
+        return query
+
+
+@dataclass
+class ReviewPage:
+    rows: List[Dict[str, Any]]
+    # Pass to `ReviewBrowser.page` for the next page; None on the last page
+    next_cursor: Optional[Cursor]
+
+
+class ReviewBrowser:
+    def __init__(self, uri: str, db_name: str, collection_name: str):
+        self.client = MongoClient(uri)
+        self.db = self.client[db_name]
+        self.collection = self.db[collection_name]
+        self._indexes_ready = False
+
+    def ensure_indexes(self):
+        if self._indexes_ready:
+            return
+        self.collection.create_index(_SORT)
+        for key in ("ProductId", "UserId", "Score"):
+            self.collection.create_index([(key, ASCENDING)] + _SORT)
+        self._indexes_ready = True
+
+    @staticmethod
+    def after(cursor: Cursor) -> Dict[str, Any]:
+        """Rows that sort after `cursor`, newest first."""
+        time, last_id = cursor
+        same_time_before = {"Time": time, "_id": {"$lt": ObjectId(last_id)}}
+        if time is None:
+            return same_time_before
+        if time != time:
+            # NaN: the remaining NaN rows, then the null/absent ones
+            return {"$or": [same_time_before, {"Time": None}]}
+        return {"$or": [
+            {"Time": {"$lt": time}},
+            same_time_before,
+            {"Time": _MISSING_TIME},
+        ]}
+
+    def page(self, filters: ReviewFilters, cursor: Optional[Cursor] = None, size: int = 50) -> ReviewPage:
+        """Up to `size` matching reviews after `cursor`, or the first page."""
+        self.ensure_indexes()
+        query = filters.to_query()
+        if cursor is not None:
+            query = {"$and": [query, self.after(cursor)]} if query else self.after(cursor)
+
+        projection = {name: 1 for name in BROWSE_FIELDS}
+        # One extra row tells whether another page follows
+        docs = list(self.collection.find(query, projection).sort(_SORT).limit(size + 1))
+        next_cursor = None
+        if len(docs) > size:
+            docs = docs[:size]
+            next_cursor = (docs[-1].get("Time"), str(docs[-1]["_id"]))
+        for doc in docs:
+            doc.pop("_id")
+        return ReviewPage(rows=docs, next_cursor=next_cursor)
+
+    def iter_chunks(self, filters: ReviewFilters, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Every matching review in page order, `chunk_size` rows at a time through one cursor."""
+        self.ensure_indexes()
+        projection = {name: 1 for name in BROWSE_FIELDS}
+        projection["_id"] = 0
+        cursor = self.collection.find(filters.to_query(), projection, batch_size=chunk_size).sort(_SORT)
+        rows = []
+        yielded = False
+        for doc in cursor:
+            rows.append(doc)
+            if len(rows) >= chunk_size:
+                yield pd.DataFrame(rows, columns=BROWSE_FIELDS)
+                yielded = True
+                rows = []
+        if rows or not yielded:
+            # An empty result is still one (empty) chunk with the columns
+            yield pd.DataFrame(rows, columns=BROWSE_FIELDS)
+
+    def time_range(self) -> Optional[Tuple[int, int]]:
+        """Earliest and latest review Time, read from the ends of the Time index."""
+        self.ensure_indexes()
+        projection = {"Time": 1, "_id": 0}
+        oldest = self.collection.find_one({"Time": _HAS_TIME}, projection, sort=[("Time", ASCENDING)])
+        newest = self.collection.find_one({"Time": _HAS_TIME}, projection, sort=[("Time", DESCENDING)])
+        if oldest is None or newest is None:
+            return None
+        return int(oldest["Time"]), int(newest["Time"])
@@ -0,0 +1,223 @@
+"""
+Materialized EDA rollups of the reviews collection.
+
+One document in ROLLUPS_COLLECTION_NAME holds review counts by Score, a
+review length histogram, helpfulness ratio buckets per Score and the
+watermark (newest `_id`) it covers. Products and users seen are upserted into
+two side collections, so their distinct counts are a metadata lookup.
+
+`update()` folds in only the reviews inserted after the watermark, a batch at
+a time; review lengths are computed by the server so text is never
+transferred. Each batch advances the watermark with a conditional update,
+so an interrupted or concurrent update never counts a review twice. Reading
+the rollups is O(1) in the collection size.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import numpy as np
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+from src.config import (
+    ROLLUPS_COLLECTION_NAME,
+    ROLLUP_BATCH_SIZE,
+    ROLLUP_LENGTH_EDGES,
+    ROLLUP_HELPFULNESS_BUCKETS,
+)
+from src.fetchers.mongo_fetcher import MongoFetcher
+from src.metrics import timed
+
+_DOC_ID = "reviews"
+
+
+@dataclass
+class RollupSnapshot:
+    total: int = 0
+    score_counts: Dict[int, int] = field(default_factory=dict)
+    length_sum: int = 0
+    length_edges: List[int] = field(default_factory=list)
+    length_counts: List[int] = field(default_factory=list)
+    # Per score: reviews with at least one helpfulness vote, sum of their ratios and ratio bucket counts
+    helpfulness: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    unique_products: int = 0
+    unique_users: int = 0
+    watermark: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    @property
+    def average_score(self) -> float:
+        return sum(s * n for s, n in self.score_counts.items()) / self.total if self.total else 0.0
+
+    @property
+    def positive_share(self) -> float:
+        return sum(n for s, n in self.score_counts.items() if s >= 4) / self.total if self.total else 0.0
+
+    @property
+    def average_length(self) -> float:
+        return self.length_sum / self.total if self.total else 0.0
+
+    @property
+    def sentiment_counts(self) -> Dict[str, int]:
+        counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+        for score, n in self.score_counts.items():
+            counts["Positive" if score >= 4 else ("Negative" if score <= 2 else "Neutral")] += n
+        return {label: n for label, n in counts.items() if n}
+
+
+def _length_buckets(lengths: np.ndarray) -> np.ndarray:
+    """Index of each length's bucket; the last bucket is open-ended."""
+    return np.searchsorted(ROLLUP_LENGTH_EDGES, lengths, side="right") - 1
+
+
+def _helpfulness_buckets(ratios: np.ndarray) -> np.ndarray:
+    return np.minimum((ratios * ROLLUP_HELPFULNESS_BUCKETS).astype(int), ROLLUP_HELPFULNESS_BUCKETS - 1)
+
+
+def batch_increments(docs: List[dict]) -> Dict[str, float]:
+    """`$inc` fields adding one batch of projected reviews to the rollups."""
+    scores = np.array([doc.get("Score") or 0 for doc in docs], dtype=np.int64)
+    lengths = np.array([doc.get("length", 0) for doc in docs], dtype=np.int64)
+    numerators = np.nan_to_num(np.array([doc.get("num") or 0 for doc in docs], dtype=np.float64))
+    denominators = np.nan_to_num(np.array([doc.get("den") or 0 for doc in docs], dtype=np.float64))
+
+    inc: Dict[str, float] = {"total": len(docs), "length_sum": int(lengths.sum())}
+    for score, n in zip(*np.unique(scores, return_counts=True)):
+        inc[f"score_counts.{score}"] = int(n)
+    for bucket, n in zip(*np.unique(_length_buckets(lengths), return_counts=True)):
+        inc[f"length_counts.{bucket}"] = int(n)
+
+    rated = denominators > 0
+    ratios = np.clip(numerators[rated] / denominators[rated], 0.0, 1.0)
+    rated_scores = scores[rated]
+    for score in np.unique(rated_scores):
+        score_ratios = ratios[rated_scores == score]
+        inc[f"helpfulness.{score}.rated"] = int(len(score_ratios))
+        inc[f"helpfulness.{score}.ratio_sum"] = float(score_ratios.sum())
+        for bucket, n in zip(*np.unique(_helpfulness_buckets(score_ratios), return_counts=True)):
+            inc[f"helpfulness.{score}.buckets.{bucket}"] = int(n)
+    return inc
+
+
+def _count_ids(values: List[Any]) -> List[UpdateOne]:
+    ids, counts = np.unique(np.array([str(v) for v in values if v is not None], dtype=object), return_counts=True)
+    return [UpdateOne({"_id": i}, {"$inc": {"reviews": int(n)}}, upsert=True) for i, n in zip(ids, counts)]
+
+
+class ReviewRollups:
+    """Incrementally maintained EDA statistics of one reviews collection."""
+
+    def __init__(self, uri: str, db_name: str, collection_name: str, rollups_name: str = ROLLUPS_COLLECTION_NAME):
+        self.client = MongoClient(uri)
+        self.db = self.client[db_name]
+        self.reviews = self.db[collection_name]
+        self.rollups = self.db[rollups_name]
+        self.products = self.db[f"{rollups_name}_products"]
+        self.users = self.db[f"{rollups_name}_users"]
+
+    def _pipeline(self, query: Dict[str, Any]) -> List[dict]:
+        return [
+            {"$match": query},
+            {"$sort": {"_id": 1}},
+            {"$project": {
+                "Score": 1,
+                "ProductId": 1,
+                "UserId": 1,
+                # Missing reviews are stored as NaN by the CSV import; count them as empty
+                "length": {"$cond": [{"$eq": [{"$type": "$Text"}, "string"]}, {"$strLenCP": "$Text"}, 0]},
+                "num": "$HelpfulnessNumerator",
+                "den": "$HelpfulnessDenominator",
+            }},
+        ]
+
+    def _apply(self, docs: List[dict], watermark: Optional[str]) -> bool:
+        """Adds one batch and advances the watermark; False if another update got there first."""
+        new_watermark = str(docs[-1]["_id"])
+        result = self.rollups.update_one(
+            {"_id": _DOC_ID, "watermark": watermark},
+            {
+                "$inc": batch_increments(docs),
+                "$set": {
+                    "watermark": new_watermark,
+                    "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                },
+            },
+        )
+        if result.matched_count == 0:
+            return False
+        for collection, key in ((self.products, "ProductId"), (self.users, "UserId")):
+            requests = _count_ids([doc.get(key) for doc in docs])
+            if requests:
+                collection.bulk_write(requests, ordered=False)
+        return True
+
+    def update(self, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Folds reviews inserted since the last update into the rollups. Returns how many."""
+        doc = self.rollups.find_one({"_id": _DOC_ID}, {"watermark": 1})
+        if doc is None:
+            self.rollups.update_one(
+                {"_id": _DOC_ID},
+                {"$setOnInsert": {"watermark": None, "length_edges": list(ROLLUP_LENGTH_EDGES)}},
+                upsert=True,
+            )
+            watermark = None
+        else:
+            watermark = doc.get("watermark")
+
+        # Fixed upper bound: reviews inserted while this runs are left for the next update
+        latest = self.reviews.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        if latest is None or (watermark is not None and ObjectId(watermark) >= latest["_id"]):
+            return 0
+        query = MongoFetcher.after_watermark(watermark, str(latest["_id"]))
+
+        added = 0
+        batch: List[dict] = []
+        with timed("rollup") as timing:
+            for doc in self.reviews.aggregate(self._pipeline(query), batchSize=batch_size, allowDiskUse=True):
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    if not self._apply(batch, watermark):
+                        break
+                    added += len(batch)
+                    watermark = str(batch[-1]["_id"])
+                    batch = []
+            else:
+                if batch and self._apply(batch, watermark):
+                    added += len(batch)
+            timing.items = added
+        return added
+
+    def rebuild(self, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Recomputes the rollups from every review."""
+        self.rollups.delete_one({"_id": _DOC_ID})
+        self.products.drop()
+        self.users.drop()
+        return self.update(batch_size)
+
+    def load(self) -> Optional[RollupSnapshot]:
+        """The current rollups, or None if they were never built."""
+        doc = self.rollups.find_one({"_id": _DOC_ID})
+        if doc is None or doc.get("watermark") is None:
+            return None
+        edges = doc.get("length_edges") or list(ROLLUP_LENGTH_EDGES)
+        length_counts = doc.get("length_counts", {})
+        helpfulness = {}
+        for score, entry in doc.get("helpfulness", {}).items():
+            buckets = entry.get("buckets", {})
+            helpfulness[int(score)] = {
+                "rated": entry.get("rated", 0),
+                "ratio_sum": entry.get("ratio_sum", 0.0),
+                "buckets": [buckets.get(str(i), 0) for i in range(ROLLUP_HELPFULNESS_BUCKETS)],
+            }
+        return RollupSnapshot(
+            total=doc.get("total", 0),
+            score_counts={int(s): n for s, n in doc.get("score_counts", {}).items()},
+            length_sum=doc.get("length_sum", 0),
+            length_edges=edges,
+            length_counts=[length_counts.get(str(i), 0) for i in range(len(edges))],
+            helpfulness=helpfulness,
+            unique_products=self.products.estimated_document_count(),
+            unique_users=self.users.estimated_document_count(),
+            watermark=doc.get("watermark"),
+            updated_at=doc.get("updated_at"),
+        )
@@ -0,0 +1,235 @@
+"""
+Standalone HTTP/JSON scoring server.
+
+Concurrent single-review requests are coalesced into micro-batches that are
+scored with one vectorized `SentimentPredictor.predict_batch` call. A batch is
+flushed when it reaches `max_batch_size` or when its oldest request has waited
+`max_wait_ms`, whichever comes first.
+
+Endpoints:
+    POST /predict   {"text": "..."} or {"texts": ["...", ...]}
+    GET  /health
+    GET  /metrics
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from src.config import (
+    SCORING_SERVER_HOST,
+    SCORING_SERVER_PORT,
+    SCORING_MAX_BATCH_SIZE,
+    SCORING_MAX_WAIT_MS,
+    SCORING_REQUEST_TIMEOUT_SECONDS,
+)
+from src.inference import SentimentPredictor
+from src.models import Sentiment
+
+
+class ServerStats:
+    """Thread-safe throughput and latency counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests = 0
+        self.items = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.max_batch_size = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+
+    def record_batch(self, size: int):
+        with self._lock:
+            self.batches += 1
+            self.batched_items += size
+            self.max_batch_size = max(self.max_batch_size, size)
+
+    def record_request(self, items: int, latency_ms: float, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.items += items
+            self.errors += int(error)
+            self.latency_total_ms += latency_ms
+            self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            uptime = time.time() - self.started_at
+            return {
+                "uptime_seconds": uptime,
+                "requests": self.requests,
+                "items_scored": self.items,
+                "errors": self.errors,
+                "batches": self.batches,
+                "avg_batch_size": self.batched_items / self.batches if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "requests_per_second": self.requests / uptime if uptime else 0.0,
+                "items_per_second": self.items / uptime if uptime else 0.0,
+                "avg_latency_ms": self.latency_total_ms / self.requests if self.requests else 0.0,
+                "max_latency_ms": self.latency_max_ms,
+            }
+
+
+class MicroBatcher:
+    """Collects individual texts from many threads and scores them in batches."""
+
+    def __init__(
+        self,
+        predictor: SentimentPredictor,
+        max_batch_size: int = SCORING_MAX_BATCH_SIZE,
+        max_wait_ms: float = SCORING_MAX_WAIT_MS,
+        stats: Optional[ServerStats] = None
+    ):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.stats = stats or ServerStats()
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def predict(self, texts: List[str], timeout: float = SCORING_REQUEST_TIMEOUT_SECONDS) -> List[Sentiment]:
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _collect(self, first: Tuple[str, Future]) -> Tuple[List[Tuple[str, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+            self._score(batch)
+            if stopping:
+                return
+
+    def _score(self, batch: List[Tuple[str, Future]]):
+        self.stats.record_batch(len(batch))
+        try:
+            sentiments = self.predictor.predict_batch([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), sentiment in zip(batch, sentiments):
+            future.set_result(sentiment)
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    server: "ScoringServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "model_version": self.server.model_version()})
+        elif self.path == "/metrics":
+            self._send_json(200, self.server.batcher.stats.snapshot())
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Body must be a JSON object")
+            single = "text" in payload
+            texts = [payload["text"]] if single else payload.get("texts")
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise ValueError('Body must be {"text": str} or {"texts": [str, ...]}')
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            sentiments = self.server.batcher.predict(texts)
+        except Exception as e:
+            self.server.batcher.stats.record_request(len(texts), (time.perf_counter() - start) * 1000, error=True)
+            self._send_json(503, {"error": str(e)})
+            return
+
+        predictions = [s.model_dump() for s in sentiments]
+        self.server.batcher.stats.record_request(len(texts), (time.perf_counter() - start) * 1000)
+        self._send_json(200, predictions[0] if single else {"predictions": predictions})
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], batcher: MicroBatcher):
+        super().__init__(address, ScoringRequestHandler)
+        self.batcher = batcher
+
+    def model_version(self) -> Optional[str]:
+        try:
+            return self.batcher.predictor.artifacts.version
+        except FileNotFoundError:
+            return None
+
+
+def create_server(
+    host: str = SCORING_SERVER_HOST,
+    port: int = SCORING_SERVER_PORT,
+    predictor: Optional[SentimentPredictor] = None,
+    max_batch_size: int = SCORING_MAX_BATCH_SIZE,
+    max_wait_ms: float = SCORING_MAX_WAIT_MS
+) -> ScoringServer:
+    """Builds a scoring server with a started micro-batcher."""
+    if predictor is None:
+        predictor = SentimentPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    batcher.start()
+    return ScoringServer((host, port), batcher)
@@ -0,0 +1 @@
+"""Sinks package initialization."""
@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+from typing import List
+from src.models import Review, Sentiment
+
+class PredictionSink(ABC):
+    @abstractmethod
+    def write(self, reviews: List[Review], predictions: List[Sentiment], model_version: str) -> int:
+        """Persists one prediction per review and returns the number of reviews written."""
+        pass
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Union
+from pymongo import MongoClient, UpdateOne, ASCENDING
+from src.config import SINK_BATCH_SIZE
+from src.models import Review, Sentiment
+from src.sinks.base import PredictionSink
+
+
+def _stored_id(review_id: str) -> Union[int, str]:
+    """Review Ids are stored as integers by `initialize_db.py` but read back as strings."""
+    return int(review_id) if review_id.isdigit() else review_id
+
+
+class MongoPredictionSink(PredictionSink):
+    """
+    Writes predictions onto their review documents with batched, unordered
+    bulk upserts. Reviews not yet in the collection are inserted.
+    """
+
+    def __init__(self, uri: str, db_name: str, collection_name: str, batch_size: int = SINK_BATCH_SIZE):
+        self.client = MongoClient(uri)
+        self.db = self.client[db_name]
+        self.collection = self.db[collection_name]
+        self.batch_size = batch_size
+        self._indexes_ready = False
+
+    @staticmethod
+    def unscored_filter(model_version: str) -> Dict[str, Any]:
+        """Fetch filter matching reviews with no prediction from `model_version`."""
+        return {"prediction.model_version": {"$ne": model_version}}
+
+    def ensure_indexes(self):
+        if self._indexes_ready:
+            return
+        self.collection.create_index([("Id", ASCENDING)])
+        self.collection.create_index([("prediction.model_version", ASCENDING)])
+        self._indexes_ready = True
+
+    def _upsert(self, review: Review, prediction: Sentiment, model_version: str, predicted_at: datetime) -> UpdateOne:
+        stored_id = _stored_id(review.Id)
+        fields = review.model_dump(exclude={"Id"})
+        fields["Id"] = stored_id
+        return UpdateOne(
+            {"Id": {"$in": [stored_id, review.Id]}},
+            {
+                "$set": {
+                    "prediction": {
+                        "label": prediction.label,
+                        "confidence": prediction.confidence,
+                        "model_version": model_version,
+                        "predicted_at": predicted_at,
+                    }
+                },
+                "$setOnInsert": fields,
+            },
+            upsert=True,
+        )
+
+    def write(self, reviews: List[Review], predictions: List[Sentiment], model_version: str) -> int:
+        if len(reviews) != len(predictions):
+            raise ValueError(
+                f"Got {len(predictions)} predictions for {len(reviews)} reviews; they must align 1:1."
+            )
+        if not reviews:
+            return 0
+
+        self.ensure_indexes()
+        predicted_at = datetime.now(timezone.utc)
+        written = 0
+        for start in range(0, len(reviews), self.batch_size):
+            ops = [
+                self._upsert(review, prediction, model_version, predicted_at)
+                for review, prediction in zip(
+                    reviews[start:start + self.batch_size],
+                    predictions[start:start + self.batch_size],
+                )
+            ]
+            result = self.collection.bulk_write(ops, ordered=False)
+            written += result.matched_count + result.upserted_count
+        return written
@@ -0,0 +1,157 @@
+"""
+On-disk cache of prepared training inputs.
+
+Three kinds of entries are kept under TRAINING_CACHE_DIR:
+
+    corpus-<key>/     cleaned and labelled reviews (Parquet)
+    partial-<key>/    the cleaned start of a corpus whose stream ran out of time
+    features-<key>/   TF-IDF matrix (CSR .npz), labels (.npy) and the fitted vectorizer
+
+A corpus key hashes the source fingerprint (see DataFetcher.fingerprint) with
+the cleaning settings and whether classes were balanced; a features key hashes the corpus key with the vectorizer
+settings. Unchanged data and settings therefore skip straight to fitting, and
+a vectorizer change still reuses the cleaned corpus. Entries are written to a
+temporary directory and renamed into place, so readers never see a partial
+entry; the least recently used entries of each kind are pruned.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from src.config import TRAINING_CACHE_DIR, TRAINING_CACHE_MAX_ENTRIES
+
+_CORPUS = "corpus"
+_PARTIAL = "partial"
+_FEATURES = "features"
+_META_FILE = "meta.json"
+
+
+def _hash(payload: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def corpus_key(source_fingerprint: str, preprocessing: Dict[str, Dict[str, Any]], balanced: bool = True) -> str:
+    return _hash({"source": source_fingerprint, "cleaning": preprocessing["cleaning"], "balanced": balanced})
+
+
+def features_key(corpus: str, preprocessing: Dict[str, Dict[str, Any]]) -> str:
+    return _hash({"corpus": corpus, "vectorizer": preprocessing["vectorizer"]})
+
+
+class TrainingCache:
+    """Cleaned corpora and feature matrices keyed by data and preprocessing fingerprints."""
+
+    def __init__(self, root: Union[str, Path] = TRAINING_CACHE_DIR, max_entries: int = TRAINING_CACHE_MAX_ENTRIES):
+        self.root = Path(root)
+        self.max_entries = max_entries
+
+    def _entry(self, kind: str, key: str) -> Optional[Path]:
+        path = self.root / f"{kind}-{key}"
+        if not (path / _META_FILE).exists():
+            return None
+        # Mark as recently used for pruning
+        os.utime(path / _META_FILE)
+        return path
+
+    def _store(self, kind: str, key: str, write, meta: Dict[str, Any]) -> Optional[Path]:
+        """Writes an entry through `write(tmp_dir)`; failures only cost the cache."""
+        final = self.root / f"{kind}-{key}"
+        tmp_dir = None
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(dir=self.root, prefix=f".{kind}-"))
+            write(tmp_dir)
+            meta = {"kind": kind, "key": key, "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), **meta}
+            (tmp_dir / _META_FILE).write_text(json.dumps(meta, indent=2))
+            os.chmod(tmp_dir, 0o755)
+            os.rename(tmp_dir, final)
+        except OSError as e:
+            # A concurrent run may have stored the same entry first
+            if not (final / _META_FILE).exists():
+                print(f"[WARN] Could not write training cache entry {final.name}: {e}")
+                final = None
+        except ImportError as e:
+            print(f"[WARN] Training cache disabled: {e}")
+            final = None
+        finally:
+            if tmp_dir is not None and tmp_dir.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.prune(kind)
+        return final
+
+    def load_corpus(self, key: str) -> Optional[pd.DataFrame]:
+        """Cleaned corpus with `Cleaned_Content` and `Sentiment` columns, or None on a miss."""
+        path = self._entry(_CORPUS, key)
+        if path is None:
+            return None
+        return pd.read_parquet(path / "corpus.parquet")
+
+    def save_corpus(self, key: str, prepared: pd.DataFrame, meta: Optional[Dict[str, Any]] = None):
+        corpus = prepared[["Cleaned_Content", "Sentiment"]].reset_index(drop=True)
+        self._store(
+            _CORPUS, key,
+            lambda tmp: corpus.to_parquet(tmp / "corpus.parquet", index=False),
+            {"rows": len(corpus), **(meta or {})},
+        )
+        self._discard(_PARTIAL, key)
+
+    def load_partial_corpus(self, key: str) -> Optional[Tuple[pd.DataFrame, int]]:
+        """(cleaned start of the corpus, source reviews it covers), or None on a miss."""
+        path = self._entry(_PARTIAL, key)
+        if path is None:
+            return None
+        meta = json.loads((path / _META_FILE).read_text())
+        return pd.read_parquet(path / "corpus.parquet"), meta["reviews_done"]
+
+    def save_partial_corpus(self, key: str, prepared: pd.DataFrame, reviews_done: int):
+        """Replaces the partial corpus of `key`; the next stream resumes after `reviews_done` reviews."""
+        self._discard(_PARTIAL, key)
+        corpus = prepared[["Cleaned_Content", "Sentiment"]].reset_index(drop=True)
+        self._store(
+            _PARTIAL, key,
+            lambda tmp: corpus.to_parquet(tmp / "corpus.parquet", index=False),
+            {"rows": len(corpus), "reviews_done": reviews_done},
+        )
+
+    def _discard(self, kind: str, key: str):
+        shutil.rmtree(self.root / f"{kind}-{key}", ignore_errors=True)
+
+    def load_features(self, key: str) -> Optional[Tuple[sp.csr_matrix, np.ndarray, Any]]:
+        """(X, y, fitted vectorizer), or None on a miss."""
+        path = self._entry(_FEATURES, key)
+        if path is None:
+            return None
+        X = sp.load_npz(path / "X.npz").tocsr()
+        y = np.load(path / "y.npy")
+        vectorizer = joblib.load(path / "vectorizer.joblib")
+        return X, y, vectorizer
+
+    def save_features(self, key: str, X, y, vectorizer: Any, meta: Optional[Dict[str, Any]] = None):
+        def write(tmp: Path):
+            # Uncompressed: loading speed matters more than disk space here
+            sp.save_npz(tmp / "X.npz", sp.csr_matrix(X), compressed=False)
+            np.save(tmp / "y.npy", np.asarray(y))
+            joblib.dump(vectorizer, tmp / "vectorizer.joblib")
+
+        self._store(_FEATURES, key, write, {"shape": list(X.shape), "dtype": str(X.dtype), **(meta or {})})
+
+    def prune(self, kind: str):
+        """Keeps the `max_entries` most recently used entries of `kind`."""
+        if not self.root.exists():
+            return
+        entries = [p for p in self.root.glob(f"{kind}-*") if (p / _META_FILE).exists()]
+        entries.sort(key=lambda p: (p / _META_FILE).stat().st_mtime, reverse=True)
+        for stale in entries[self.max_entries:]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -3,7 +3,15 @@ from typing import List, Any
 from src.models import Review
 
 class DataTransformer(ABC):
+    def fit(self, data: List[Review]) -> "DataTransformer":
+        """Learns any state needed by `transform` (e.g. a vocabulary) from training data."""
+        return self
+
     @abstractmethod
     def transform(self, data: List[Review]) -> Any:
         """Transforms the list of reviews into a format suitable for the model."""
         pass
+
+    def fit_transform(self, data: List[Review]) -> Any:
+        """Fits on the training data and returns its transformed form."""
+        return self.fit(data).transform(data)
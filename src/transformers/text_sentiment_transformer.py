@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Tuple, Union
+from typing import Any, Dict, List, Tuple, Union
+import hashlib
+import numpy as np
 import pandas as pd
 import re
 import nltk
-import joblib
 import os
 
 def _ensure_nltk_data():
@@ -19,9 +20,18 @@ _ensure_nltk_data()
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from sklearn.feature_extraction.text import TfidfVectorizer
+from src.config import FEATURE_DTYPE, TFIDF_MAX_FEATURES, TFIDF_NGRAM_RANGE, TFIDF_MIN_DF
+from src.metrics import timed
 from src.models import Review
 from src.transformers.base import DataTransformer
+from src.loaders.artifact_cache import ArtifactCache, save_artifact
 
+_HTML_TAG_RE = re.compile(r"<.*?>")
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z]")
+
+# Bump whenever _clean_text or prepare_training_data change their output,
+# so cached training corpora built by the old code are not reused.
+CLEANING_VERSION = 1
 
 
 class TextSentimentTransformer(DataTransformer):
@@ -31,12 +41,21 @@ class TextSentimentTransformer(DataTransformer):
     Converts raw reviews into TF-IDF features and sentiment labels.
     """
 
-    def __init__(self, max_features: int = 10000):
+    def __init__(
+        self,
+        max_features: int = TFIDF_MAX_FEATURES,
+        dtype: str = FEATURE_DTYPE,
+        ngram_range: Tuple[int, int] = TFIDF_NGRAM_RANGE,
+        min_df: int = TFIDF_MIN_DF
+    ):
         self.stop_words = set(stopwords.words("english"))
         self.lemmatizer = WordNetLemmatizer()
+        self._lemma_cache: Dict[str, str] = {}
         self.vectorizer = TfidfVectorizer(
             max_features=max_features,
-            ngram_range=(1, 2)
+            ngram_range=tuple(ngram_range),
+            min_df=min_df,
+            dtype=np.dtype(dtype)
         )
 
     def _clean_text(self, text: str) -> str:
@@ -44,75 +63,155 @@ class TextSentimentTransformer(DataTransformer):
         if not isinstance(text, str):
             return ""  # Treat NaN or non-strings as empty
 
-        text = re.sub(r"<.*?>", "", text)
-        text = re.sub(r"[^a-zA-Z]", " ", text)
+        text = _HTML_TAG_RE.sub("", text)
+        text = _NON_ALPHA_RE.sub(" ", text)
         text = text.lower()
         words = text.split()
         words = [
-            self.lemmatizer.lemmatize(w, pos="v")
+            self._lemmatize(w)
             for w in words
             if w not in self.stop_words
         ]
         return " ".join(words)
 
+    def _lemmatize(self, word: str) -> str:
+        """Lemmatizes a word as a verb, memoized since review vocabulary repeats heavily."""
+        lemma = self._lemma_cache.get(word)
+        if lemma is None:
+            lemma = self.lemmatizer.lemmatize(word, pos="v")
+            self._lemma_cache[word] = lemma
+        return lemma
+
+    def clean_texts(self, texts: List[str]) -> List[str]:
+        """Cleans a batch of texts in one pass."""
+        with timed("clean", items=len(texts)):
+            return [self._clean_text(text) for text in texts]
+
     def save_vectorizer(self, path: str):
         """Saves the fitted vectorizer to disk."""
-        joblib.dump(self.vectorizer, path)
+        save_artifact(self.vectorizer, path)
         print(f"Vectorizer saved to {path}")
 
     def load_vectorizer(self, path: str):
-        """Loads a fitted vectorizer from disk."""
+        """Loads a fitted vectorizer through the shared artifact cache."""
         if os.path.exists(path):
-            self.vectorizer = joblib.load(path)
-            print(f"Vectorizer loaded from {path}")
+            self.vectorizer = ArtifactCache().get(path)
         else:
             raise FileNotFoundError(f"Vectorizer not found at {path}")
 
-    def transform_inference(self, text: str):
-        """Transforms a single text string for inference."""
-        cleaned_text = self._clean_text(text)
+    def transform_inference(self, text: str, vectorizer: Any = None):
+        """
+        Transforms a single text string for inference.
+
+        Parameters:
+            text: Raw review text
+            vectorizer: Fitted vectorizer snapshot to use instead of `self.vectorizer`
+        """
+        return self.vectorize_cleaned([self._clean_text(text)], vectorizer=vectorizer)
+
+    def vectorize_cleaned(self, cleaned_texts: List[str], vectorizer: Any = None):
+        """Vectorizes already-cleaned texts with one call to the fitted vectorizer."""
+        if vectorizer is None:
+            vectorizer = self.vectorizer
         # Check if vectorizer is fitted
         try:
-            return self.vectorizer.transform([cleaned_text])
+            with timed("vectorize", items=len(cleaned_texts)):
+                return vectorizer.transform(cleaned_texts)
         except Exception as e:
             raise ValueError("Vectorizer is not fitted. Load a vectorizer first.") from e
 
-    def transform(
-        self, data: List[Review]
-    ) -> Tuple[pd.DataFrame, pd.Series]:
+    @staticmethod
+    def _to_frame(data: Union[List[Review], pd.DataFrame]) -> pd.DataFrame:
+        if isinstance(data, list):
+            return pd.DataFrame([r.__dict__ for r in data], columns=list(Review.model_fields))
+        return data
+
+    def _cleaned_content(self, data: pd.DataFrame) -> pd.Series:
+        """Joins summary and text (as in training) and cleans the result."""
+        with timed("clean", items=len(data)):
+            combined = data["Summary"].fillna("").astype(str) + " " + data["Text"].fillna("").astype(str)
+            return combined.apply(self._clean_text)
+
+    def prepare_training_data(
+        self, data: Union[List[Review], pd.DataFrame], balance: bool = True
+    ) -> pd.DataFrame:
         """
-        Parameters:
-            data (List[Review] or pd.DataFrame): Raw reviews
+        Labels and balances raw reviews for training. Neutral reviews are
+        dropped and (with `balance`) the majority class is downsampled, so this
+        must never be applied at inference time.
 
         Returns:
-            X: TF-IDF feature matrix
-            y: Binary sentiment labels
+            DataFrame with `Cleaned_Content` and binary `Sentiment` columns
         """
-
-        # Convert List[Review] to DataFrame if necessary
-        if isinstance(data, list):
-            data = pd.DataFrame([r.__dict__ for r in data])
+        data = self._to_frame(data)
 
         # Drop neutral reviews
         data = data[data["Score"] != 3].copy()
 
         # Create binary sentiment label
-        data["Sentiment"] = data["Score"].apply(lambda x: 1 if x >= 4 else 0)
+        data["Sentiment"] = (data["Score"] >= 4).astype(int)
 
         # Balance classes
-        min_size = data["Sentiment"].value_counts().min()
-        pos = data[data["Sentiment"] == 1].sample(min_size, random_state=42)
-        neg = data[data["Sentiment"] == 0].sample(min_size, random_state=42)
-        data = pd.concat([pos, neg]).sample(frac=1, random_state=42)
+        if balance:
+            min_size = data["Sentiment"].value_counts().min()
+            pos = data[data["Sentiment"] == 1].sample(min_size, random_state=42)
+            neg = data[data["Sentiment"] == 0].sample(min_size, random_state=42)
+            data = pd.concat([pos, neg]).sample(frac=1, random_state=42)
+
+        data["Cleaned_Content"] = self._cleaned_content(data)
+        return data
+
+    def preprocessing_config(self) -> Dict[str, Dict[str, Any]]:
+        """Settings that determine the cleaned corpus and the feature matrix."""
+        params = self.vectorizer.get_params()
+        return {
+            "cleaning": {
+                "version": CLEANING_VERSION,
+                "stop_words": hashlib.sha1(" ".join(sorted(self.stop_words)).encode()).hexdigest(),
+                "lemmatizer": type(self.lemmatizer).__name__,
+            },
+            "vectorizer": {
+                "max_features": params["max_features"],
+                "ngram_range": list(params["ngram_range"]),
+                "min_df": params["min_df"],
+                "dtype": np.dtype(params["dtype"]).name,
+            },
+        }
+
+    def fit(self, data: Union[List[Review], pd.DataFrame]) -> "TextSentimentTransformer":
+        """Fits the vectorizer vocabulary on labeled, balanced training data."""
+        self.fit_transform(data)
+        return self
+
+    def fit_transform(
+        self, data: Union[List[Review], pd.DataFrame]
+    ) -> Tuple[Any, pd.Series]:
+        """
+        Training path: labels, balances, cleans and fits the vectorizer.
 
-        # Combine text fields
-        data["Combined_Content"] = data["Summary"] + " " + data["Text"]
+        Parameters:
+            data (List[Review] or pd.DataFrame): Raw reviews
 
-        # Clean text
-        data["Cleaned_Content"] = data["Combined_Content"].apply(self._clean_text)
+        Returns:
+            X: TF-IDF feature matrix
+            y: Binary sentiment labels
+        """
+        return self.fit_prepared(self.prepare_training_data(data))
+
+    def fit_prepared(self, prepared: pd.DataFrame) -> Tuple[Any, pd.Series]:
+        """Fits the vectorizer on the output of `prepare_training_data`."""
+        with timed("vectorize", items=len(prepared)):
+            X = self.vectorizer.fit_transform(prepared["Cleaned_Content"])
+        return X, prepared["Sentiment"]
 
-        # Vectorize text
-        X = self.vectorizer.fit_transform(data["Cleaned_Content"])
-        y = data["Sentiment"]
+    def transform(self, data: Union[List[Review], pd.DataFrame]) -> Any:
+        """
+        Inference path: cleans and vectorizes every review with the already
+        fitted vectorizer. No rows are dropped, so row i of the result
+        belongs to review i of the input.
 
-        return X, y
+        Returns:
+            X: TF-IDF feature matrix
+        """
+        data = self._to_frame(data)
+        return self.vectorize_cleaned(self._cleaned_content(data).tolist())
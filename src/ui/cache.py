@@ -0,0 +1,112 @@
+"""
+Process-wide caches for the Streamlit app.
+
+Services (and the Mongo client and models they hold) are created once per
+server process with st.cache_resource and shared by every session. Fetched
+reviews and the frames derived from them are cached with st.cache_data, keyed
+by their parameters and expiring after UI_DATA_CACHE_TTL_SECONDS, so
+concurrent Data Explorer users share one copy instead of each keeping their
+own in session state. Collection-wide statistics come from the incrementally
+maintained rollups (src/rollups.py). Call invalidate_data() after anything
+that changes the reviews collection.
+"""
+
+from typing import Dict, Optional, Tuple
+import pandas as pd
+import streamlit as st
+from src.config import (
+    UI_DATA_CACHE_TTL_SECONDS,
+    UI_DATA_CACHE_MAX_ENTRIES,
+    UI_STATUS_CACHE_TTL_SECONDS,
+    UI_PAGE_CACHE_MAX_ENTRIES,
+)
+from src.review_browser import Cursor, ReviewFilters, ReviewPage
+from src.rollups import RollupSnapshot
+from src.ui.services.data_service import DataService
+from src.ui.services.export_service import ExportService
+from src.ui.services.prediction_service import PredictionService
+
+
+@st.cache_resource(show_spinner=False)
+def get_data_service() -> DataService:
+    return DataService()
+
+
+@st.cache_resource(show_spinner=False)
+def get_prediction_service() -> PredictionService:
+    return PredictionService()
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_service() -> ExportService:
+    return ExportService()
+
+
+@st.cache_data(ttl=UI_DATA_CACHE_TTL_SECONDS, max_entries=UI_DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_reviews(limit: int) -> pd.DataFrame:
+    """Up to `limit` reviews with the columns the charts plot precomputed."""
+    data_service = get_data_service()
+    df = data_service.fetch_reviews(limit=limit)
+    if df.empty:
+        return df
+    return data_service.add_derived_columns(df)
+
+
+@st.cache_data(ttl=UI_DATA_CACHE_TTL_SECONDS, max_entries=UI_DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_term_frequencies(limit: int, use_cleaned: bool, column: str = "Text") -> Dict[str, int]:
+    """
+    Most frequent terms of `column` in load_reviews(limit), optionally cleaned
+    as for training first. Only the counts are kept, not the cleaned text.
+    """
+    from wordcloud import STOPWORDS
+
+    data_service = get_data_service()
+    texts = load_reviews(limit)[column].fillna("").astype(str)
+    if use_cleaned:
+        texts = texts.map(data_service.clean_text)
+    return data_service.term_frequencies(texts, stop_words=STOPWORDS)
+
+
+@st.cache_data(ttl=UI_STATUS_CACHE_TTL_SECONDS, show_spinner=False)
+def load_rollups() -> Optional[RollupSnapshot]:
+    """Rollups caught up with the reviews collection; None if it is empty."""
+    return get_data_service().get_rollups()
+
+
+@st.cache_data(ttl=UI_STATUS_CACHE_TTL_SECONDS, max_entries=UI_PAGE_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_review_page(filters: ReviewFilters, cursor: Optional[Cursor], size: int) -> ReviewPage:
+    """One page of the raw-data browser; reruns reuse it instead of querying again."""
+    return get_data_service().browse_reviews(filters, cursor, size)
+
+
+@st.cache_data(ttl=UI_DATA_CACHE_TTL_SECONDS, show_spinner=False)
+def review_time_range() -> Optional[Tuple[int, int]]:
+    return get_data_service().get_review_time_range()
+
+
+def rebuild_rollups() -> Optional[RollupSnapshot]:
+    """Recomputes the rollups from every review and refreshes the cached copy."""
+    rollups = get_data_service().get_rollups(rebuild=True)
+    load_rollups.clear()
+    return rollups
+
+
+@st.cache_data(ttl=UI_STATUS_CACHE_TTL_SECONDS, show_spinner=False)
+def database_connected() -> bool:
+    return get_data_service().check_connection()
+
+
+@st.cache_data(ttl=UI_STATUS_CACHE_TTL_SECONDS, show_spinner=False)
+def collection_stats() -> dict:
+    return get_data_service().get_collection_stats()
+
+
+def invalidate_data():
+    """Drops cached reviews, derived frames, rollups, browser pages and collection stats."""
+    load_reviews.clear()
+    load_rollups.clear()
+    load_review_page.clear()
+    review_time_range.clear()
+    load_term_frequencies.clear()
+    database_connected.clear()
+    collection_stats.clear()
@@ -3,26 +3,33 @@ Reusable chart components for the dashboard.
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import Optional
+from typing import Dict, Optional
+from src.rollups import RollupSnapshot
 
 
-def render_score_distribution(df: pd.DataFrame, title: str = "Score Distribution"):
-    if "Score" not in df.columns:
-        st.warning("No 'Score' column found in data.")
+def render_score_distribution(rollups: RollupSnapshot, title: str = "Score Distribution"):
+    if not rollups.score_counts:
+        st.warning("No scores found in data.")
         return
     
+    scores = sorted(rollups.score_counts)
     fig, ax = plt.subplots(figsize=(10, 5))
     colors = sns.color_palette("RdYlGn", 5)
-    sns.countplot(x="Score", data=df, ax=ax, palette=colors, hue="Score", legend=False)
+    bars = ax.bar(
+        [str(s) for s in scores],
+        [rollups.score_counts[s] for s in scores],
+        color=[colors[min(max(s, 1), 5) - 1] for s in scores]
+    )
     ax.set_title(title, fontsize=14, fontweight="bold")
     ax.set_xlabel("Rating Score", fontsize=12)
     ax.set_ylabel("Count", fontsize=12)
     
-    for p in ax.patches:
-        ax.annotate(f'{int(p.get_height())}', 
+    for p in bars:
+        ax.annotate(f'{int(p.get_height()):,}', 
                     (p.get_x() + p.get_width() / 2., p.get_height()),
                     ha='center', va='bottom', fontsize=10)
     
@@ -30,26 +37,18 @@ def render_score_distribution(df: pd.DataFrame, title: str = "Score Distribution
     plt.close(fig)
 
 
-def render_sentiment_pie(df: pd.DataFrame):
-    if "Score" not in df.columns:
+def render_sentiment_pie(rollups: RollupSnapshot):
+    sentiment_counts = rollups.sentiment_counts
+    if not sentiment_counts:
         return
     
-    def classify_sentiment(score: int) -> str:
-        if score >= 4:
-            return "Positive"
-        elif score <= 2:
-            return "Negative"
-        return "Neutral"
-    
-    sentiment_counts = df["Score"].apply(classify_sentiment).value_counts()
-    
     fig, ax = plt.subplots(figsize=(8, 8))
     colors = {"Positive": "#2ecc71", "Negative": "#e74c3c", "Neutral": "#f39c12"}
-    pie_colors = [colors.get(label, "#95a5a6") for label in sentiment_counts.index]
+    pie_colors = [colors.get(label, "#95a5a6") for label in sentiment_counts]
     
     wedges, texts, autotexts = ax.pie(
-        sentiment_counts.values,
-        labels=sentiment_counts.index,
+        list(sentiment_counts.values()),
+        labels=list(sentiment_counts),
         autopct='%1.1f%%',
         colors=pie_colors,
         explode=[0.02] * len(sentiment_counts),
@@ -66,35 +65,10 @@ def render_sentiment_pie(df: pd.DataFrame):
     plt.close(fig)
 
 
-def render_wordcloud(
-    df: pd.DataFrame, 
-    column: str = "Text", 
-    max_words: int = 100,
-    use_cleaned: bool = False
-):
+@st.cache_data(max_entries=32, show_spinner=False)
+def _wordcloud_image(frequencies: Dict[str, int], max_words: int) -> np.ndarray:
     from wordcloud import WordCloud
     
-    target_column = column
-    
-    if use_cleaned and "Cleaned_Text" in df.columns:
-        target_column = "Cleaned_Text"
-    elif use_cleaned:
-        from src.transformers.text_sentiment_transformer import TextSentimentTransformer
-        transformer = TextSentimentTransformer()
-        df = df.copy()
-        df["Cleaned_Text"] = df[column].apply(transformer._clean_text)
-        target_column = "Cleaned_Text"
-    
-    if target_column not in df.columns:
-        st.warning(f"Column '{target_column}' not found.")
-        return
-    
-    text = " ".join(df[target_column].dropna().astype(str))
-    
-    if not text.strip():
-        st.warning("No text data available for word cloud.")
-        return
-    
     wordcloud = WordCloud(
         width=800,
         height=400,
@@ -103,45 +77,53 @@ def render_wordcloud(
         colormap="viridis",
         contour_width=2,
         contour_color="steelblue"
-    ).generate(text)
+    ).generate_from_frequencies(frequencies)
+    return wordcloud.to_array()
+
+
+def render_wordcloud(frequencies: Dict[str, int], max_words: int = 100, use_cleaned: bool = False):
+    """Draws precomputed term counts; layouts are cached per table and word count."""
+    if not frequencies:
+        st.warning("No text data available for word cloud.")
+        return
     
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.imshow(wordcloud, interpolation="bilinear")
-    ax.axis("off")
     title = "Most Frequent Words (Cleaned)" if use_cleaned else "Most Frequent Words (Raw)"
-    ax.set_title(title, fontsize=14, fontweight="bold", pad=20)
-    st.pyplot(fig)
-    plt.close(fig)
+    st.image(_wordcloud_image(frequencies, max_words), caption=title, use_container_width=True)
 
 
-def render_review_length_distribution(df: pd.DataFrame, column: str = "Text"):
-    if column not in df.columns:
+def render_review_length_distribution(rollups: RollupSnapshot):
+    if not rollups.total:
         return
     
-    df_copy = df.copy()
-    df_copy["text_length"] = df_copy[column].astype(str).apply(len)
-    
+    edges = rollups.length_edges
+    labels = [f"{lo}-{hi - 1}" for lo, hi in zip(edges, edges[1:])] + [f"{edges[-1]}+"]
     fig, ax = plt.subplots(figsize=(10, 5))
-    sns.histplot(df_copy["text_length"], bins=50, ax=ax, color="steelblue", edgecolor="white")
+    ax.bar(labels, rollups.length_counts, color="steelblue", edgecolor="white")
     ax.set_title("Review Length Distribution", fontsize=14, fontweight="bold")
     ax.set_xlabel("Character Count", fontsize=12)
     ax.set_ylabel("Frequency", fontsize=12)
+    ax.tick_params(axis="x", labelrotation=45)
     st.pyplot(fig)
     plt.close(fig)
 
 
-def render_helpfulness_analysis(df: pd.DataFrame):
-    if "HelpfulnessNumerator" not in df.columns or "HelpfulnessDenominator" not in df.columns:
+def render_helpfulness_analysis(rollups: RollupSnapshot):
+    """Share of each score's voted-on reviews per helpfulness ratio bucket."""
+    rated = {s: h for s, h in sorted(rollups.helpfulness.items()) if h["rated"]}
+    if not rated:
         return
     
-    df_copy = df.copy()
-    df_copy = df_copy[df_copy["HelpfulnessDenominator"] > 0].copy()
-    df_copy["helpfulness_ratio"] = df_copy["HelpfulnessNumerator"] / df_copy["HelpfulnessDenominator"]
+    n_buckets = len(next(iter(rated.values()))["buckets"])
+    shares = pd.DataFrame(
+        [[n / h["rated"] for n in h["buckets"]] for h in rated.values()],
+        index=list(rated),
+        columns=[f"{i / n_buckets:.1f}" for i in range(n_buckets)]
+    )
     
     fig, ax = plt.subplots(figsize=(10, 5))
-    sns.boxplot(x="Score", y="helpfulness_ratio", data=df_copy, ax=ax, palette="RdYlGn", hue="Score", legend=False)
+    sns.heatmap(shares, ax=ax, cmap="RdYlGn", annot=True, fmt=".0%", cbar=False)
     ax.set_title("Helpfulness Ratio by Score", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Rating Score", fontsize=12)
-    ax.set_ylabel("Helpfulness Ratio", fontsize=12)
+    ax.set_xlabel("Helpfulness Ratio (bucket start)", fontsize=12)
+    ax.set_ylabel("Rating Score", fontsize=12)
     st.pyplot(fig)
     plt.close(fig)
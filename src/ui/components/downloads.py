@@ -0,0 +1,32 @@
+"""
+Download button components backed by the on-demand export service.
+"""
+
+import streamlit as st
+from typing import Callable
+from src.file_io import SUPPORTED_FORMATS
+from src.ui.cache import get_export_service
+
+
+def render_export_buttons(
+    make_export: Callable[[str], Callable[[], bytes]],
+    file_stem: str,
+    label: str = "📥 Download"
+):
+    """
+    One download button per export format. `make_export(format)` returns the
+    deferred export, so nothing is serialized until a button is clicked, and
+    clicking does not rerun the page. Deferred `data` callables need
+    Streamlit 1.52 or newer.
+    """
+    export_service = get_export_service()
+    cols = st.columns(4)
+    for col, file_format in zip(cols, SUPPORTED_FORMATS):
+        col.download_button(
+            f"{label} {file_format.upper()}",
+            data=make_export(file_format),
+            file_name=f"{file_stem}.{file_format}",
+            mime=export_service.mime_type(file_format),
+            on_click="ignore",
+            use_container_width=True
+        )
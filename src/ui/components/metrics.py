@@ -22,30 +22,32 @@ def render_metric_row(metrics: list[dict]):
             render_metric_card(**metric)
 
 
-def render_data_stats(df):
-    if df.empty:
+def render_data_stats(rollups):
+    if not rollups.total:
         st.warning("No data to display statistics.")
         return
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Reviews", f"{len(df):,}")
+        st.metric("Total Reviews", f"{rollups.total:,}")
     
     with col2:
-        if "Score" in df.columns:
-            avg_score = df["Score"].mean()
-            st.metric("Average Score", f"{avg_score:.2f}")
+        st.metric("Average Score", f"{rollups.average_score:.2f}")
     
     with col3:
-        if "Score" in df.columns:
-            positive_pct = (df["Score"] >= 4).mean() * 100
-            st.metric("Positive Reviews", f"{positive_pct:.1f}%")
+        st.metric("Positive Reviews", f"{rollups.positive_share * 100:.1f}%")
     
     with col4:
-        if "Text" in df.columns:
-            avg_length = df["Text"].astype(str).apply(len).mean()
-            st.metric("Avg Review Length", f"{avg_length:.0f} chars")
+        st.metric("Avg Review Length", f"{rollups.average_length:.0f} chars")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Unique Products", f"{rollups.unique_products:,}")
+    
+    with col2:
+        st.metric("Unique Users", f"{rollups.unique_users:,}")
 
 
 def render_prediction_result_card(result, show_text: bool = True):
@@ -23,13 +23,11 @@ def render_sidebar():
         
         st.caption("📌 Quick Info")
         
-        from src.ui.services.data_service import DataService
-        from src.ui.services.prediction_service import PredictionService
+        from src.ui.cache import database_connected, get_prediction_service
         
-        data_service = DataService()
-        pred_service = PredictionService()
+        pred_service = get_prediction_service()
         
-        db_status = "🟢 Connected" if data_service.check_connection() else "🔴 Disconnected"
+        db_status = "🟢 Connected" if database_connected() else "🔴 Disconnected"
         model_status = "🟢 Ready" if pred_service.is_model_available() else "🟡 Not Trained"
         
         st.markdown(f"**Database:** {db_status}")
@@ -4,7 +4,10 @@ Batch analysis page for processing multiple reviews.
 
 import streamlit as st
 import pandas as pd
-from src.ui.services.prediction_service import PredictionService
+from src.config import PREDICTION_BATCH_CHUNK_SIZE, MEMORY_TEXT_EXPANSION
+from src.ui.cache import get_export_service, get_prediction_service
+from src.ui.components.downloads import render_export_buttons
+from src.memory import MemoryBudget, MemoryBudgetExceeded
 import io
 
 
@@ -16,7 +19,7 @@ def render_batch_analysis_page():
     The results can be downloaded with sentiment predictions added.
     """)
     
-    pred_service = PredictionService()
+    pred_service = get_prediction_service()
     
     if not pred_service.is_model_available():
         st.error("⚠️ Model not available. Please train the model first.")
@@ -61,8 +64,12 @@ def render_batch_analysis_page():
     )
     
     if uploaded_file is not None:
+        budget = MemoryBudget()
         try:
-            df = pd.read_csv(uploaded_file)
+            # Parsing and scoring hold several copies of the text; refuse files that cannot fit
+            budget.require(uploaded_file.size * MEMORY_TEXT_EXPANSION, "read_csv")
+            with budget.track("read_csv"):
+                df = pd.read_csv(uploaded_file)
             st.success(f"✅ Loaded {len(df)} rows from '{uploaded_file.name}'")
             
             st.subheader("📋 Data Preview")
@@ -89,9 +96,9 @@ def render_batch_analysis_page():
                 batch_size = st.number_input(
                     "Batch size",
                     min_value=10,
-                    max_value=len(df),
-                    value=min(100, len(df)),
-                    help="Number of reviews to process at once"
+                    max_value=max(10, min(len(df), PREDICTION_BATCH_CHUNK_SIZE * 10)),
+                    value=max(10, min(PREDICTION_BATCH_CHUNK_SIZE, len(df))),
+                    help="Number of reviews vectorized and scored per model call"
                 )
             
             show_cleaned = st.checkbox(
@@ -103,47 +110,38 @@ def render_batch_analysis_page():
             st.divider()
             
             if st.button("🚀 Run Batch Analysis", type="primary", use_container_width=True):
-                texts = df[text_column].fillna("").astype(str).tolist()[:batch_size]
+                texts = df[text_column].fillna("").astype(str).tolist()
                 
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                results = []
-                for i, text in enumerate(texts):
-                    status_text.text(f"Processing review {i+1}/{len(texts)}...")
-                    progress_bar.progress((i + 1) / len(texts))
-                    
-                    try:
-                        result = pred_service.predict_single(text)
-                        result_dict = {
-                            "text": text[:200],
-                            "sentiment": result.label,
-                            "confidence": result.confidence
-                        }
-                        if show_cleaned:
-                            result_dict["cleaned_text"] = pred_service.clean_text(text)
-                        results.append(result_dict)
-                    except Exception as e:
-                        result_dict = {
-                            "text": text[:200],
-                            "sentiment": "error",
-                            "confidence": 0.0
-                        }
-                        if show_cleaned:
-                            result_dict["cleaned_text"] = ""
-                        results.append(result_dict)
+                def update_progress(processed: int, total: int):
+                    status_text.text(f"Processed {processed:,}/{total:,} reviews...")
+                    progress_bar.progress(processed / total)
+                
+                predictions = pred_service.predict_batch(
+                    texts,
+                    chunk_size=int(batch_size),
+                    progress_callback=update_progress,
+                    memory_budget=budget
+                )
                 
                 progress_bar.empty()
                 status_text.empty()
                 
-                results_df = pd.DataFrame(results)
+                results_df = pd.DataFrame({
+                    "text": [text[:200] for text in texts],
+                    "sentiment": [r.label for r in predictions],
+                    "confidence": [r.confidence for r in predictions]
+                })
+                if show_cleaned:
+                    results_df["cleaned_text"] = [r.cleaned_text or "" for r in predictions]
                 
                 st.subheader("📊 Analysis Summary")
                 
-                summary = pred_service.get_batch_summary(
-                    [pred_service.predict_single(t) for t in texts[:min(len(texts), 50)]]
-                    if len(texts) <= 50 else 
-                    [type('obj', (object,), {'label': r['sentiment'], 'confidence': r['confidence'], 'is_positive': r['sentiment'] == 'positive'})() for r in results]
+                summary = pred_service.summarize_predictions(
+                    results_df["sentiment"].to_numpy(),
+                    results_df["confidence"].to_numpy()
                 )
                 
                 col1, col2, col3, col4 = st.columns(4)
@@ -169,7 +167,7 @@ def render_batch_analysis_page():
                 st.subheader("📋 Detailed Results")
                 
                 display_df = results_df.copy()
-                display_df["confidence"] = display_df["confidence"].apply(lambda x: f"{x:.1%}")
+                display_df["confidence"] = display_df["confidence"].map("{:.1%}".format)
                 
                 st.dataframe(
                     display_df,
@@ -182,19 +180,24 @@ def render_batch_analysis_page():
                     }
                 )
                 
-                output_df = df.head(batch_size).copy()
-                output_df["predicted_sentiment"] = results_df["sentiment"]
-                output_df["confidence"] = results_df["confidence"]
-                
-                csv_output = output_df.to_csv(index=False)
-                st.download_button(
-                    "📥 Download Results with Predictions",
-                    data=csv_output,
-                    file_name="sentiment_analysis_results.csv",
-                    mime="text/csv",
-                    use_container_width=True
+                # `df` is re-read from the upload on every rerun, so extend it in place;
+                # the file is only written when a download is clicked
+                df["predicted_sentiment"] = results_df["sentiment"].to_numpy()
+                df["confidence"] = results_df["confidence"].to_numpy()
+                export_service = get_export_service()
+                render_export_buttons(
+                    lambda fmt: export_service.frame_export(df, fmt),
+                    "sentiment_analysis_results",
+                    label="📥 Results"
                 )
                 
+                with st.expander("🧠 Memory Usage", expanded=bool(budget.adjustments)):
+                    st.code(budget.format_report(), language=None)
+                
+        except MemoryBudgetExceeded as e:
+            st.error(f"❌ {str(e).splitlines()[0]}")
+            st.info("Split the file, or score it with `python scripts/score_file.py` which streams it in chunks.")
+            st.code(e.report, language=None)
         except Exception as e:
             st.error(f"❌ Error reading file: {e}")
     
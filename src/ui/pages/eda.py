@@ -2,9 +2,24 @@
 Exploratory Data Analysis page.
 """
 
+from datetime import datetime, time, timezone
+from typing import Optional
 import streamlit as st
 import pandas as pd
-from src.ui.services.data_service import DataService
+from src.ui.cache import (
+    get_data_service,
+    get_export_service,
+    invalidate_data,
+    load_reviews,
+    load_review_page,
+    load_rollups,
+    load_term_frequencies,
+    rebuild_rollups,
+    review_time_range,
+)
+from src.config import BROWSE_PAGE_SIZES
+from src.memory import MemoryBudgetExceeded
+from src.review_browser import ReviewFilters
 from src.ui.components.charts import (
     render_score_distribution,
     render_sentiment_pie,
@@ -12,6 +27,7 @@ from src.ui.components.charts import (
     render_review_length_distribution,
     render_helpfulness_analysis
 )
+from src.ui.components.downloads import render_export_buttons
 from src.ui.components.metrics import render_data_stats
 
 
@@ -20,10 +36,11 @@ def render_eda_page():
     
     st.markdown("""
     Explore and visualize the product reviews dataset. 
-    Fetch data from MongoDB and analyze patterns in customer feedback.
+    Collection-wide statistics are kept up to date as reviews are ingested;
+    fetch a sample from MongoDB for word clouds, or browse every review in Raw Data.
     """)
     
-    data_service = DataService()
+    data_service = get_data_service()
     
     with st.expander("⚙️ Connection Settings", expanded=False):
         conn_info = data_service.get_connection_info()
@@ -32,7 +49,34 @@ def render_eda_page():
         col2.text_input("Database", value=conn_info["database"], disabled=True)
         col3.text_input("Collection", value=conn_info["collection"], disabled=True)
     
-    st.subheader("📥 Data Loading")
+    st.subheader("📈 Collection Statistics")
+    
+    try:
+        with st.spinner("Updating collection statistics..."):
+            rollups = load_rollups()
+    except ConnectionError as e:
+        st.error(f"❌ Connection Error: {e}")
+        st.info("Make sure MongoDB is running and accessible.")
+        return
+    
+    if rollups is None:
+        st.warning("No data found in the database. Please run the data initialization script.")
+        return
+    
+    col1, col2 = st.columns([3, 1])
+    if col2.button("♻️ Rebuild Statistics", use_container_width=True):
+        with st.spinner("Recomputing statistics from every review..."):
+            try:
+                rollups = rebuild_rollups() or rollups
+            except ConnectionError as e:
+                st.error(f"❌ Connection Error: {e}")
+    col1.caption(f"Covers {rollups.total:,} reviews · updated {rollups.updated_at}")
+    
+    render_data_stats(rollups)
+    
+    st.divider()
+    
+    st.subheader("📥 Sample Loading")
     
     col1, col2, col3 = st.columns([2, 1, 1])
     
@@ -43,7 +87,7 @@ def render_eda_page():
             max_value=10000,
             value=1000,
             step=100,
-            help="Adjust the number of reviews to load from the database"
+            help="Adjust the number of reviews to load for the word cloud"
         )
     
     with col2:
@@ -52,36 +96,16 @@ def render_eda_page():
     with col3:
         fetch_clicked = st.button("🔄 Fetch Data", type="primary", use_container_width=True)
     
-    if "eda_data" not in st.session_state:
-        st.session_state.eda_data = None
+    # Sessions keep only the fetch parameters; the frame itself is shared process-wide
+    if "eda_limit" not in st.session_state:
+        st.session_state.eda_limit = None
     
     if fetch_clicked:
-        with st.spinner("Fetching data from MongoDB..."):
-            try:
-                df = data_service.fetch_reviews(limit=limit, force_refresh=force_refresh)
-                if df.empty:
-                    st.warning("No data found in the database. Please run the data initialization script.")
-                    return
-                st.session_state.eda_data = df
-                st.success(f"✅ Successfully loaded {len(df):,} reviews!")
-            except ConnectionError as e:
-                st.error(f"❌ Connection Error: {e}")
-                st.info("Make sure MongoDB is running and accessible.")
-                return
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
-                return
+        if force_refresh:
+            invalidate_data()
+        st.session_state.eda_limit = limit
     
-    df = st.session_state.eda_data
-    
-    if df is None or df.empty:
-        st.info("👆 Click 'Fetch Data' to load reviews from the database.")
-        return
-    
-    st.divider()
-    
-    st.subheader("📈 Quick Statistics")
-    render_data_stats(df)
+    df = _load_sample(fetch_clicked)
     
     st.divider()
     
@@ -96,53 +120,147 @@ def render_eda_page():
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("#### Rating Score Distribution")
-            render_score_distribution(df)
+            render_score_distribution(rollups)
         with col2:
             st.markdown("#### Sentiment Breakdown")
-            render_sentiment_pie(df)
+            render_sentiment_pie(rollups)
     
     with tab2:
         st.markdown("#### Word Cloud from Review Text")
-        col1, col2 = st.columns(2)
-        with col1:
-            max_words = st.slider("Maximum words", 50, 200, 100)
-        with col2:
-            use_cleaned = st.checkbox(
-                "Use cleaned text (stopwords & lemmatization)", 
-                value=True,
-                help="Apply the same preprocessing used in model training"
-            )
-        render_wordcloud(df, column="Text", max_words=max_words, use_cleaned=use_cleaned)
+        if df is None:
+            st.info("👆 Click 'Fetch Data' to load reviews from the database.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                max_words = st.slider("Maximum words", 50, 200, 100)
+            with col2:
+                use_cleaned = st.checkbox(
+                    "Use cleaned text (stopwords & lemmatization)", 
+                    value=True,
+                    help="Apply the same preprocessing used in model training"
+                )
+            with st.spinner("Counting terms..." if not use_cleaned else "Cleaning and counting terms..."):
+                frequencies = load_term_frequencies(st.session_state.eda_limit, use_cleaned)
+            render_wordcloud(frequencies, max_words=max_words, use_cleaned=use_cleaned)
     
     with tab3:
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("#### Review Length Distribution")
-            render_review_length_distribution(df)
+            render_review_length_distribution(rollups)
         with col2:
             st.markdown("#### Helpfulness Analysis")
-            render_helpfulness_analysis(df)
+            render_helpfulness_analysis(rollups)
     
     with tab4:
-        st.markdown("#### Raw Data Preview")
-        
-        display_columns = st.multiselect(
-            "Select columns to display",
-            options=df.columns.tolist(),
-            default=["ProductId", "Score", "Summary", "Text"][:4]
-        )
-        
-        if display_columns:
-            st.dataframe(
-                df[display_columns],
-                use_container_width=True,
-                height=400
-            )
-        
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Data as CSV",
-            data=csv,
-            file_name="reviews_data.csv",
-            mime="text/csv"
-        )
+        st.markdown("#### Raw Data Browser")
+        _render_review_browser()
+
+
+def _render_review_browser():
+    """Filtered reviews from the whole collection, one page per query."""
+    col1, col2, col3 = st.columns([2, 2, 2])
+    scores = col1.multiselect("Score", options=[1, 2, 3, 4, 5], default=[])
+    product_id = col2.text_input("ProductId", value="").strip()
+    user_id = col3.text_input("UserId", value="").strip()
+    
+    col1, col2, col3 = st.columns([1, 3, 2])
+    filter_time = col1.checkbox("Filter by date", value=False)
+    time_from = time_to = None
+    if filter_time:
+        try:
+            time_range = review_time_range()
+        except ConnectionError as e:
+            st.error(f"❌ Connection Error: {e}")
+            return
+        if time_range is not None:
+            first, last = (datetime.fromtimestamp(t, timezone.utc).date() for t in time_range)
+            dates = col2.date_input("Review date", value=(first, last), min_value=first, max_value=last)
+            if len(dates) == 2:
+                time_from = int(datetime.combine(dates[0], time.min, timezone.utc).timestamp())
+                time_to = int(datetime.combine(dates[1], time.max, timezone.utc).timestamp())
+    page_size = col3.selectbox("Rows per page", BROWSE_PAGE_SIZES, index=1)
+    
+    filters = ReviewFilters(
+        scores=scores,
+        product_id=product_id or None,
+        user_id=user_id or None,
+        time_from=time_from,
+        time_to=time_to,
+    )
+    # Start of each page visited so far; a new filter starts again at the first page
+    if st.session_state.get("eda_browse_filters") != (filters, page_size):
+        st.session_state.eda_browse_filters = (filters, page_size)
+        st.session_state.eda_browse_cursors = [None]
+    cursors = st.session_state.eda_browse_cursors
+    
+    try:
+        page = load_review_page(filters, cursors[-1], page_size)
+    except ConnectionError as e:
+        st.error(f"❌ Connection Error: {e}")
+        return
+    
+    if not page.rows:
+        st.info("No reviews match these filters.")
+        return
+    
+    df = pd.DataFrame(page.rows)
+    if "Time" in df.columns:
+        df["Time"] = pd.to_datetime(df["Time"], unit="s")
+    
+    display_columns = st.multiselect(
+        "Select columns to display",
+        options=df.columns.tolist(),
+        default=[c for c in ["ProductId", "UserId", "Score", "Time", "Summary", "Text"] if c in df.columns]
+    )
+    if display_columns:
+        st.dataframe(df[display_columns], use_container_width=True, height=400)
+    
+    first_row = (len(cursors) - 1) * page_size + 1
+    col1, col2, col3 = st.columns([1, 1, 4])
+    col1.button("◀ Previous", disabled=len(cursors) == 1, on_click=cursors.pop, use_container_width=True)
+    col2.button(
+        "Next ▶",
+        disabled=page.next_cursor is None,
+        on_click=cursors.append,
+        args=(page.next_cursor,),
+        use_container_width=True
+    )
+    col3.caption(f"Page {len(cursors)} · rows {first_row:,}–{first_row + len(df) - 1:,}")
+    
+    st.caption("Downloads include every review matching the filters, not just this page.")
+    render_export_buttons(lambda fmt: get_export_service().reviews_export(filters, fmt), "reviews_data")
+
+
+def _load_sample(fetch_clicked: bool) -> Optional[pd.DataFrame]:
+    """The fetched sample for this session, or None if none was requested or it failed."""
+    limit = st.session_state.eda_limit
+    if limit is None:
+        return None
+    
+    with st.spinner("Fetching data from MongoDB..."):
+        try:
+            df = load_reviews(limit)
+        except ConnectionError as e:
+            st.session_state.eda_limit = None
+            st.error(f"❌ Connection Error: {e}")
+            st.info("Make sure MongoDB is running and accessible.")
+            return None
+        except MemoryBudgetExceeded as e:
+            st.session_state.eda_limit = None
+            st.error(f"❌ {str(e).splitlines()[0]}")
+            st.info("Fetch fewer reviews or raise MEMORY_BUDGET_MB.")
+            st.code(e.report, language=None)
+            return None
+        except Exception as e:
+            st.session_state.eda_limit = None
+            st.error(f"❌ Error: {e}")
+            return None
+    
+    if df.empty:
+        st.session_state.eda_limit = None
+        st.warning("No data found in the database. Please run the data initialization script.")
+        return None
+    if fetch_clicked:
+        st.success(f"✅ Successfully loaded {len(df):,} reviews!")
+    return df
@@ -83,19 +83,17 @@ def render_home_page():
     
     st.header("📈 System Status")
     
-    from src.ui.services.data_service import DataService
-    from src.ui.services.prediction_service import PredictionService
+    from src.ui.cache import collection_stats, database_connected, get_prediction_service
     
-    data_service = DataService()
-    pred_service = PredictionService()
+    pred_service = get_prediction_service()
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        db_connected = data_service.check_connection()
+        db_connected = database_connected()
         if db_connected:
             st.success("✅ Database Connected")
-            stats = data_service.get_collection_stats()
+            stats = collection_stats()
             st.metric("Total Documents", f"{stats['total_documents']:,}")
         else:
             st.error("❌ Database Disconnected")
@@ -3,12 +3,35 @@ Pipeline status and management page.
 """
 
 import streamlit as st
+import pandas as pd
 import os
 import subprocess
 import sys
 from pathlib import Path
-from src.ui.services.data_service import DataService
-from src.ui.services.prediction_service import PredictionService
+from src.ui.cache import (
+    collection_stats,
+    database_connected,
+    get_data_service,
+    get_prediction_service,
+    invalidate_data,
+)
+from src.metrics import JsonMetricsSink
+from src.config import LATENCY_SLO_P99_MS
+
+
+def _version_row(version: dict) -> dict:
+    metrics = version.get("metrics", {})
+    benchmark = version.get("benchmark", {})
+    return {
+        "Active": "●" if version["active"] else "",
+        "Version": version["version"],
+        "Source": version.get("source", ""),
+        "Accuracy": metrics.get("test_accuracy", metrics.get("holdout_accuracy")),
+        "F1 (macro)": metrics.get("test_f1_macro", metrics.get("holdout_f1_macro")),
+        "Size (KB)": round((benchmark.get("model_bytes", 0) + benchmark.get("vectorizer_bytes", 0)) / 1024, 1),
+        "Load (ms)": round(benchmark.get("load_seconds", 0) * 1000, 1),
+        "p99 (ms)": round(benchmark.get("latency_p99_ms", 0), 2),
+    }
 
 
 def render_pipeline_page():
@@ -19,8 +42,8 @@ def render_pipeline_page():
     View connection status, run training, and check system health.
     """)
     
-    data_service = DataService()
-    pred_service = PredictionService()
+    data_service = get_data_service()
+    pred_service = get_prediction_service()
     
     st.subheader("🔌 Connection Status")
     
@@ -29,9 +52,9 @@ def render_pipeline_page():
     with col1:
         st.markdown("#### MongoDB Database")
         
-        if data_service.check_connection():
+        if database_connected():
             st.success("✅ Connected")
-            stats = data_service.get_collection_stats()
+            stats = collection_stats()
             
             conn_info = data_service.get_connection_info()
             st.markdown(f"""
@@ -62,6 +85,7 @@ def render_pipeline_page():
         if pred_service.is_model_available():
             st.success("✅ Model Ready")
             st.markdown(f"""
+            - **Version**: `{model_info.get('version', 'unversioned')}`
             - **Model Path**: `{model_info['model_path']}`
             - **Model Size**: {model_info.get('model_size', 'N/A')}
             - **Vectorizer Path**: `{model_info['vectorizer_path']}`
@@ -79,6 +103,96 @@ def render_pipeline_page():
             if not model_info["vectorizer_exists"]:
                 st.markdown(f"- ❌ `{model_info['vectorizer_path']}`")
     
+    versions = pred_service.list_model_versions()
+    if versions:
+        st.markdown("#### Model Versions")
+        st.dataframe(
+            pd.DataFrame([_version_row(v) for v in versions]),
+            use_container_width=True,
+            hide_index=True
+        )
+        inactive = [v["version"] for v in versions if not v["active"]]
+        if inactive:
+            col1, col2 = st.columns([3, 1])
+            selected = col1.selectbox("Version", inactive, label_visibility="collapsed")
+            if col2.button("Activate", use_container_width=True):
+                pred_service.activate_model_version(selected)
+                st.success(f"Version {selected} is now active")
+                st.rerun()
+    
+    st.divider()
+    
+    st.subheader("⚡ Prediction Cache")
+    
+    cache_stats = pred_service.get_cache_stats()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Hits", f"{cache_stats['hits']:,}")
+    col2.metric("Misses", f"{cache_stats['misses']:,}")
+    col3.metric("Hit Rate", f"{cache_stats['hit_rate']:.1%}")
+    col4.metric("Entries", f"{cache_stats['size']:,} / {cache_stats['max_size']:,}")
+    col5.metric("Batch Duplicates", f"{cache_stats['duplicates']:,}")
+    
+    if st.button("🧹 Clear Prediction Cache"):
+        pred_service.clear_prediction_cache()
+        st.rerun()
+    
+    st.divider()
+    
+    st.subheader("⏱️ Prediction Latency")
+    
+    latency_rows = pred_service.get_latency_summary()
+    if not latency_rows:
+        st.info("No single predictions recorded yet in this session.")
+    else:
+        totals = [row for row in latency_rows if row["phase"] == "total"]
+        col1, col2, col3 = st.columns(3)
+        for col, row in zip((col1, col2, col3), totals[-3:]):
+            within_slo = row["p99_ms"] <= LATENCY_SLO_P99_MS
+            col.metric(
+                f"p99 · model {row['model_version']}",
+                f"{row['p99_ms']:.2f} ms",
+                delta=f"{'within' if within_slo else 'over'} {LATENCY_SLO_P99_MS:.0f} ms SLO",
+                delta_color="normal" if within_slo else "inverse",
+            )
+        
+        latency_df = pd.DataFrame(latency_rows)[
+            ["model_version", "phase", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+        ]
+        latency_df.columns = ["Model Version", "Phase", "Requests", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]
+        st.dataframe(
+            latency_df.style.format({c: "{:.3f}" for c in ["p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]}),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("Percentiles come from log-bucketed histograms and are accurate to about 9%.")
+        
+        if st.button("💾 Dump Latency Histograms"):
+            path = pred_service.dump_latency_histograms()
+            st.success(f"Histograms written to `{path}`")
+    
+    st.divider()
+    
+    st.subheader("⏱️ Stage Timings")
+    
+    pred_service.metrics.flush(force=True)
+    snapshots = JsonMetricsSink().read()
+    if not snapshots:
+        st.info("No timings recorded yet. Run training, the scoring pipeline or a prediction.")
+    for component, snapshot in snapshots.items():
+        st.markdown(f"#### {component.replace('_', ' ').title()}")
+        st.caption(f"Updated {snapshot['updated_at']} · {snapshot['elapsed_seconds']:.1f}s elapsed")
+        stages_df = pd.DataFrame.from_dict(snapshot["stages"], orient="index")
+        if stages_df.empty:
+            continue
+        stages_df = stages_df[["calls", "items", "wall_seconds", "cpu_seconds", "items_per_second", "avg_call_ms"]]
+        stages_df.columns = ["Calls", "Items", "Wall (s)", "CPU (s)", "Items/s", "Avg Call (ms)"]
+        st.dataframe(
+            stages_df.style.format({
+                "Wall (s)": "{:.3f}", "CPU (s)": "{:.3f}", "Items/s": "{:,.0f}", "Avg Call (ms)": "{:.2f}"
+            }),
+            use_container_width=True
+        )
+    
     st.divider()
     
     st.subheader("🔄 Pipeline Operations")
@@ -121,6 +235,7 @@ def render_pipeline_page():
                         cwd=str(Path(__file__).parents[3])
                     )
                     if result.returncode == 0:
+                        invalidate_data()
                         st.success("✅ Database initialized!")
                         st.code(result.stdout)
                     else:
@@ -175,12 +290,21 @@ def render_pipeline_page():
         ├── scripts/                  # Utility scripts
         │   ├── download_data.py      # Kaggle data download
         │   ├── initialize_db.py      # MongoDB data loader
-        │   └── train_model.py        # Model training script
+        │   ├── train_model.py        # Model training script
+        │   ├── retrain_incremental.py # Incremental model updates
+        │   └── score_reviews.py      # Persist predictions to MongoDB
         │
         └── src/                      # Source code
             ├── models.py             # Pydantic models
             ├── pipeline.py           # Pipeline orchestration
             ├── inference.py          # Inference utilities
+            ├── metrics.py            # Per-stage timing instrumentation
+            ├── latency.py            # Prediction latency histograms
+            ├── memory.py             # Memory budget accounting
+            ├── model_search.py       # Hyperparameter search
+            ├── training_cache.py     # Cached training inputs
+            ├── corpus.py             # Streaming corpus cleaning
+            ├── incremental.py        # Incremental retraining helpers
             │
             ├── fetchers/             # Data fetchers
             │   ├── base.py
@@ -193,8 +317,13 @@ def render_pipeline_page():
             │
             ├── loaders/              # Model loaders
             │   ├── base.py
+            │   ├── artifact_cache.py
             │   └── sentiment_loader.py
             │
+            ├── sinks/                # Prediction sinks
+            │   ├── base.py
+            │   └── mongo_sink.py
+            │
             └── ui/                   # Streamlit UI
                 ├── pages/            # Page components
                 ├── components/       # Reusable components
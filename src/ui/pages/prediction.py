@@ -3,7 +3,7 @@ Single prediction page for real-time sentiment analysis.
 """
 
 import streamlit as st
-from src.ui.services.prediction_service import PredictionService
+from src.ui.cache import get_prediction_service
 from src.ui.components.metrics import render_prediction_result_card
 from src.config import SAMPLE_REVIEWS, CONFIDENCE_HIGH_THRESHOLD, CONFIDENCE_MEDIUM_THRESHOLD
 
@@ -16,7 +16,7 @@ def render_prediction_page():
     The model will classify the review as **Positive** or **Negative** with a confidence score.
     """)
     
-    pred_service = PredictionService()
+    pred_service = get_prediction_service()
     model_info = pred_service.get_model_info()
     
     if not pred_service.is_model_available():
@@ -98,7 +98,7 @@ def render_prediction_page():
         with st.spinner("Analyzing sentiment..."):
             try:
                 result = pred_service.predict_single(text_input)
-                cleaned_text = pred_service.clean_text(text_input)
+                cleaned_text = result.cleaned_text
                 
                 st.session_state.prediction_history.insert(0, result)
                 if len(st.session_state.prediction_history) > 10:
@@ -128,6 +128,14 @@ def render_prediction_page():
                 
                 st.progress(result.confidence)
                 
+                if result.latency_ms:
+                    phases = " · ".join(
+                        f"{phase} {result.latency_ms[phase]:.2f} ms"
+                        for phase in ("clean", "vectorize", "score") if phase in result.latency_ms
+                    )
+                    cached = "" if "score" in result.latency_ms else " (cached)"
+                    st.caption(f"⏱️ Latency: {result.latency_ms['total']:.2f} ms{cached} — {phases}")
+                
                 with st.expander("🔍 Preprocessed Text", expanded=False):
                     st.markdown("**Text after cleaning (stopwords removed, lemmatized):**")
                     st.code(cleaned_text, language=None)
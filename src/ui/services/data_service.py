@@ -1,18 +1,29 @@
 """
-Data service for fetching and caching data from MongoDB.
-Uses the pipeline's fetcher and transformer components.
+Data service for fetching data from MongoDB.
+Uses the pipeline's fetcher and transformer components; fetched frames are
+cached process-wide by src/ui/cache.py.
 """
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
 from src.config import (
     MONGO_URI,
     DB_NAME,
     COLLECTION_NAME,
     MONGO_CONNECTION_TIMEOUT_MS,
+    DATA_FETCH_BATCH_SIZE,
+    ESTIMATED_BYTES_PER_REVIEW,
+    WORDCLOUD_MAX_TERMS,
 )
+from pymongo import MongoClient
 from src.fetchers.mongo_fetcher import MongoFetcher
+from src.rollups import ReviewRollups, RollupSnapshot
+from src.review_browser import Cursor, ReviewBrowser, ReviewFilters, ReviewPage
 from src.transformers.text_sentiment_transformer import TextSentimentTransformer
+from src.metrics import JsonMetricsSink, MetricsRecorder, recording, timed
+from src.memory import MemoryBudget, MemoryBudgetExceeded
 
 
 class DataService:
@@ -31,10 +42,20 @@ class DataService:
         self.mongo_uri = MONGO_URI
         self.db_name = DB_NAME
         self.collection_name = COLLECTION_NAME
+        self._client: Optional[MongoClient] = None
         self._fetcher: Optional[MongoFetcher] = None
+        self._rollups: Optional[ReviewRollups] = None
+        self._browser: Optional[ReviewBrowser] = None
         self._transformer: Optional[TextSentimentTransformer] = None
-        self._cached_data: Optional[pd.DataFrame] = None
-        self._cache_limit: int = 0
+        self.metrics = MetricsRecorder("data_service", sink=JsonMetricsSink())
+        self.last_memory_report: Optional[dict] = None
+    
+    @property
+    def client(self) -> MongoClient:
+        """One pooled client for status checks, instead of a new connection per rerun."""
+        if self._client is None:
+            self._client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=MONGO_CONNECTION_TIMEOUT_MS)
+        return self._client
     
     @property
     def fetcher(self) -> MongoFetcher:
@@ -42,6 +63,18 @@ class DataService:
             self._fetcher = MongoFetcher(self.mongo_uri, self.db_name, self.collection_name)
         return self._fetcher
     
+    @property
+    def rollups(self) -> ReviewRollups:
+        if self._rollups is None:
+            self._rollups = ReviewRollups(self.mongo_uri, self.db_name, self.collection_name)
+        return self._rollups
+    
+    @property
+    def browser(self) -> ReviewBrowser:
+        if self._browser is None:
+            self._browser = ReviewBrowser(self.mongo_uri, self.db_name, self.collection_name)
+        return self._browser
+    
     @property
     def transformer(self) -> TextSentimentTransformer:
         if self._transformer is None:
@@ -55,21 +88,26 @@ class DataService:
             "collection": self.collection_name
         }
     
-    def fetch_reviews(self, limit: int = 1000, force_refresh: bool = False) -> pd.DataFrame:
-        if self._cached_data is not None and self._cache_limit >= limit and not force_refresh:
-            return self._cached_data.head(limit)
-        
+    def fetch_reviews(self, limit: int = 1000) -> pd.DataFrame:
+        budget = MemoryBudget()
         try:
-            reviews = self.fetcher.fetch_data(limit=limit)
+            batch_size = budget.fit_batch_size(DATA_FETCH_BATCH_SIZE, ESTIMATED_BYTES_PER_REVIEW, "fetch")
+            frames = []
+            with recording(self.metrics), timed("fetch") as timing, budget.track("fetch"):
+                for batch in self.fetcher.iter_batches(batch_size, limit=limit):
+                    frames.append(pd.DataFrame([r.model_dump() for r in batch]))
+                    timing.items += len(batch)
+                    budget.check("fetch")
+            self.metrics.flush(force=True)
+            self.last_memory_report = budget.report()
             
-            if not reviews:
+            if not frames:
                 return pd.DataFrame()
+            return pd.concat(frames, ignore_index=True)
             
-            data = [r.model_dump() for r in reviews]
-            self._cached_data = pd.DataFrame(data)
-            self._cache_limit = limit
-            return self._cached_data
-            
+        except MemoryBudgetExceeded:
+            self.last_memory_report = budget.report()
+            raise
         except Exception as e:
             raise ConnectionError(f"Failed to connect to MongoDB: {e}")
     
@@ -78,9 +116,38 @@ class DataService:
     
     def add_cleaned_text_column(self, df: pd.DataFrame, source_column: str = "Text") -> pd.DataFrame:
         df_copy = df.copy()
-        df_copy["Cleaned_Text"] = df_copy[source_column].apply(self.clean_text)
+        with recording(self.metrics), timed("clean", items=len(df_copy)):
+            df_copy["Cleaned_Text"] = df_copy[source_column].apply(self.clean_text)
+        self.metrics.flush()
         return df_copy
     
+    def term_frequencies(
+        self,
+        texts: Iterable[str],
+        stop_words: Optional[Iterable[str]] = None,
+        max_terms: int = WORDCLOUD_MAX_TERMS
+    ) -> Dict[str, int]:
+        """Counts of the `max_terms` most frequent words, tokenized like WordCloud does."""
+        # Words start with a letter, so bare numbers are skipped as in WordCloud
+        vectorizer = CountVectorizer(
+            token_pattern=r"(?u)\b[^\W\d][\w']*",
+            stop_words=sorted(stop_words) if stop_words else None,
+            dtype=np.int64
+        )
+        try:
+            with recording(self.metrics), timed("count_terms") as timing:
+                counts = vectorizer.fit_transform(texts)
+                timing.items = counts.shape[0]
+        except ValueError:
+            # Only stop words or no text at all
+            return {}
+        self.metrics.flush()
+        
+        totals = np.asarray(counts.sum(axis=0)).ravel()
+        top = np.argsort(totals, kind="stable")[::-1][:max_terms]
+        terms = vectorizer.get_feature_names_out()
+        return {terms[i]: int(totals[i]) for i in top}
+    
     def add_sentiment_labels(self, df: pd.DataFrame) -> pd.DataFrame:
         df_copy = df.copy()
         if "Score" in df_copy.columns:
@@ -89,22 +156,56 @@ class DataService:
             )
         return df_copy
     
+    def add_derived_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Adds sentiment label, text length and helpfulness ratio columns."""
+        df_copy = self.add_sentiment_labels(df)
+        if "Text" in df_copy.columns:
+            df_copy["text_length"] = df_copy["Text"].astype(str).str.len()
+        if "HelpfulnessNumerator" in df_copy.columns and "HelpfulnessDenominator" in df_copy.columns:
+            denominator = df_copy["HelpfulnessDenominator"].where(df_copy["HelpfulnessDenominator"] > 0)
+            df_copy["helpfulness_ratio"] = df_copy["HelpfulnessNumerator"] / denominator
+        return df_copy
+    
+    def get_rollups(self, rebuild: bool = False) -> Optional[RollupSnapshot]:
+        """Collection-wide statistics, after folding in reviews ingested since the last update."""
+        try:
+            with recording(self.metrics):
+                if rebuild:
+                    self.rollups.rebuild()
+                else:
+                    self.rollups.update()
+            self.metrics.flush()
+            return self.rollups.load()
+        except Exception as e:
+            raise ConnectionError(f"Failed to connect to MongoDB: {e}")
+    
+    def browse_reviews(self, filters: ReviewFilters, cursor: Optional[Cursor] = None, size: int = 50) -> ReviewPage:
+        try:
+            with recording(self.metrics), timed("browse") as timing:
+                page = self.browser.page(filters, cursor, size)
+                timing.items = len(page.rows)
+            self.metrics.flush()
+            return page
+        except Exception as e:
+            raise ConnectionError(f"Failed to connect to MongoDB: {e}")
+    
+    def get_review_time_range(self) -> Optional[Tuple[int, int]]:
+        try:
+            return self.browser.time_range()
+        except Exception as e:
+            raise ConnectionError(f"Failed to connect to MongoDB: {e}")
+    
     def check_connection(self) -> bool:
         try:
-            from pymongo import MongoClient
-            client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=MONGO_CONNECTION_TIMEOUT_MS)
-            client.server_info()
+            self.client.admin.command("ping")
             return True
         except Exception:
             return False
     
     def get_collection_stats(self) -> dict:
         try:
-            from pymongo import MongoClient
-            client = MongoClient(self.mongo_uri)
-            db = client[self.db_name]
-            collection = db[self.collection_name]
-            count = collection.count_documents({})
+            # Collection metadata count: O(1) instead of scanning every document
+            count = self.client[self.db_name][self.collection_name].estimated_document_count()
             return {"total_documents": count, "status": "connected"}
         except Exception as e:
             return {"total_documents": 0, "status": f"error: {e}"}
@@ -0,0 +1,88 @@
+"""
+Export service for on-demand CSV/Parquet downloads.
+Files are built only when a download is clicked: rows are streamed from
+MongoDB or an in-memory results frame in chunks and appended to a temporary
+file with the pipeline's ChunkWriter, which is read back and deleted, so
+no serialized copy is built up front and page reruns pay nothing.
+"""
+
+import os
+import tempfile
+from typing import Callable, Iterable, Iterator, Optional
+import pandas as pd
+from src.config import (
+    MONGO_URI,
+    DB_NAME,
+    COLLECTION_NAME,
+    EXPORT_CHUNK_SIZE,
+)
+from src.file_io import ChunkWriter, SUPPORTED_FORMATS
+from src.review_browser import ReviewBrowser, ReviewFilters
+from src.metrics import JsonMetricsSink, MetricsRecorder, recording, timed
+
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportService:
+    _instance: Optional["ExportService"] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self.chunk_size = EXPORT_CHUNK_SIZE
+        self._browser: Optional[ReviewBrowser] = None
+        self.metrics = MetricsRecorder("export_service", sink=JsonMetricsSink())
+
+    @property
+    def browser(self) -> ReviewBrowser:
+        if self._browser is None:
+            self._browser = ReviewBrowser(MONGO_URI, DB_NAME, COLLECTION_NAME)
+        return self._browser
+
+    @staticmethod
+    def mime_type(file_format: str) -> str:
+        return EXPORT_MIME_TYPES[file_format]
+
+    def write_chunks(self, chunks: Iterable[pd.DataFrame], file_format: str) -> bytes:
+        """
+        Writes `chunks` to a temporary file and returns its contents; the file
+        is deleted before returning. Pass at least one (possibly empty) chunk
+        so the file has its columns.
+        """
+        if file_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported export format '{file_format}'")
+        fd, tmp_path = tempfile.mkstemp(suffix=f".{file_format}")
+        os.close(fd)
+        try:
+            with recording(self.metrics), timed("export") as timing:
+                with ChunkWriter(tmp_path, file_format) as writer:
+                    for chunk in chunks:
+                        writer.write(chunk)
+                timing.items = writer.rows_written
+            self.metrics.flush()
+            with open(tmp_path, "rb") as f:
+                return f.read()
+        finally:
+            os.unlink(tmp_path)
+
+    def reviews_export(self, filters: ReviewFilters, file_format: str) -> Callable[[], bytes]:
+        """Deferred export of every review matching `filters`, for st.download_button."""
+        return lambda: self.write_chunks(self.browser.iter_chunks(filters, self.chunk_size), file_format)
+
+    def frame_export(self, df: pd.DataFrame, file_format: str) -> Callable[[], bytes]:
+        """Deferred export of `df`, written a slice at a time."""
+        return lambda: self.write_chunks(self._slices(df), file_format)
+
+    def _slices(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        for start in range(0, max(len(df), 1), self.chunk_size):
+            yield df.iloc[start:start + self.chunk_size]
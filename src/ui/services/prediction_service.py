@@ -3,17 +3,26 @@ Prediction service for sentiment analysis inference.
 Uses the pipeline's transformer for text preprocessing.
 """
 
-from typing import Optional, List
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, List, Sequence
 from dataclasses import dataclass
+import numpy as np
 from src.config import (
-    MODEL_PATH,
-    VECTORIZER_PATH,
     SENTIMENT_POSITIVE,
     SENTIMENT_NEGATIVE,
     SENTIMENT_ERROR,
+    PREDICTION_BATCH_CHUNK_SIZE,
 )
 from src.transformers.text_sentiment_transformer import TextSentimentTransformer
 from src.loaders.sentiment_loader import SKLearnSentimentLoader
+from src.loaders.artifact_cache import ArtifactCache, ModelArtifacts
+from src.loaders.model_registry import ModelRegistry
+from src.models import Sentiment
+from src.prediction_cache import PredictionCache
+from src.metrics import JsonMetricsSink, MetricsRecorder, recording, timed
+from src.latency import LatencyRecorder
+from src.memory import MemoryBudget, estimate_text_bytes
 
 
 @dataclass
@@ -21,6 +30,8 @@ class PredictionResult:
     text: str
     label: str
     confidence: float
+    cleaned_text: Optional[str] = None
+    latency_ms: Optional[Dict[str, float]] = None
     
     @property
     def is_positive(self) -> bool:
@@ -46,83 +57,250 @@ class PredictionService:
         self._initialized = True
         self._transformer: Optional[TextSentimentTransformer] = None
         self._loader: Optional[SKLearnSentimentLoader] = None
+        self.artifact_cache = ArtifactCache()
+        self.artifact_cache.start_watcher()
+        self.registry = ModelRegistry.for_serving()
+        self.prediction_cache = PredictionCache()
+        self.metrics = MetricsRecorder("prediction_service", sink=JsonMetricsSink())
+        self.latency = LatencyRecorder()
     
     @property
     def transformer(self) -> TextSentimentTransformer:
         if self._transformer is None:
             self._transformer = TextSentimentTransformer()
-            if VECTORIZER_PATH.exists():
-                self._transformer.load_vectorizer(str(VECTORIZER_PATH))
         return self._transformer
     
     @property
     def loader(self) -> SKLearnSentimentLoader:
         if self._loader is None:
-            self._loader = SKLearnSentimentLoader(str(MODEL_PATH))
+            self._loader = SKLearnSentimentLoader(self.registry.active_paths()[0])
         return self._loader
     
+    @property
+    def artifacts(self) -> ModelArtifacts:
+        """The registry's active model pair; a new activation is picked up on the next call."""
+        return self.registry.artifacts()
+    
     def clean_text(self, text: str) -> str:
         return self.transformer._clean_text(text)
     
     def is_model_available(self) -> bool:
-        return MODEL_PATH.exists() and VECTORIZER_PATH.exists()
+        return self.registry.is_available()
     
     def get_model_info(self) -> dict:
+        model_path, vectorizer_path = (Path(p) for p in self.registry.active_paths())
         info = {
-            "model_exists": MODEL_PATH.exists(),
-            "vectorizer_exists": VECTORIZER_PATH.exists(),
-            "model_path": str(MODEL_PATH),
-            "vectorizer_path": str(VECTORIZER_PATH)
+            "model_exists": model_path.exists(),
+            "vectorizer_exists": vectorizer_path.exists(),
+            "model_path": str(model_path),
+            "vectorizer_path": str(vectorizer_path)
         }
         
         if info["model_exists"]:
-            info["model_size"] = f"{MODEL_PATH.stat().st_size / 1024:.1f} KB"
+            info["model_size"] = f"{model_path.stat().st_size / 1024:.1f} KB"
         if info["vectorizer_exists"]:
-            info["vectorizer_size"] = f"{VECTORIZER_PATH.stat().st_size / 1024:.1f} KB"
+            info["vectorizer_size"] = f"{vectorizer_path.stat().st_size / 1024:.1f} KB"
+        
+        active = self.registry.active()
+        if active is not None:
+            info["version"] = active.version
+            info["created_at"] = active.metadata.get("created_at")
+            info["metrics"] = active.metadata.get("metrics", {})
+            info["benchmark"] = active.metadata.get("benchmark", {})
             
         return info
     
+    def list_model_versions(self) -> List[dict]:
+        """Registry versions (newest first) with their metrics and benchmark."""
+        active = self.registry.active()
+        return [
+            {**v.metadata, "active": active is not None and v.version == active.version}
+            for v in self.registry.list_versions()
+        ]
+    
+    def activate_model_version(self, version: str):
+        """Switches serving to `version` (e.g. to roll back); cached predictions are keyed by version."""
+        self.registry.activate(version)
+    
     def predict_single(self, text: str) -> PredictionResult:
         if not self.is_model_available():
             raise FileNotFoundError("Model not trained. Please run the training pipeline first.")
         
-        features = self.transformer.transform_inference(text)
-        result = self.loader.predict_single(features)
+        artifacts = self.artifacts
+        # Started after artifact lookup so cold or post-activation loads do not count as latency
+        start = time.perf_counter()
+        latency_ms = {}
+        with recording(self.metrics):
+            with timed("clean", items=1):
+                cleaned_text = self.clean_text(text)
+            cleaned_at = time.perf_counter()
+            latency_ms["clean"] = (cleaned_at - start) * 1000
+            key = self.prediction_cache.make_key(cleaned_text, artifacts.version)
+            result = self.prediction_cache.get(key)
+            if result is None:
+                features = self.transformer.vectorize_cleaned([cleaned_text], vectorizer=artifacts.vectorizer)
+                vectorized_at = time.perf_counter()
+                result = self.loader.predict_single(features, model=artifacts.model)
+                latency_ms["vectorize"] = (vectorized_at - cleaned_at) * 1000
+                latency_ms["score"] = (time.perf_counter() - vectorized_at) * 1000
+                self.prediction_cache.put(key, result)
+        latency_ms["total"] = (time.perf_counter() - start) * 1000
+        self.latency.record(artifacts.version, latency_ms)
+        self.metrics.flush()
         
         return PredictionResult(
             text=text,
             label=result.label,
-            confidence=result.confidence
+            confidence=result.confidence,
+            cleaned_text=cleaned_text,
+            latency_ms=latency_ms
         )
     
-    def predict_batch(self, texts: List[str]) -> List[PredictionResult]:
+    def predict_batch(
+        self,
+        texts: List[str],
+        chunk_size: int = PREDICTION_BATCH_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        memory_budget: Optional[MemoryBudget] = None
+    ) -> List[PredictionResult]:
+        """
+        Scores texts in chunks of vectorized inference.
+
+        Parameters:
+            texts: Raw review texts
+            chunk_size: Number of texts vectorized and scored per model call
+            progress_callback: Called as (processed, total) after each chunk
+            memory_budget: If given, shrinks `chunk_size` to fit the budget and
+                raises MemoryBudgetExceeded between chunks once it is exceeded
+        """
+        if not texts:
+            return []
+        if not self.is_model_available():
+            return [self._error_result(text) for text in texts]
+        
+        try:
+            artifacts = self.artifacts
+        except Exception:
+            return [self._error_result(text) for text in texts]
+        
+        budget = memory_budget or MemoryBudget(limit_bytes=0)
+        chunk_size = budget.fit_batch_size(chunk_size, estimate_text_bytes(texts), "predict_batch")
+        
         results = []
-        for text in texts:
+        with recording(self.metrics), budget.track("predict_batch"):
+            for start in range(0, len(texts), chunk_size):
+                results.extend(self._predict_chunk(texts[start:start + chunk_size], artifacts))
+                budget.check("predict_batch")
+                if progress_callback is not None:
+                    progress_callback(len(results), len(texts))
+        self.metrics.flush(force=True)
+        return results
+    
+    def _predict_chunk(self, texts: List[str], artifacts: ModelArtifacts) -> List[PredictionResult]:
+        results: List[Optional[PredictionResult]] = [None] * len(texts)
+        row_keys: List[Optional[str]] = [None] * len(texts)
+        cleaned_by_key: Dict[str, str] = {}
+        with timed("clean", items=len(texts)):
+            for i, text in enumerate(texts):
+                try:
+                    cleaned = self.clean_text(text)
+                except Exception:
+                    results[i] = self._error_result(text)
+                    continue
+                key = self.prediction_cache.make_key(cleaned, artifacts.version)
+                row_keys[i] = key
+                cleaned_by_key.setdefault(key, cleaned)
+        
+        n_valid = sum(key is not None for key in row_keys)
+        self.prediction_cache.record_duplicates(n_valid - len(cleaned_by_key))
+        
+        # Score each distinct text once, and only if the cache has not seen it
+        sentiments: Dict[str, Optional[Sentiment]] = {}
+        to_score = []
+        for key in cleaned_by_key:
+            cached = self.prediction_cache.get(key)
+            if cached is None:
+                to_score.append(key)
+            else:
+                sentiments[key] = cached
+        
+        if to_score:
+            cleaned_texts = [cleaned_by_key[key] for key in to_score]
             try:
-                result = self.predict_single(text)
-                results.append(result)
+                features = self.transformer.vectorize_cleaned(cleaned_texts, vectorizer=artifacts.vectorizer)
+                scored = self.loader.predict_batch(features, model=artifacts.model)
             except Exception:
-                results.append(PredictionResult(
-                    text=text,
-                    label=SENTIMENT_ERROR,
-                    confidence=0.0
-                ))
+                # Fall back to row-by-row scoring so one bad row cannot fail the chunk
+                scored = [self._score_cleaned(cleaned, artifacts) for cleaned in cleaned_texts]
+            for key, sentiment in zip(to_score, scored):
+                sentiments[key] = sentiment
+                if sentiment is not None:
+                    self.prediction_cache.put(key, sentiment)
+        
+        for i, key in enumerate(row_keys):
+            if key is None:
+                continue
+            sentiment = sentiments[key]
+            if sentiment is None:
+                results[i] = self._error_result(texts[i])
+            else:
+                results[i] = PredictionResult(
+                    text=texts[i],
+                    label=sentiment.label,
+                    confidence=sentiment.confidence,
+                    cleaned_text=cleaned_by_key[key]
+                )
         return results
     
+    def _score_cleaned(self, cleaned_text: str, artifacts: ModelArtifacts) -> Optional[Sentiment]:
+        try:
+            features = self.transformer.vectorize_cleaned([cleaned_text], vectorizer=artifacts.vectorizer)
+            return self.loader.predict_single(features, model=artifacts.model)
+        except Exception:
+            return None
+    
+    def get_cache_stats(self) -> dict:
+        return self.prediction_cache.stats()
+    
+    def clear_prediction_cache(self):
+        self.prediction_cache.clear()
+    
+    def get_metrics(self) -> dict:
+        return self.metrics.snapshot()
+    
+    def get_latency_summary(self) -> List[dict]:
+        return self.latency.summary()
+    
+    def dump_latency_histograms(self) -> str:
+        return str(self.latency.dump())
+    
+    @staticmethod
+    def _error_result(text: str) -> PredictionResult:
+        return PredictionResult(text=text, label=SENTIMENT_ERROR, confidence=0.0)
+    
     def get_batch_summary(self, results: List[PredictionResult]) -> dict:
-        valid_results = [r for r in results if r.label != SENTIMENT_ERROR]
-        if not valid_results:
-            return {"total": len(results), "positive": 0, "negative": 0, "avg_confidence": 0}
+        return self.summarize_predictions(
+            [r.label for r in results],
+            [r.confidence for r in results]
+        )
+    
+    @staticmethod
+    def summarize_predictions(labels: Sequence[str], confidences: Sequence[float]) -> dict:
+        """Computes batch summary statistics from label and confidence columns."""
+        labels = np.asarray(labels, dtype=object)
+        confidences = np.asarray(confidences, dtype=float)
+        valid = labels != SENTIMENT_ERROR
+        n_valid = int(valid.sum())
+        if n_valid == 0:
+            return {"total": len(labels), "positive": 0, "negative": 0, "avg_confidence": 0}
         
-        positive = sum(1 for r in valid_results if r.is_positive)
-        negative = len(valid_results) - positive
-        avg_conf = sum(r.confidence for r in valid_results) / len(valid_results)
+        positive = int((labels[valid] == SENTIMENT_POSITIVE).sum())
         
         return {
-            "total": len(results),
-            "valid": len(valid_results),
+            "total": len(labels),
+            "valid": n_valid,
             "positive": positive,
-            "negative": negative,
-            "positive_ratio": positive / len(valid_results) if valid_results else 0,
-            "avg_confidence": avg_conf
+            "negative": n_valid - positive,
+            "positive_ratio": positive / n_valid,
+            "avg_confidence": float(confidences[valid].mean())
         }
@@ -0,0 +1,38 @@
+"""Regression checks for chunked Parquet writing."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.file_io import ChunkWriter  # noqa: E402
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("empty", [[None, None], [np.nan, np.nan]])
+def test_parquet_column_all_null_in_first_chunk(tmp_path, empty):
+    path = tmp_path / "out.parquet"
+    with ChunkWriter(path) as writer:
+        writer.write(pd.DataFrame({"s": empty, "n": [1, 2]}))
+        writer.write(pd.DataFrame({"s": ["x", "y"], "n": [3, 4]}))
+        writer.write(pd.DataFrame({"s": [None, np.nan], "n": [5, 6]}))
+
+    result = pd.read_parquet(path)
+    assert result["n"].tolist() == [1, 2, 3, 4, 5, 6]
+    assert result["s"].iloc[2:4].tolist() == ["x", "y"]
+    assert result["s"].isna().sum() == 4
+    assert writer.rows_written == 6
+
+
+def test_parquet_column_null_throughout(tmp_path):
+    path = tmp_path / "out.parquet"
+    with ChunkWriter(path) as writer:
+        writer.write(pd.DataFrame({"s": [None], "n": [1]}))
+    result = pd.read_parquet(path)
+    assert result["n"].tolist() == [1]
+    assert result["s"].isna().all()